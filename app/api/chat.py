@@ -4,20 +4,52 @@ Chat API endpoint for web frontend.
 This module provides the REST API endpoint for the web interface to interact
 with the LangGraph agent. It handles session management, message processing,
 and response formatting.
+
+Responses can be slimmed by the client: "fields" selects which parts to
+return, and "state_version" (from the previous response) lets the server
+omit the conversation state when it hasn't changed. Large responses are
+compressed (brotli or gzip, see compression.py).
+
+Each turn runs under a deadline (CHAT_DEADLINE_SECONDS, or a shorter
+per-request deadline_ms). If the client disconnects while the graph is still
+running, the run and its in-flight Ollama requests are cancelled.
+
+How much of the turn is traced follows TRACE_LEVEL and TRACE_SAMPLE_RATE, or
+the request's trace_level (see app/graph/tracing.py).
+
+It also provides POST /api/chat/batch for bulk runs (nightly quality checks,
+member outreach). Batch items run through exactly the same turn logic as
+POST /api/chat, concurrently and under a parallelism limit. Their LLM calls
+run in the scheduler's background class, behind interactive chat.
 """
 
 import os
 import json
-from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, HTTPException
+import time
+import asyncio
+import hashlib
+from typing import Optional, List, Dict, Any, Callable, Literal, Tuple
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from langchain_core.messages import HumanMessage, AIMessage
-
-from app.graph.graph import compile_agent
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk
+
+from app.api.compression import encode_body
+from app.data.records import to_builtin
+from app.graph.graph import get_agent
+from app.graph.tracing import format_trace_timestamp, trace_scope
+from app.llm.deadline import (
+    CHAT_DEADLINE_SECONDS,
+    DeadlineExceeded,
+    deadline_scope,
+    record_cancellation
+)
+from app.llm.scheduler import priority_scope, session_scope
 from app.api.sessions import (
-    create_session,
-    get_session,
-    update_session
+    SessionConflictError,
+    acreate_session,
+    aget_session_with_version,
+    aupdate_session
 )
 
 
@@ -32,9 +64,21 @@ class ChatRequest(BaseModel):
     Attributes:
         session_id: Optional session identifier. If None, a new session is created.
         message: User's message text
+        deadline_ms: Optional time budget for this turn in milliseconds.
+                     Capped at the server's CHAT_DEADLINE_SECONDS.
+        fields: Optional list of response fields to return (session_id and
+                state_version are always returned). None returns everything.
+        state_version: state_version from the client's previous response.
+                       If the state is unchanged, it is left out of the response.
+        trace_level: Optional trace level for this turn ("off", "summary" or
+                     "full"), overriding TRACE_LEVEL and its sampling.
     """
     session_id: Optional[str] = None
     message: str
+    deadline_ms: Optional[int] = None
+    fields: Optional[List[Literal["response", "trace", "state", "progress_messages"]]] = None
+    state_version: Optional[str] = None
+    trace_level: Optional[Literal["off", "summary", "full"]] = None
 
 
 class TraceEntry(BaseModel):
@@ -45,7 +89,8 @@ class TraceEntry(BaseModel):
         node: Name of the graph node that executed
         timestamp: ISO format timestamp
         action: Description of what the node did
-        details: Optional additional details (tool calls, state changes, etc.)
+        details: Optional additional details (tool calls, state changes, etc.),
+                 only present in full traces
     """
     node: str
     timestamp: str
@@ -77,180 +122,552 @@ class ChatResponse(BaseModel):
         trace: List of execution trace entries showing graph flow
         state: Current conversation state (user profile, tool results, etc.)
         progress_messages: Optional list of friendly progress messages during tool execution
+        state_version: Version tag (hash) of state; send it back as
+                       ChatRequest.state_version to skip an unchanged state
+
+    Fields not requested via ChatRequest.fields, and state when it matches the
+    client's state_version, are left out of the JSON.
     """
     session_id: str
-    response: str
-    trace: List[TraceEntry]
-    state: ConversationStateResponse
+    response: Optional[str] = None
+    trace: Optional[List[TraceEntry]] = None
+    state: Optional[ConversationStateResponse] = None
     progress_messages: Optional[List[str]] = None
+    state_version: Optional[str] = None
+
+
+class BatchChatRequest(BaseModel):
+    """
+    Request model for POST /api/chat/batch endpoint.
+
+    Attributes:
+        items: Conversation turns to process. Items that share a session_id
+               run one after another, in the order given.
+        max_concurrency: Optional parallelism limit for this batch. Capped at
+                         the server's BATCH_CHAT_CONCURRENCY setting.
+    """
+    items: List[ChatRequest]
+    max_concurrency: Optional[int] = None
+
+
+# Server-side limits for batch processing
+BATCH_CHAT_CONCURRENCY = int(os.getenv("BATCH_CHAT_CONCURRENCY", "4"))
+BATCH_CHAT_MAX_ITEMS = int(os.getenv("BATCH_CHAT_MAX_ITEMS", "5000"))
+
+# How often POST /api/chat checks whether the client is still connected
+DISCONNECT_POLL_SECONDS = 0.5
+
+# Response fields that can be selected with ChatRequest.fields
+RESPONSE_FIELDS = ("response", "trace", "state", "progress_messages")
+
+# Size of /api/chat responses (JSON before compression, and bytes sent)
+_RESPONSE_STATS: Dict[str, Any] = {
+    "responses": 0,
+    "json_bytes": 0,
+    "sent_bytes": 0,
+    "max_json_bytes": 0,
+    "state_omitted": 0,
+    "encodings": {},
+}
 
 
 # ============================================================================
-# API Router
+# Chat Turn Execution (shared by /api/chat and /api/chat/batch)
 # ============================================================================
 
-router = APIRouter()
+def turn_budget_seconds(deadline_ms: Optional[int] = None) -> float:
+    """Time budget for a turn: the client's deadline_ms, capped at CHAT_DEADLINE_SECONDS."""
+    if deadline_ms is None or deadline_ms <= 0:
+        return CHAT_DEADLINE_SECONDS
+    return min(deadline_ms / 1000, CHAT_DEADLINE_SECONDS)
 
 
-@router.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def _run_agent(agent, state: Dict[str, Any], config: Dict[str, Any], on_event: Optional[Callable[[Dict[str, Any]], None]]):
     """
-    Handle chat messages from the web frontend.
+    Run the graph, optionally reporting progress as it happens.
+
+    Without on_event this is a plain ainvoke(). With on_event the graph is
+    streamed and on_event receives:
+        {"type": "node", "node": ..., "progress_messages": [...]}   a node finished
+        {"type": "tool", "tool": ..., "status": ..., ...}            a tool finished
+        {"type": "token", "text": ...}                               answer tokens
 
-    This endpoint:
+    Returns:
+        dict: Final graph state
+    """
+    if on_event is None:
+        return await agent.ainvoke(state, config=config)
+
+    result = None
+    async for mode, chunk in agent.astream(state, config=config, stream_mode=["updates", "messages", "custom", "values"]):
+        if mode == "values":
+            result = chunk
+        elif mode == "updates":
+            for node, update in chunk.items():
+                on_event({
+                    "type": "node",
+                    "node": node,
+                    "progress_messages": (update or {}).get("progress_messages")
+                })
+        elif mode == "messages":
+            # Only stream the answer, not the routing/extraction JSON
+            message_chunk, metadata = chunk
+            if (
+                isinstance(message_chunk, AIMessageChunk)
+                and metadata.get("langgraph_node") == "generate_response"
+                and message_chunk.content
+            ):
+                on_event({"type": "token", "text": message_chunk.content})
+        elif mode == "custom":
+            on_event(chunk)
+    return result
+
+
+async def run_chat_turn(
+    message: str,
+    session_id: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    trace_level: Optional[str] = None
+) -> ChatResponse:
+    """
+    Run one conversation turn through the agent.
+
+    This function:
     1. Gets or creates a session
     2. Adds the user's message to the conversation state
     3. Invokes the LangGraph agent
     4. Extracts the AI response
     5. Updates the session with new state
-    6. Returns the response, trace, and state to the frontend
+    6. Formats the response, trace, and state for the frontend
 
     Args:
-        request: ChatRequest containing session_id and message
+        message: User's message text
+        session_id: Optional session identifier. If None or unknown, a new session is created.
+        deadline_seconds: Time budget for the graph run. Defaults to CHAT_DEADLINE_SECONDS.
+        on_event: Optional callback for progress events while the graph runs
+                  (node, tool and token events; see _run_agent). Used by /ws/chat.
+        trace_level: Trace level for this turn; None uses TRACE_LEVEL with sampling
 
     Returns:
         ChatResponse: AI response, execution trace, and conversation state
 
     Raises:
-        HTTPException: 500 if agent execution fails
+        SessionConflictError: If the session was updated concurrently
+        DeadlineExceeded: If the turn ran out of time before an answer could be produced
     """
-    try:
-        # ====================================================================
-        # 1. Session Management
-        # ====================================================================
-        session_id = request.session_id
-        if session_id:
-            state = get_session(session_id)
-            if state is None:
-                # Session expired or invalid, create new one
-                session_id = create_session()
-                state = get_session(session_id)
-        else:
-            # First message, create new session
-            session_id = create_session()
-            state = get_session(session_id)
-
-        # ====================================================================
-        # 2. Add user message to state
-        # ====================================================================
-        state["messages"].append(HumanMessage(content=request.message))
-
-        # Clear first_greeting flag so subsequent messages continue to orchestrate_tools
-        if state.get("first_greeting"):
-            state["first_greeting"] = False
-
-        # ====================================================================
-        # 3. Invoke LangGraph agent (async) with LangSmith metadata
-        # ====================================================================
-        
-        # Prepare metadata for LangSmith tracing
-        metadata = {
+    # ========================================================================
+    # 1. Session Management
+    # ========================================================================
+    found = await aget_session_with_version(session_id) if session_id else None
+    if found is None:
+        # First message, or session expired/invalid: create a new one
+        session_id = await acreate_session()
+        found = await aget_session_with_version(session_id)
+    state, version = found
+
+    # ========================================================================
+    # 2. Add user message to state
+    # ========================================================================
+    # Built as a new state, never changed in place: if the turn fails, is
+    # cancelled or loses the version check, the stored session is untouched.
+    # first_greeting is cleared so subsequent messages continue to orchestrate_tools.
+    state = {
+        **state,
+        "messages": [*state["messages"], HumanMessage(content=message)],
+        "first_greeting": False
+    }
+
+    # ========================================================================
+    # 3. Invoke LangGraph agent (async) with LangSmith metadata
+    # ========================================================================
+
+    # Metadata for LangSmith tracing, passed per run so concurrent turns
+    # don't overwrite each other's metadata
+    config = {
+        "metadata": {
             "session_id": session_id,
             "user_id": state.get("user_id"),
             "environment": os.getenv("ENVIRONMENT", "development")
         }
-        
-        # Set metadata as environment variable for LangSmith
-        os.environ["LANGCHAIN_METADATA"] = json.dumps(metadata)
-        
-        agent = compile_agent()
-        
-        # Wrap agent invocation with error handling for offline/network failures
-        try:
-            result = await agent.ainvoke(state)
-        except Exception as e:
-            # Check if it's a LangSmith-related error (network, timeout, etc.)
-            error_str = str(e).lower()
-            if any(keyword in error_str for keyword in ["langsmith", "smith.langchain", "connection", "timeout", "network"]):
-                print(f"⚠️  LangSmith tracing failed (possibly offline): {e}")
-                print("🔄 Continuing agent execution without tracing...")
-                
-                # Temporarily disable LangSmith and retry
-                original_tracing = os.getenv("LANGCHAIN_TRACING_V2")
-                os.environ["LANGCHAIN_TRACING_V2"] = "false"
-                
-                try:
-                    result = await agent.ainvoke(state)
-                finally:
-                    # Restore original tracing setting
-                    if original_tracing:
-                        os.environ["LANGCHAIN_TRACING_V2"] = original_tracing
-            else:
-                # Not a LangSmith error, re-raise it
-                raise
-
-        # ====================================================================
-        # 4. Extract AI response and token usage from last message
-        # ====================================================================
-        ai_response = ""
-        if result["messages"]:
-            last_message = result["messages"][-1]
-            if isinstance(last_message, AIMessage):
-                ai_response = last_message.content
-                
-                # Track token usage if available
-                if hasattr(last_message, 'usage_metadata') and last_message.usage_metadata:
-                    input_tokens = last_message.usage_metadata.get('input_tokens', 0)
-                    output_tokens = last_message.usage_metadata.get('output_tokens', 0)
-                    total_tokens = last_message.usage_metadata.get('total_tokens', input_tokens + output_tokens)
-                    print(f"📊 Token Usage: {input_tokens} in / {output_tokens} out / {total_tokens} total")
-                elif hasattr(last_message, 'response_metadata') and last_message.response_metadata:
-                    # Try alternative metadata structure
-                    response_meta = last_message.response_metadata
-                    if 'token_usage' in response_meta:
-                        token_info = response_meta['token_usage']
-                        print(f"📊 Token Usage: {token_info}")
-                    else:
-                        # Ollama might not provide token counts directly
-                        # LangSmith tracks them via callbacks, but they're not in the message
-                        print(f"ℹ️  Token tracking: Available in LangSmith dashboard (Ollama doesn't return counts in response)")
-
-        # ====================================================================
-        # 5. Update session with new state
-        # ====================================================================
-        update_session(session_id, result)
-
-        # ====================================================================
-        # 6. Format response for frontend
-        # ====================================================================
-
-        # Convert execution trace to TraceEntry models
-        trace_entries = [
-            TraceEntry(
-                node=entry.get("node", "unknown"),
-                timestamp=entry.get("timestamp", ""),
-                action=entry.get("action", ""),
-                details=entry.get("details")
-            )
-            for entry in result.get("execution_trace", [])
-        ]
-
-        # Build conversation state response
-        state_response = ConversationStateResponse(
-            user_id=result.get("user_id"),
-            user_profile=result.get("user_profile"),
-            tool_results=result.get("tool_results", {})
+    }
+
+    agent = get_agent()
+
+    # Wrap agent invocation with error handling for offline/network failures.
+    # The deadline scope bounds every LLM call and tool wait inside the graph.
+    try:
+        with deadline_scope(deadline_seconds), session_scope(session_id), trace_scope(trace_level, session_id):
+            result = await _run_agent(agent, state, config, on_event)
+    except DeadlineExceeded:
+        record_cancellation("deadline_exceeded")
+        raise
+    except Exception as e:
+        # Check if it's a LangSmith-related error (network, timeout, etc.)
+        error_str = str(e).lower()
+        if any(keyword in error_str for keyword in ["langsmith", "smith.langchain", "connection", "timeout", "network"]):
+            print(f"⚠️  LangSmith tracing failed (possibly offline): {e}")
+            print("🔄 Continuing agent execution without tracing...")
+
+            # Temporarily disable LangSmith and retry
+            original_tracing = os.getenv("LANGCHAIN_TRACING_V2")
+            os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+            try:
+                with deadline_scope(deadline_seconds), session_scope(session_id), trace_scope(trace_level, session_id):
+                    result = await _run_agent(agent, state, config, on_event)
+            finally:
+                # Restore original tracing setting
+                if original_tracing:
+                    os.environ["LANGCHAIN_TRACING_V2"] = original_tracing
+        else:
+            # Not a LangSmith error, re-raise it
+            raise
+
+    # ========================================================================
+    # 4. Extract AI response and token usage from last message
+    # ========================================================================
+    ai_response = ""
+    if result["messages"]:
+        last_message = result["messages"][-1]
+        if isinstance(last_message, AIMessage):
+            ai_response = last_message.content
+
+            # Track token usage if available
+            if hasattr(last_message, 'usage_metadata') and last_message.usage_metadata:
+                input_tokens = last_message.usage_metadata.get('input_tokens', 0)
+                output_tokens = last_message.usage_metadata.get('output_tokens', 0)
+                total_tokens = last_message.usage_metadata.get('total_tokens', input_tokens + output_tokens)
+                print(f"📊 Token Usage: {input_tokens} in / {output_tokens} out / {total_tokens} total")
+            elif hasattr(last_message, 'response_metadata') and last_message.response_metadata:
+                # Try alternative metadata structure
+                response_meta = last_message.response_metadata
+                if 'token_usage' in response_meta:
+                    token_info = response_meta['token_usage']
+                    print(f"📊 Token Usage: {token_info}")
+                else:
+                    # Ollama might not provide token counts directly
+                    # LangSmith tracks them via callbacks, but they're not in the message
+                    print(f"ℹ️  Token tracking: Available in LangSmith dashboard (Ollama doesn't return counts in response)")
+
+    # ========================================================================
+    # 5. Update session with new state
+    # ========================================================================
+    # The version check rejects the write if another request (possibly in
+    # another worker) updated this session while the graph was running
+    await aupdate_session(session_id, result, expected_version=version)
+
+    # ========================================================================
+    # 6. Format response for frontend
+    # ========================================================================
+
+    # Convert execution trace to TraceEntry models
+    trace_entries = to_trace_entries(result.get("execution_trace", []))
+
+    # Build conversation state response, tagged with a content hash so
+    # clients can skip it next time if nothing changed. Data records in the
+    # state are converted to plain dicts here, once, for serialization.
+    state_response = ConversationStateResponse(
+        user_id=result.get("user_id"),
+        user_profile=to_builtin(result.get("user_profile")),
+        tool_results=to_builtin(result.get("tool_results", {}))
+    )
+    state_version = hashlib.sha1(state_response.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+    # Extract progress messages if they exist
+    progress_messages = result.get("progress_messages", [])
+
+    return ChatResponse(
+        session_id=session_id,
+        response=ai_response,
+        trace=trace_entries,
+        state=state_response,
+        progress_messages=progress_messages if progress_messages else None,
+        state_version=state_version
+    )
+
+
+def to_trace_entries(trace: List[Dict[str, Any]]) -> List[TraceEntry]:
+    """
+    Convert execution trace entries to TraceEntry models.
+
+    Timestamps are formatted and details (kept by reference in the trace)
+    converted to plain JSON types here, once per response.
+
+    Args:
+        trace: execution_trace from the graph state
+
+    Returns:
+        list: One TraceEntry per entry
+    """
+    return [
+        TraceEntry(
+            node=entry.get("node", "unknown"),
+            timestamp=format_trace_timestamp(entry),
+            action=entry.get("action", ""),
+            details=to_builtin(entry.get("details"))
         )
+        for entry in trace
+    ]
+
+
+def describe_turn_error(error: Exception) -> Tuple[int, str]:
+    """
+    Map a run_chat_turn() failure to an HTTP status and a user-facing message.
+
+    Shared by every transport so they report failures the same way.
+
+    Args:
+        error: Exception raised by run_chat_turn()
+
+    Returns:
+        tuple: (status code, detail message)
+    """
+    if isinstance(error, SessionConflictError):
+        return 409, "This conversation was updated by another request. Please try again."
+    if isinstance(error, DeadlineExceeded):
+        return 504, "Sorry, that took longer than expected. Please try again."
+    return 500, "Sorry, I encountered an error processing your message. Please try again."
+
+
+def shape_response(
+    response: ChatResponse,
+    fields: Optional[List[str]] = None,
+    state_version: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Reduce a ChatResponse to what the client asked for.
+
+    Args:
+        response: Full response from run_chat_turn()
+        fields: Fields to keep (see RESPONSE_FIELDS); None keeps all of them
+        state_version: Client's last seen state version; state is dropped if it matches
+
+    Returns:
+        dict: JSON-ready response. session_id and state_version are always included.
+    """
+    include = {"session_id", "state_version"} | set(fields if fields is not None else RESPONSE_FIELDS)
+    if state_version is not None and state_version == response.state_version:
+        include.discard("state")
+    return response.model_dump(mode="json", include=include)
+
+
+def record_response_size(json_bytes: int, sent_bytes: int, encoding: Optional[str], state_omitted: bool) -> None:
+    """Add one /api/chat response to the size statistics."""
+    _RESPONSE_STATS["responses"] += 1
+    _RESPONSE_STATS["json_bytes"] += json_bytes
+    _RESPONSE_STATS["sent_bytes"] += sent_bytes
+    _RESPONSE_STATS["max_json_bytes"] = max(_RESPONSE_STATS["max_json_bytes"], json_bytes)
+    if state_omitted:
+        _RESPONSE_STATS["state_omitted"] += 1
+    key = encoding or "identity"
+    _RESPONSE_STATS["encodings"][key] = _RESPONSE_STATS["encodings"].get(key, 0) + 1
+
+
+def get_response_stats() -> Dict[str, Any]:
+    """
+    Get /api/chat response size statistics.
+
+    Returns:
+        dict: Response count, average/max JSON size, average bytes sent,
+              compression ratio, how often state was omitted, and encodings used
+    """
+    count = _RESPONSE_STATS["responses"]
+    json_bytes = _RESPONSE_STATS["json_bytes"]
+    return {
+        "responses": count,
+        "avg_json_bytes": round(json_bytes / count) if count else 0,
+        "max_json_bytes": _RESPONSE_STATS["max_json_bytes"],
+        "avg_sent_bytes": round(_RESPONSE_STATS["sent_bytes"] / count) if count else 0,
+        "compression_ratio": round(_RESPONSE_STATS["sent_bytes"] / json_bytes, 3) if json_bytes else 1.0,
+        "state_omitted": _RESPONSE_STATS["state_omitted"],
+        "encodings": dict(_RESPONSE_STATS["encodings"]),
+    }
+
+
+# ============================================================================
+# API Router
+# ============================================================================
+
+router = APIRouter()
+
+
+async def run_until_disconnected(http_request: Request, coro) -> Optional[Any]:
+    """
+    Await a coroutine, cancelling it if the HTTP client disconnects first.
 
-        # Extract progress messages if they exist
-        progress_messages = result.get("progress_messages", [])
+    Cancelling the graph run also cancels its in-flight Ollama requests.
+
+    Args:
+        http_request: The incoming request, polled for disconnects
+        coro: Coroutine to run (e.g. run_chat_turn(...))
+
+    Returns:
+        The coroutine's result, or None if the client disconnected
+    """
+    task = asyncio.create_task(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                record_cancellation("client_disconnect")
+                print("🔌 Client disconnected, cancelling chat turn")
+                return None
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+@router.post("/api/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest, http_request: Request):
+    """
+    Handle chat messages from the web frontend.
 
-        return ChatResponse(
-            session_id=session_id,
-            response=ai_response,
-            trace=trace_entries,
-            state=state_response,
-            progress_messages=progress_messages if progress_messages else None
+    Runs one conversation turn with run_chat_turn() and maps failures to
+    HTTP errors. The turn is cancelled if the client disconnects.
+
+    Args:
+        request: ChatRequest containing session_id, message and optional deadline_ms
+        http_request: Raw request, used to detect client disconnects
+
+    Returns:
+        ChatResponse: AI response, execution trace, and conversation state,
+                      limited to request.fields and without an unchanged state;
+                      compressed if the client accepts it
+
+    Raises:
+        HTTPException: 409 if the session was updated concurrently,
+                       504 if the turn ran past its deadline,
+                       500 if agent execution fails
+    """
+    try:
+        response = await run_until_disconnected(
+            http_request,
+            run_chat_turn(
+                request.message,
+                request.session_id,
+                turn_budget_seconds(request.deadline_ms),
+                trace_level=request.trace_level
+            )
         )
+        if response is None:
+            # Nobody is listening; 499 (client closed request) is for the access log only
+            return Response(status_code=499)
+
+        shaped = shape_response(response, request.fields, request.state_version)
+        body = json.dumps(shaped, separators=(",", ":")).encode("utf-8")
+        sent, headers = encode_body(body, http_request.headers.get("accept-encoding"))
+        record_response_size(len(body), len(sent), headers.get("Content-Encoding"), "state" not in shaped)
+        return Response(content=sent, media_type="application/json", headers=headers)
 
     except Exception as e:
-        # Log the error (in production, use proper logging)
-        print(f"Chat endpoint error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        status_code, detail = describe_turn_error(e)
+        if status_code == 500:
+            # Log the error (in production, use proper logging)
+            print(f"Chat endpoint error: {str(e)}")
+            import traceback
+            traceback.print_exc()
 
         # Return user-friendly error message
+        raise HTTPException(status_code=status_code, detail=detail)
+
+
+@router.post("/api/chat/batch")
+async def chat_batch(request: BatchChatRequest):
+    """
+    Process many conversation turns concurrently, streaming results as NDJSON.
+
+    Items are grouped by session_id. Each group runs its items in order (so a
+    conversation's turns never race each other), while different groups run
+    in parallel under the concurrency limit. Items without a session_id each
+    start their own new session.
+
+    Each output line is one JSON object, emitted as soon as its item finishes:
+        {"index": 0, "status": "ok", "elapsed_ms": 812.4, "result": {...ChatResponse...}}
+        {"index": 1, "status": "error", "elapsed_ms": 3.1, "error": "..."}
+
+    Args:
+        request: BatchChatRequest with items and optional max_concurrency
+
+    Returns:
+        StreamingResponse: application/x-ndjson stream, one line per item
+
+    Raises:
+        HTTPException: 413 if the batch exceeds BATCH_CHAT_MAX_ITEMS
+
+    Example:
+        POST /api/chat/batch
+        {"items": [{"session_id": "abc", "message": "Do I have pending claims?"},
+                   {"session_id": "abc", "message": "What about denied ones?"}]}
+    """
+    if len(request.items) > BATCH_CHAT_MAX_ITEMS:
         raise HTTPException(
-            status_code=500,
-            detail="Sorry, I encountered an error processing your message. Please try again."
+            status_code=413,
+            detail=f"Batch too large: {len(request.items)} items (maximum {BATCH_CHAT_MAX_ITEMS})"
         )
+
+    limit = max(1, min(request.max_concurrency or BATCH_CHAT_CONCURRENCY, BATCH_CHAT_CONCURRENCY))
+    semaphore = asyncio.Semaphore(limit)
+    results: asyncio.Queue = asyncio.Queue()
+
+    # Group items so turns of the same conversation run sequentially
+    groups: Dict[str, List] = {}
+    for index, item in enumerate(request.items):
+        key = item.session_id or f"__new__{index}"
+        groups.setdefault(key, []).append((index, item))
+
+    async def run_item(index: int, item: ChatRequest, session_id: Optional[str]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            # Batch turns yield the LLM to interactive traffic
+            with priority_scope("background"):
+                response = await run_chat_turn(
+                    item.message, session_id, turn_budget_seconds(item.deadline_ms), trace_level=item.trace_level
+                )
+            return {
+                "index": index,
+                "status": "ok",
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "result": shape_response(response, item.fields, item.state_version)
+            }
+        except Exception as e:
+            # Same user-facing messages as /api/chat; internal details only go to the log
+            status_code, detail = describe_turn_error(e)
+            if status_code == 500:
+                print(f"Batch item {index} error: {str(e)}")
+            return {
+                "index": index,
+                "status": "error",
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "error": detail
+            }
+
+    async def run_group(entries: List) -> None:
+        session_id = entries[0][1].session_id
+        for index, item in entries:
+            async with semaphore:
+                line = await run_item(index, item, session_id)
+            if line["status"] == "ok":
+                # Follow the session the server actually used (a new one if
+                # the requested session had expired), like a client would
+                session_id = line["result"]["session_id"]
+            await results.put(line)
+
+    async def stream_results():
+        tasks = [asyncio.create_task(run_group(entries)) for entries in groups.values()]
+        delivered = 0
+        try:
+            for _ in range(len(request.items)):
+                line = await results.get()
+                yield json.dumps(line, default=str) + "\n"
+                delivered += 1
+        finally:
+            # Client went away or stream finished: stop any remaining work
+            if delivered < len(request.items):
+                record_cancellation("client_disconnect")
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
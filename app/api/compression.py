@@ -0,0 +1,109 @@
+"""
+Response Compression Helpers for CARE Assistant.
+
+Chat responses carry tool results and traces that compress very well (JSON
+with repeated keys). These helpers pick an encoding from the client's
+Accept-Encoding header and compress a response body:
+- br (brotli) if the optional `brotli` package is installed
+- gzip otherwise (standard library)
+
+Bodies smaller than COMPRESS_MIN_BYTES are sent as-is; compressing them
+costs more CPU than it saves on the wire.
+
+Configuration:
+    COMPRESS_MIN_BYTES   smallest body worth compressing (default 1024)
+
+Install brotli support with: pip install brotli
+"""
+
+import gzip
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+
+# Encodings this server can produce, in order of preference
+SUPPORTED_ENCODINGS: List[str] = (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with the given encoding.
+
+    Args:
+        body: Raw bytes
+        encoding: "br" or "gzip"
+
+    Returns:
+        bytes: Compressed body
+
+    Raises:
+        ValueError: If the encoding is not supported
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=5)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    """
+    Parse an Accept-Encoding header into the set of encodings the client accepts.
+
+    Encodings explicitly refused with q=0 are left out.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding request header
+
+    Returns:
+        set: Lowercase encoding names (may include "*")
+    """
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.strip())
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the best supported encoding the client accepts.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding request header
+
+    Returns:
+        str: "br", "gzip", or None for no compression
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in SUPPORTED_ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def encode_body(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Compress a response body if the client accepts it and it is large enough.
+
+    Args:
+        body: Raw response bytes
+        accept_encoding: Value of the Accept-Encoding request header
+
+    Returns:
+        tuple: (body to send, extra response headers)
+    """
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return body, headers
+    headers["Content-Encoding"] = encoding
+    return compress(body, encoding), headers
@@ -6,7 +6,7 @@ as a PNG image for visualization in the frontend.
 """
 
 from fastapi import APIRouter, Response
-from app.graph.graph import compile_agent
+from app.graph.graph import get_agent
 
 
 # ============================================================================
@@ -22,7 +22,7 @@ async def get_graph_visualization():
     Get the LangGraph structure as a PNG image.
 
     This endpoint:
-    1. Compiles the LangGraph agent
+    1. Gets the shared compiled LangGraph agent
     2. Generates a Mermaid diagram visualization
     3. Returns the PNG bytes with proper content type
 
@@ -34,8 +34,8 @@ async def get_graph_visualization():
         Returns: PNG image showing the conversation flow graph
     """
     try:
-        # Compile the agent
-        agent = compile_agent()
+        # Get the shared compiled agent
+        agent = get_agent()
 
         # Generate PNG visualization using Mermaid
         png_bytes = agent.get_graph().draw_mermaid_png()
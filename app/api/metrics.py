@@ -0,0 +1,78 @@
+"""
+Metrics API endpoint.
+
+This module exposes runtime statistics (session store size, evictions,
+per-purpose LLM calls and latency, LLM queue waits, cancelled turns, response sizes,
+tool and routing cache hits, member briefings, tool latency and
+blocking executor queue, trace levels, etc.)
+so operators can see how much memory the server is holding and why.
+
+GET /api/metrics/sessions reports the session size distribution, overall
+and per state field, which decides how many sessions a node can hold.
+"""
+
+from fastapi import APIRouter, Query
+
+from app.api.chat import get_response_stats
+from app.api.sessions import SESSION_FOOTPRINT_SAMPLE, aget_session_footprint, aget_session_stats
+from app.executor import get_executor_stats
+from app.graph.briefing import get_briefing_stats
+from app.graph.routing_cache import get_routing_cache_stats
+from app.graph.tracing import get_trace_stats
+from app.llm.deadline import get_cancellation_stats
+from app.llm.registry import get_llm_stats
+from app.llm.scheduler import get_scheduler_stats
+from app.tools.cache import get_tool_cache_stats
+
+
+# ============================================================================
+# API Router
+# ============================================================================
+
+router = APIRouter()
+
+
+@router.get("/api/metrics")
+async def get_metrics():
+    """
+    Get runtime metrics for the CARE Assistant server.
+
+    Returns:
+        dict: Metrics grouped by subsystem
+
+    Example:
+        GET /api/metrics
+        Returns: {"sessions": {"session_count": 12, "total_bytes": 48213, ...}}
+    """
+    return {
+        "sessions": await aget_session_stats(),
+        "llm": get_llm_stats(),
+        "llm_queue": get_scheduler_stats(),
+        "cancellations": get_cancellation_stats(),
+        "chat_responses": get_response_stats(),
+        "tool_cache": get_tool_cache_stats(),
+        "routing_cache": get_routing_cache_stats(),
+        "member_briefings": get_briefing_stats(),
+        "executor": get_executor_stats(),
+        "tracing": get_trace_stats()
+    }
+
+
+@router.get("/api/metrics/sessions")
+async def get_session_metrics(sample: int = Query(SESSION_FOOTPRINT_SAMPLE, ge=1, le=10_000)):
+    """
+    Get the size distribution of sessions, overall and per state field.
+
+    Args:
+        sample: Number of most recently used sessions to measure
+
+    Returns:
+        dict: In-memory, stored and encoded size distributions, per-field
+              distributions and, for the memory backend, how many sessions
+              fit the memory budget
+
+    Example:
+        GET /api/metrics/sessions?sample=100
+        Returns: {"sampled": 100, "encoded_bytes": {"p50": 2210, ...}, "fields": {"messages": {...}}}
+    """
+    return await aget_session_footprint(sample)
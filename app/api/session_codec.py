@@ -0,0 +1,291 @@
+"""
+Serialization format for conversation state.
+
+Session backends that store state outside the Python process (SQLite, and any
+future shared store) and the cold tier of the in-memory store need a byte
+representation of ConversationState. The encoding is kept small, because its
+size decides how many sessions a node can hold:
+
+- Messages use a minimal schema instead of messages_to_dict():
+      [kind, content]  or  [kind, content, {extras}]
+  kind is "h" (human), "a" (AI), "s" (system) or "t" (tool); extras hold only
+  what the graph needs again (AI tool calls, tool_call_id, name). Provider
+  metadata (response_metadata, usage_metadata, ids) is not kept. Message
+  types without a compact form are stored as ["x", <message dict>].
+- Data records (the user profile, the plan, claims inside tool results and
+  trace details) that are the loaded data's own records are stored as
+  references, {"$r": ["u", user_id]}, {"$r": ["p", plan_id]} or
+  {"$r": ["c", user_id, claim_id]}, and resolved against the loaded data on
+  decode. Records that no longer exist decode as None (claims are dropped).
+  Any other record is written out in full.
+- The container is msgpack when the optional `msgpack` package is installed,
+  compact JSON otherwise.
+
+Format:
+    b"M" + msgpack([2, state])   or   b"J" + JSON([2, state])
+
+Version 1 payloads (plain JSON objects: {"v": 1, "state": {...}}) written by
+earlier releases are still decoded.
+
+Install msgpack support with: pip install msgpack
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+    message_to_dict,
+    messages_from_dict
+)
+
+from app.data.loader import get_claims_for_user, get_data, get_plan_by_id, get_user_by_id
+from app.data.records import Claim, Plan, Record, User, json_default
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+
+# Bump when the encoded layout changes incompatibly
+CODEC_VERSION = 2
+
+# Container format: "msgpack" (default when installed) or "json"
+SESSION_CODEC = os.getenv("SESSION_CODEC", "msgpack" if msgpack is not None else "json").lower()
+
+_MSGPACK = b"M"
+_JSON = b"J"
+
+# Message kind codes
+_KINDS = {"human": "h", "ai": "a", "system": "s", "tool": "t"}
+_CLASSES = {"h": HumanMessage, "a": AIMessage, "s": SystemMessage, "t": ToolMessage}
+
+
+# ============================================================================
+# Messages
+# ============================================================================
+
+def _pack_message(message: BaseMessage) -> list:
+    kind = _KINDS.get(message.type)
+    if kind is None:
+        return ["x", message_to_dict(message)]
+    extras: Dict[str, Any] = {}
+    if kind == "a" and message.tool_calls:
+        extras["tc"] = [
+            {"name": call["name"], "args": call["args"], "id": call.get("id")}
+            for call in message.tool_calls
+        ]
+    if kind == "t":
+        extras["id"] = message.tool_call_id
+    if message.name:
+        extras["n"] = message.name
+    return [kind, message.content, extras] if extras else [kind, message.content]
+
+
+def _unpack_message(packed: list) -> BaseMessage:
+    kind, body = packed[0], packed[1]
+    if kind == "x":
+        return messages_from_dict([body])[0]
+    extras = packed[2] if len(packed) > 2 else {}
+    kwargs: Dict[str, Any] = {"content": body}
+    if "tc" in extras:
+        kwargs["tool_calls"] = extras["tc"]
+    if "id" in extras:
+        kwargs["tool_call_id"] = extras["id"]
+    if "n" in extras:
+        kwargs["name"] = extras["n"]
+    return _CLASSES[kind](**kwargs)
+
+
+# ============================================================================
+# Data Record References
+# ============================================================================
+
+class _RecordRefs:
+    """Looks up whether records are the loaded data's own, and resolves references."""
+
+    def __init__(self):
+        try:
+            self.data = get_data()
+        except RuntimeError:
+            # Data not loaded (e.g. offline tooling): records are written in full
+            self.data = None
+        self._claims: Dict[str, Dict[str, Claim]] = {}
+
+    def _claims_of(self, user_id: str) -> Dict[str, Claim]:
+        claims = self._claims.get(user_id)
+        if claims is None:
+            claims = self._claims[user_id] = {
+                claim["claim_id"]: claim for claim in get_claims_for_user(user_id, self.data)
+            }
+        return claims
+
+    @staticmethod
+    def _same(current: Optional[Mapping], record: Record) -> bool:
+        return current is not None and (current is record or current == record)
+
+    def ref(self, record: Record) -> Optional[list]:
+        """Reference for a record, or None if it must be written in full."""
+        if self.data is None:
+            return None
+        if isinstance(record, User):
+            if self._same(get_user_by_id(record.get("user_id"), self.data), record):
+                return ["u", record["user_id"]]
+        elif isinstance(record, Plan):
+            if self._same(get_plan_by_id(record.get("plan_id"), self.data), record):
+                return ["p", record["plan_id"]]
+        elif isinstance(record, Claim):
+            user_id = record.get("user_id")
+            if self._same(self._claims_of(user_id).get(record.get("claim_id")), record):
+                return ["c", user_id, record["claim_id"]]
+        return None
+
+    def resolve(self, ref: list) -> Optional[Mapping]:
+        """Record for a reference, or None if it no longer exists."""
+        if self.data is None:
+            return None
+        kind = ref[0]
+        if kind == "u":
+            return get_user_by_id(ref[1], self.data)
+        if kind == "p":
+            return get_plan_by_id(ref[1], self.data)
+        if kind == "c":
+            return self._claims_of(ref[1]).get(ref[2])
+        return None
+
+
+def _pack_value(value: Any, refs: _RecordRefs) -> Any:
+    if isinstance(value, Record):
+        ref = refs.ref(value)
+        if ref is not None:
+            return {"$r": ref}
+    if isinstance(value, Mapping):
+        return {key: _pack_value(item, refs) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_pack_value(item, refs) for item in value]
+    if isinstance(value, BaseMessage):
+        return {"$m": _pack_message(value)}
+    return value
+
+
+def _unpack_value(value: Any, refs: _RecordRefs) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if "$r" in value:
+                return refs.resolve(value["$r"])
+            if "$m" in value:
+                return _unpack_message(value["$m"])
+        return {key: _unpack_value(item, refs) for key, item in value.items()}
+    if isinstance(value, list):
+        items = (_unpack_value(item, refs) for item in value)
+        # A claim that no longer exists is dropped rather than left as None
+        return [item for item, raw in zip(items, value) if item is not None or not _is_claim_ref(raw)]
+    return value
+
+
+def _is_claim_ref(raw: Any) -> bool:
+    return isinstance(raw, dict) and len(raw) == 1 and "$r" in raw and raw["$r"][0] == "c"
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+def pack_state(state: Dict[str, Any], refs: Optional[_RecordRefs] = None) -> Dict[str, Any]:
+    """
+    Convert a state to plain, compact values (before the container encoding).
+
+    Args:
+        state: ConversationState dict
+        refs: Record reference resolver (created if not given)
+
+    Returns:
+        dict: Packed state (messages in the minimal schema, records as references)
+    """
+    refs = refs or _RecordRefs()
+    packed = {key: _pack_value(value, refs) for key, value in state.items() if key != "messages"}
+    packed["messages"] = [_pack_message(message) for message in state.get("messages", [])]
+    return packed
+
+
+def _dump(payload: Any, codec: str) -> bytes:
+    if codec == "msgpack" and msgpack is not None:
+        return _MSGPACK + msgpack.packb(payload, use_bin_type=True, default=json_default)
+    return _JSON + json.dumps(payload, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+def encode_state(state: Dict[str, Any]) -> bytes:
+    """
+    Encode a conversation state to bytes.
+
+    Args:
+        state: ConversationState dict (messages may be BaseMessage objects)
+
+    Returns:
+        bytes: Encoded payload (see module docstring)
+    """
+    return _dump([CODEC_VERSION, pack_state(state)], SESSION_CODEC)
+
+
+def decode_state(raw: bytes) -> Dict[str, Any]:
+    """
+    Decode bytes produced by encode_state() back into a conversation state.
+
+    Args:
+        raw: Encoded payload
+
+    Returns:
+        dict: ConversationState with BaseMessage objects restored
+
+    Raises:
+        ValueError: If the payload was written by an unknown codec version,
+                    or is msgpack and msgpack is not installed
+    """
+    raw = bytes(raw)
+    if raw[:1] == b"{":
+        # Version 1: plain JSON envelope
+        envelope = json.loads(raw)
+        if envelope.get("v") != 1:
+            raise ValueError(f"Unsupported session codec version: {envelope.get('v')}")
+        state = envelope["state"]
+        state["messages"] = messages_from_dict(state.get("messages", []))
+        return state
+
+    container, body = raw[:1], raw[1:]
+    if container == _MSGPACK:
+        if msgpack is None:
+            raise ValueError("Session was encoded with msgpack, which is not installed")
+        version, packed = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    elif container == _JSON:
+        version, packed = json.loads(body)
+    else:
+        raise ValueError("Unrecognized session payload")
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported session codec version: {version}")
+
+    refs = _RecordRefs()
+    messages = packed.pop("messages", [])
+    state = {key: _unpack_value(value, refs) for key, value in packed.items()}
+    state["messages"] = [_unpack_message(message) for message in messages]
+    return state
+
+
+def field_sizes(state: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Encoded size of each state field on its own (for footprint reports).
+
+    Args:
+        state: ConversationState dict
+
+    Returns:
+        dict: Field name → encoded bytes
+    """
+    packed = pack_state(state)
+    return {key: len(_dump(value, SESSION_CODEC)) - 1 for key, value in packed.items()}
@@ -0,0 +1,183 @@
+"""
+SQLite session backend for multi-worker deployments.
+
+The default session store lives in process memory, so a session created in one
+uvicorn worker is invisible to the others. This backend keeps sessions in a
+SQLite database in WAL mode instead: every worker (and every replica sharing
+the same volume) opens the same file, readers never block the writer, and
+updates use a version column for optimistic concurrency.
+
+Enable with:
+    SESSION_BACKEND=sqlite
+    SESSION_DB_PATH=data/sessions.db   (optional)
+
+Then run: uvicorn app.main:app --workers 4
+
+Every method is blocking. Async handlers reach this store through the
+coroutine API in sessions.py, which runs it in the bounded executor.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.api.session_codec import decode_state, encode_state
+from app.api.sessions import SessionConflictError
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id    TEXT PRIMARY KEY,
+    state         BLOB NOT NULL,
+    version       INTEGER NOT NULL,
+    last_activity REAL NOT NULL,
+    size_bytes    INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_activity ON sessions (last_activity);
+"""
+
+
+class SQLiteSessionStore:
+    """
+    Session store backed by a shared SQLite database.
+
+    Implements the same interface as SessionStore (create, get, update, delete,
+    expire, stats, footprint_samples). State is encoded with session_codec, so
+    get() always returns a fresh copy that the caller may mutate freely.
+
+    Attributes:
+        path: Path to the SQLite database file
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per process, serialized with a lock. Statements are
+        # short, and WAL lets other processes read while this one writes.
+        self._conn = sqlite3.connect(
+            str(self.path),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=5.0
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row is not None
+
+    def create(self, state: Dict) -> str:
+        """Store a new session and return its id."""
+        session_id = str(uuid4())
+        raw = encode_state(state)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, state, version, last_activity, size_bytes) "
+                "VALUES (?, ?, 1, ?, ?)",
+                (session_id, raw, time.time(), len(raw))
+            )
+        return session_id
+
+    def get(self, session_id: str) -> Optional[Tuple[Dict, int]]:
+        """Return (state, version) and refresh the session's last activity."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, version FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE sessions SET last_activity = ? WHERE session_id = ?",
+                (time.time(), session_id)
+            )
+        return decode_state(row[0]), row[1]
+
+    def update(self, session_id: str, state: Dict, expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Replace session state.
+
+        Returns the new version, or None if the session no longer exists.
+        Raises SessionConflictError if expected_version is stale.
+        """
+        raw = encode_state(state)
+        with self._lock:
+            if expected_version is None:
+                cursor = self._conn.execute(
+                    "UPDATE sessions SET state = ?, version = version + 1, last_activity = ?, size_bytes = ? "
+                    "WHERE session_id = ? RETURNING version",
+                    (raw, time.time(), len(raw), session_id)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE sessions SET state = ?, version = version + 1, last_activity = ?, size_bytes = ? "
+                    "WHERE session_id = ? AND version = ? RETURNING version",
+                    (raw, time.time(), len(raw), session_id, expected_version)
+                )
+            row = cursor.fetchone()
+            if row is not None:
+                return row[0]
+            exists = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if exists:
+            raise SessionConflictError(session_id)
+        return None
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return cursor.rowcount > 0
+
+    def expire(self, cutoff: datetime) -> int:
+        """Remove sessions whose last activity is older than cutoff (uses the last_activity index)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE last_activity < ?", (cutoff.timestamp(),)
+            )
+        self._expirations += cursor.rowcount
+        return cursor.rowcount
+
+    def footprint_samples(self, limit: int) -> List[Tuple[Dict, int, str]]:
+        """
+        Most recently used sessions for a footprint report.
+
+        Returns:
+            list: (state, stored bytes, "stored") per session
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, size_bytes FROM sessions ORDER BY last_activity DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [(decode_state(raw), size, "stored") for raw, size in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size statistics for the store."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM sessions"
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "path": str(self.path),
+            "session_count": count,
+            "total_bytes": total,
+            "average_session_bytes": total // count if count else 0,
+            "expirations": self._expirations
+        }
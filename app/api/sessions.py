@@ -4,17 +4,352 @@ Session management for conversation state persistence.
 This module provides in-memory session storage to maintain conversation state
 across HTTP requests. Each session is identified by a unique session_id (UUID)
 and includes the full LangGraph conversation state.
+
+The store is memory-bounded:
+- Every session tracks an approximate byte size of its state, refreshed on update.
+- A global memory budget (SESSION_MEMORY_BUDGET_MB) is enforced with LRU eviction,
+  so a traffic spike evicts the least recently used sessions instead of growing
+  the process without limit.
+- Sessions are kept in least-recently-used order, which is also expiry order.
+  Cleanup pops expired sessions from the front and stops at the first live one,
+  so its cost is proportional to the number of sessions that actually expire.
+- Sessions idle for SESSION_COLD_AFTER_SECONDS move to a cold tier: their
+  state is encoded with the compact session codec (session_codec.py) and
+  decoded again on next use. Over budget, the least recently used hot
+  sessions are moved to the cold tier before any session is evicted.
+
+Backends are pluggable (SESSION_BACKEND):
+- "memory" (default): process-local store described above.
+- "sqlite": shared SQLite database in WAL mode (see session_sqlite.py), so
+  several uvicorn workers or replicas on one host see the same sessions.
+
+Every session carries a version number. update_session() accepts the version
+the caller read, and raises SessionConflictError if another request updated
+the session in the meantime (optimistic concurrency).
+
+get_session_footprint() reports the size distribution of sessions, overall
+and per state field (GET /api/metrics/sessions).
+
+Async handlers use the coroutine versions (acreate_session,
+aget_session_with_version, aupdate_session, ...). The memory store answers
+inline; the SQLite backend's blocking calls run in the bounded executor
+(app/executor.py, under "sessions.sqlite"), so a slow write or a lock held by
+another worker never stalls the event loop.
 """
 
-from typing import Dict, Optional
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from uuid import uuid4
 
+from app.api.session_codec import decode_state, encode_state, field_sizes
+from app.data.records import Record
+from app.executor import run_blocking
+from app.graph.briefing import pending_briefing_sessions, prune_member_briefings
+
+
+# Global memory budget for all session state (approximate, in megabytes)
+SESSION_MEMORY_BUDGET_MB = float(os.getenv("SESSION_MEMORY_BUDGET_MB", "256"))
+
+# Session backend: "memory" (process-local) or "sqlite" (shared across workers)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory").lower()
+
+# Idle time after which an in-memory session is stored encoded (0 disables the cold tier)
+SESSION_COLD_AFTER_SECONDS = float(os.getenv("SESSION_COLD_AFTER_SECONDS", "300"))
+
+# Sessions decoded for a footprint report (most recently used first)
+SESSION_FOOTPRINT_SAMPLE = 200
+
+
+class SessionConflictError(Exception):
+    """Raised when a session was updated by another request since it was read."""
+
+
+# ============================================================================
+# Size Estimation
+# ============================================================================
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Approximate the deep memory footprint of an object in bytes.
+
+    Walks dicts, lists, tuples, sets and objects with __dict__ or __slots__
+    (which covers LangChain messages). Shared objects are only counted once,
+    and data records (records.py) are not counted at all: they belong to the
+    loaded data, not to the session. This is an estimate used for budgeting,
+    not an exact measurement.
+
+    Args:
+        obj: Object to measure
+        _seen: Internal set of already-visited object ids
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if _seen is None:
+        _seen = set()
+
+    obj_id = id(obj)
+    if obj_id in _seen:
+        return 0
+    _seen.add(obj_id)
+
+    if isinstance(obj, Record):
+        return 0
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _seen) + estimate_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+    else:
+        if hasattr(obj, "__dict__"):
+            size += estimate_size(vars(obj), _seen)
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                size += estimate_size(getattr(obj, slot), _seen)
+
+    return size
+
+
+# ============================================================================
+# Session Store
+# ============================================================================
 
-# In-memory session store
-# Structure: {session_id: {"state": ConversationState, "last_activity": datetime}}
-sessions: Dict[str, Dict] = {}
+class SessionStore:
+    """
+    In-memory, memory-bounded session store with LRU eviction and a cold tier.
+
+    Sessions live in an OrderedDict ordered from least to most recently used.
+    Touching a session moves it to the end, so the front of the dict always
+    holds the sessions that will expire (or be evicted) first. A second
+    OrderedDict tracks the hot (decoded) sessions in the same order, so
+    moving idle sessions to the cold tier only visits sessions that qualify.
+
+    Attributes:
+        max_bytes: Global memory budget for all session state
+        cold_after: Idle seconds before a session is encoded (0 disables the cold tier)
+    """
+
+    def __init__(self, max_bytes: int, cold_after: float = SESSION_COLD_AFTER_SECONDS):
+        self.max_bytes = max_bytes
+        self.cold_after = cold_after
+        # Structure: {session_id: {"state": ConversationState or None, "cold": bytes or None,
+        #                          "version": int, "last_activity": datetime, "size_bytes": int}}
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self._hot: "OrderedDict[str, None]" = OrderedDict()
+        self._total_bytes = 0
+        self._cold_bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._demotions = 0
+        self._promotions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def create(self, state: Dict) -> str:
+        """Store a new session and return its id."""
+        session_id = str(uuid4())
+        size = estimate_size(state)
+        self._sessions[session_id] = {
+            "state": state,
+            "cold": None,
+            "version": 1,
+            "last_activity": datetime.now(),
+            "size_bytes": size
+        }
+        self._hot[session_id] = None
+        self._total_bytes += size
+        self._enforce_budget(protect=session_id)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[Tuple[Dict, int]]:
+        """
+        Return (state, version) and mark the session as most recently used.
+
+        The state is a shallow copy with its own messages list, like the
+        decoded copy the SQLite backend returns: changes only reach the store
+        through update().
+        """
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if entry["cold"] is not None:
+            self._thaw(session_id, entry)
+        entry["last_activity"] = datetime.now()
+        self._sessions.move_to_end(session_id)
+        self._hot.move_to_end(session_id)
+        state = entry["state"]
+        return {**state, "messages": list(state.get("messages", []))}, entry["version"]
+
+    def update(self, session_id: str, state: Dict, expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Replace session state, re-measure its size and enforce the budget.
+
+        Returns the new version, or None if the session no longer exists.
+        Raises SessionConflictError if expected_version is stale.
+        """
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if expected_version is not None and entry["version"] != expected_version:
+            raise SessionConflictError(session_id)
+        if entry["cold"] is not None:
+            self._cold_bytes -= entry["size_bytes"]
+            entry["cold"] = None
+        size = estimate_size(state)
+        self._total_bytes += size - entry["size_bytes"]
+        entry["state"] = state
+        entry["version"] += 1
+        entry["size_bytes"] = size
+        entry["last_activity"] = datetime.now()
+        self._sessions.move_to_end(session_id)
+        self._hot[session_id] = None
+        self._hot.move_to_end(session_id)
+        self._enforce_budget(protect=session_id)
+        return entry["version"]
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+        entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        self._hot.pop(session_id, None)
+        self._total_bytes -= entry["size_bytes"]
+        if entry["cold"] is not None:
+            self._cold_bytes -= entry["size_bytes"]
+        return True
+
+    def expire(self, cutoff: datetime) -> int:
+        """
+        Remove sessions whose last activity is older than cutoff.
+
+        Walks from the least recently used end and stops at the first session
+        that is still active. Then moves sessions idle for cold_after seconds
+        to the cold tier.
+        """
+        expired = 0
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if entry["last_activity"] >= cutoff:
+                break
+            self.delete(session_id)
+            expired += 1
+        self._expirations += expired
+
+        if self.cold_after > 0:
+            cold_cutoff = datetime.now() - timedelta(seconds=self.cold_after)
+            while self._hot:
+                session_id = next(iter(self._hot))
+                if self._sessions[session_id]["last_activity"] >= cold_cutoff or not self._freeze(session_id):
+                    break
+        return expired
 
+    def stats(self) -> Dict[str, Any]:
+        """Return size, tier and eviction statistics for the store."""
+        count = len(self._sessions)
+        return {
+            "backend": "memory",
+            "session_count": count,
+            "hot_sessions": len(self._hot),
+            "cold_sessions": count - len(self._hot),
+            "total_bytes": self._total_bytes,
+            "cold_bytes": self._cold_bytes,
+            "budget_bytes": self.max_bytes,
+            "budget_used_percent": round(100 * self._total_bytes / self.max_bytes, 2) if self.max_bytes else 0,
+            "average_session_bytes": self._total_bytes // count if count else 0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "demotions": self._demotions,
+            "promotions": self._promotions
+        }
+
+    def footprint_samples(self, limit: int) -> List[Tuple[Dict, int, str]]:
+        """
+        Most recently used sessions for a footprint report.
+
+        Returns:
+            list: (state, bytes held by the store, "hot" or "cold") per session
+        """
+        samples = []
+        for session_id in reversed(self._sessions):
+            if len(samples) >= limit:
+                break
+            entry = self._sessions[session_id]
+            if entry["cold"] is not None:
+                samples.append((decode_state(entry["cold"]), entry["size_bytes"], "cold"))
+            else:
+                samples.append((entry["state"], entry["size_bytes"], "hot"))
+        return samples
+
+    def _freeze(self, session_id: str) -> bool:
+        """Encode a hot session into the cold tier. Returns False if it cannot be encoded."""
+        entry = self._sessions[session_id]
+        try:
+            raw = encode_state(entry["state"])
+        except (TypeError, ValueError) as e:
+            print(f"⚠️  Session {session_id} kept in memory, could not be encoded: {e}")
+            self._hot.move_to_end(session_id)
+            return False
+        self._total_bytes += len(raw) - entry["size_bytes"]
+        self._cold_bytes += len(raw)
+        entry["state"], entry["cold"], entry["size_bytes"] = None, raw, len(raw)
+        del self._hot[session_id]
+        self._demotions += 1
+        return True
+
+    def _thaw(self, session_id: str, entry: Dict) -> None:
+        """Decode a cold session back into memory."""
+        state = decode_state(entry["cold"])
+        size = estimate_size(state)
+        self._total_bytes += size - entry["size_bytes"]
+        self._cold_bytes -= entry["size_bytes"]
+        entry["state"], entry["cold"], entry["size_bytes"] = state, None, size
+        self._hot[session_id] = None
+        self._promotions += 1
+
+    def _enforce_budget(self, protect: Optional[str] = None) -> None:
+        """Move LRU sessions to the cold tier, then evict LRU sessions, until the store fits the budget."""
+        while self._total_bytes > self.max_bytes:
+            # Never demote or evict the session being written (it is normally the newest)
+            if self.cold_after > 0:
+                candidate = next((sid for sid in self._hot if sid != protect), None)
+                if candidate is not None and self._freeze(candidate):
+                    continue
+            victim = next((sid for sid in self._sessions if sid != protect), None)
+            if victim is None:
+                break
+            self.delete(victim)
+            self._evictions += 1
+
+
+def _create_store():
+    """Create the session store selected by SESSION_BACKEND."""
+    if SESSION_BACKEND == "sqlite":
+        from app.api.session_sqlite import SQLiteSessionStore
+        return SQLiteSessionStore(os.getenv("SESSION_DB_PATH", "data/sessions.db"))
+    return SessionStore(max_bytes=int(SESSION_MEMORY_BUDGET_MB * 1024 * 1024))
+
+
+# Module-level session store used by the API
+sessions = _create_store()
+
+
+# ============================================================================
+# Public API
+# ============================================================================
 
 def create_session() -> str:
     """
@@ -23,19 +358,14 @@ def create_session() -> str:
     Returns:
         str: New session_id (UUID)
     """
-    session_id = str(uuid4())
-    sessions[session_id] = {
-        "state": {
-            "messages": [],
-            "user_id": None,
-            "user_profile": None,
-            "conversation_context": {},
-            "tool_results": {},
-            "execution_trace": []
-        },
-        "last_activity": datetime.now()
-    }
-    return session_id
+    return sessions.create({
+        "messages": [],
+        "user_id": None,
+        "user_profile": None,
+        "conversation_context": {},
+        "tool_results": {},
+        "execution_trace": []
+    })
 
 
 def get_session(session_id: str) -> Optional[Dict]:
@@ -50,25 +380,42 @@ def get_session(session_id: str) -> Optional[Dict]:
     Returns:
         Dict: Session state, or None if session not found
     """
-    if session_id in sessions:
-        # Update last activity timestamp
-        sessions[session_id]["last_activity"] = datetime.now()
-        return sessions[session_id]["state"]
-    else:
-        return None
+    found = sessions.get(session_id)
+    return found[0] if found else None
+
+
+def get_session_with_version(session_id: str) -> Optional[Tuple[Dict, int]]:
+    """
+    Retrieve session state together with its version number.
+
+    Pass the version back to update_session() to detect concurrent updates.
+
+    Args:
+        session_id: Unique session identifier
+
+    Returns:
+        tuple: (state, version), or None if session not found
+    """
+    return sessions.get(session_id)
 
 
-def update_session(session_id: str, state: Dict) -> None:
+def update_session(session_id: str, state: Dict, expected_version: Optional[int] = None) -> None:
     """
     Update session state with new data.
 
+    Re-measures the session's size and evicts least recently used sessions
+    if the global memory budget is exceeded.
+
     Args:
         session_id: Unique session identifier
         state: Updated conversation state
+        expected_version: Version returned by get_session_with_version().
+                          If given and stale, the update is rejected.
+
+    Raises:
+        SessionConflictError: If the session changed since expected_version was read
     """
-    if session_id in sessions:
-        sessions[session_id]["state"] = state
-        sessions[session_id]["last_activity"] = datetime.now()
+    sessions.update(session_id, state, expected_version)
 
 
 def delete_session(session_id: str) -> None:
@@ -78,8 +425,7 @@ def delete_session(session_id: str) -> None:
     Args:
         session_id: Unique session identifier
     """
-    if session_id in sessions:
-        del sessions[session_id]
+    sessions.delete(session_id)
 
 
 def cleanup_sessions(max_inactive_minutes: int = 30) -> int:
@@ -87,7 +433,8 @@ def cleanup_sessions(max_inactive_minutes: int = 30) -> int:
     Remove sessions inactive for longer than max_inactive_minutes.
 
     Should be called periodically (e.g., every 5 minutes) to prevent
-    memory buildup from abandoned sessions.
+    memory buildup from abandoned sessions. Only the expired sessions
+    are visited.
 
     Args:
         max_inactive_minutes: Maximum allowed inactivity before cleanup (default: 30)
@@ -96,15 +443,7 @@ def cleanup_sessions(max_inactive_minutes: int = 30) -> int:
         int: Number of sessions cleaned up
     """
     cutoff = datetime.now() - timedelta(minutes=max_inactive_minutes)
-    expired = [
-        sid for sid, data in sessions.items()
-        if data["last_activity"] < cutoff
-    ]
-
-    for sid in expired:
-        del sessions[sid]
-
-    return len(expired)
+    return sessions.expire(cutoff)
 
 
 def get_session_count() -> int:
@@ -115,3 +454,159 @@ def get_session_count() -> int:
         int: Number of active sessions
     """
     return len(sessions)
+
+
+def get_session_stats() -> Dict[str, Any]:
+    """
+    Get memory and eviction statistics for the session store.
+
+    Returns:
+        dict: Session count, total/average size, budget usage, evictions and expirations
+    """
+    return sessions.stats()
+
+
+def _distribution(values: List[int]) -> Dict[str, Any]:
+    """Count, total, mean and percentiles of a list of sizes."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def percentile(p: float) -> int:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "total": sum(ordered),
+        "mean": sum(ordered) // len(ordered),
+        "min": ordered[0],
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p99": percentile(99),
+        "max": ordered[-1]
+    }
+
+
+def get_session_footprint(sample_size: int = SESSION_FOOTPRINT_SAMPLE) -> Dict[str, Any]:
+    """
+    Report how large sessions are, overall and per state field.
+
+    The most recently used sessions (up to sample_size) are measured two ways:
+    in memory (estimate_size, as used for the budget) and encoded with the
+    session codec (as held by the cold tier and the SQLite backend). The
+    capacity figures divide the memory budget by the mean sizes.
+
+    Args:
+        sample_size: Maximum number of sessions to measure
+
+    Returns:
+        dict: Size distributions (count, total, mean, min, p50, p90, p99, max)
+              for whole sessions and for each state field
+    """
+    samples = sessions.footprint_samples(sample_size)
+
+    stored, memory, encoded = [], [], []
+    tiers: Dict[str, int] = {}
+    field_memory: Dict[str, List[int]] = {}
+    field_encoded: Dict[str, List[int]] = {}
+
+    for state, stored_bytes, tier in samples:
+        stored.append(stored_bytes)
+        memory.append(estimate_size(state))
+        encoded.append(len(encode_state(state)))
+        tiers[tier] = tiers.get(tier, 0) + 1
+        for field, size in field_sizes(state).items():
+            field_encoded.setdefault(field, []).append(size)
+            field_memory.setdefault(field, []).append(estimate_size(state.get(field)))
+
+    report: Dict[str, Any] = {
+        "backend": sessions.stats()["backend"],
+        "session_count": len(sessions),
+        "sampled": len(samples),
+        "tiers": tiers,
+        "stored_bytes": _distribution(stored),
+        "memory_bytes": _distribution(memory),
+        "encoded_bytes": _distribution(encoded),
+        "fields": {
+            field: {
+                "memory_bytes": _distribution(field_memory[field]),
+                "encoded_bytes": _distribution(field_encoded[field])
+            }
+            for field in sorted(field_encoded)
+        }
+    }
+
+    budget = getattr(sessions, "max_bytes", None)
+    if budget and samples:
+        report["capacity"] = {
+            "budget_bytes": budget,
+            "sessions_if_all_hot": budget // max(1, sum(memory) // len(memory)),
+            "sessions_if_all_cold": budget // max(1, sum(encoded) // len(encoded))
+        }
+    return report
+
+
+# ============================================================================
+# Async API
+# ============================================================================
+
+async def _call(fn, *args):
+    """Run a session function inline (memory store) or in the executor (SQLite)."""
+    if SESSION_BACKEND == "sqlite":
+        return await run_blocking("sessions.sqlite", fn, *args)
+    return fn(*args)
+
+
+async def acreate_session() -> str:
+    """Create a new session (see create_session)."""
+    return await _call(create_session)
+
+
+async def aget_session_with_version(session_id: str) -> Optional[Tuple[Dict, int]]:
+    """Retrieve session state and version (see get_session_with_version)."""
+    return await _call(get_session_with_version, session_id)
+
+
+async def aupdate_session(session_id: str, state: Dict, expected_version: Optional[int] = None) -> None:
+    """
+    Update session state (see update_session).
+
+    Raises:
+        SessionConflictError: If the session changed since expected_version was read
+    """
+    await _call(update_session, session_id, state, expected_version)
+
+
+def _ended_sessions(session_ids: List[str]) -> List[str]:
+    """The given session ids that are no longer in the store."""
+    return [session_id for session_id in session_ids if session_id not in sessions]
+
+
+async def adelete_session(session_id: str) -> None:
+    """Delete a session (see delete_session) and drop its pending member briefing."""
+    await _call(delete_session, session_id)
+    prune_member_briefings([session_id])
+
+
+async def acleanup_sessions(max_inactive_minutes: int = 30) -> int:
+    """
+    Remove inactive sessions (see cleanup_sessions).
+
+    Member briefings still waiting for the first question of a session that
+    has expired or was evicted are dropped as well.
+    """
+    cleaned = await _call(cleanup_sessions, max_inactive_minutes)
+    pending = pending_briefing_sessions()
+    if pending:
+        prune_member_briefings(await _call(_ended_sessions, pending))
+    return cleaned
+
+
+async def aget_session_stats() -> Dict[str, Any]:
+    """Get session store statistics (see get_session_stats)."""
+    return await _call(get_session_stats)
+
+
+async def aget_session_footprint(sample_size: int = SESSION_FOOTPRINT_SAMPLE) -> Dict[str, Any]:
+    """Report session sizes (see get_session_footprint)."""
+    return await _call(get_session_footprint, sample_size)
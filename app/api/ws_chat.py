@@ -0,0 +1,305 @@
+"""
+WebSocket Chat Endpoint for the web frontend.
+
+GET /ws/chat upgrades to a WebSocket bound to one conversation session. Turns
+run through run_chat_turn(), exactly like POST /api/chat, but progress is
+pushed while the graph runs instead of arriving all at once at the end.
+
+Connecting:
+    /ws/chat                         new session
+    /ws/chat?session_id=abc          continue a session
+    /ws/chat?session_id=abc&cursor=41  resume after a dropped connection
+
+Client → server:
+    {"type": "message", "message": "Do I have pending claims?",
+     "deadline_ms": 30000, "fields": [...], "state_version": "...",
+     "trace_level": "summary"}   (last four optional)
+    {"type": "ping"}
+
+Server → client (every event except ping/pong carries "seq"):
+    {"type": "session", "session_id": ...}
+    {"type": "node", "node": "orchestrate_tools", "progress_messages": [...]}
+    {"type": "tool", "tool": "claims_status", "stage": "started" | "finished", ...}
+    {"type": "token", "text": "Your "}
+    {"type": "done", "result": {...ChatResponse, state only if it changed...}}
+    {"type": "error", "status": 409, "detail": "..."}
+    {"type": "ping"} / {"type": "pong"}   heartbeats (no seq)
+
+Events are kept per session in a bounded ring buffer. A client that
+reconnects with the last seq it saw gets everything after it replayed, and a
+turn keeps running for WS_RESUME_GRACE_SECONDS after a disconnect so it can
+be resumed. A slow client is sent coalesced token events; if it falls behind
+by more than the buffer it receives {"type": "resume_gap"} and should rely on
+the "done" event for the full answer.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.api.chat import (
+    describe_turn_error,
+    run_chat_turn,
+    shape_response,
+    turn_budget_seconds
+)
+from app.api.sessions import acreate_session, aget_session_with_version
+from app.graph.tracing import TRACE_LEVELS
+from app.llm.deadline import record_cancellation
+
+
+# Events kept per session for resume
+WS_RESUME_BUFFER = int(os.getenv("WS_RESUME_BUFFER", "1000"))
+# Idle time before the server sends a heartbeat ping
+WS_HEARTBEAT_SECONDS = float(os.getenv("WS_HEARTBEAT_SECONDS", "20"))
+# How long a running turn waits for the client to reconnect before it is cancelled
+WS_RESUME_GRACE_SECONDS = float(os.getenv("WS_RESUME_GRACE_SECONDS", "15"))
+# A single send taking longer than this closes the connection (client stalled)
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+# Detached channels idle longer than this are dropped
+WS_CHANNEL_TTL_SECONDS = 300
+
+
+# ============================================================================
+# Per-Session Event Channel
+# ============================================================================
+
+class SessionChannel:
+    """
+    Ordered, bounded event log for one session, shared by its connections.
+
+    Args:
+        session_id: Session the channel belongs to
+        size: Number of events kept for resume
+    """
+
+    def __init__(self, session_id: str, size: int = WS_RESUME_BUFFER):
+        self.session_id = session_id
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self.next_seq = 1
+        self.connections = 0
+        self.last_used = time.monotonic()
+        self.turn_task: Optional[asyncio.Task] = None
+        self.last_state_version: Optional[str] = None
+        self._cancel_handle: Optional[asyncio.TimerHandle] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """Append an event and wake up senders. Returns its seq."""
+        seq = self.next_seq
+        self.next_seq += 1
+        self.events.append({"seq": seq, **event})
+        self.last_used = time.monotonic()
+        self._changed.set()
+        return seq
+
+    def since(self, cursor: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Get events after a cursor.
+
+        Returns:
+            tuple: (events with seq > cursor, True if some were already dropped)
+        """
+        first_kept = self.events[0]["seq"] if self.events else self.next_seq
+        gap = cursor + 1 < first_kept
+        return [event for event in self.events if event["seq"] > cursor], gap
+
+    async def wait_for_events(self, cursor: int, timeout: float) -> bool:
+        """Wait until there are events after cursor. Returns False on timeout."""
+        while self.next_seq - 1 <= cursor:
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def attach(self) -> None:
+        """Register a connection (cancels a pending disconnect timeout)."""
+        self.connections += 1
+        self.last_used = time.monotonic()
+        if self._cancel_handle is not None:
+            self._cancel_handle.cancel()
+            self._cancel_handle = None
+
+    def detach(self) -> None:
+        """Unregister a connection; a running turn is cancelled if nobody reconnects in time."""
+        self.connections = max(0, self.connections - 1)
+        self.last_used = time.monotonic()
+        if self.connections == 0 and self.turn_task is not None and not self.turn_task.done():
+            self._cancel_handle = asyncio.get_running_loop().call_later(
+                WS_RESUME_GRACE_SECONDS, self._cancel_abandoned_turn
+            )
+
+    def _cancel_abandoned_turn(self) -> None:
+        self._cancel_handle = None
+        if self.connections == 0 and self.turn_task is not None and not self.turn_task.done():
+            record_cancellation("client_disconnect")
+            print(f"🔌 WebSocket client for {self.session_id} did not return, cancelling turn")
+            self.turn_task.cancel()
+
+
+# Open channels by session_id
+_channels: Dict[str, SessionChannel] = {}
+
+
+def _prune_channels() -> None:
+    """Drop channels nobody has used for a while."""
+    cutoff = time.monotonic() - WS_CHANNEL_TTL_SECONDS
+    for session_id, channel in list(_channels.items()):
+        idle = channel.connections == 0 and (channel.turn_task is None or channel.turn_task.done())
+        if idle and channel.last_used < cutoff:
+            del _channels[session_id]
+
+
+def get_channel(session_id: str) -> SessionChannel:
+    """Get or create the channel for a session."""
+    _prune_channels()
+    channel = _channels.get(session_id)
+    if channel is None:
+        channel = _channels[session_id] = SessionChannel(session_id)
+    return channel
+
+
+def coalesce_tokens(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge runs of consecutive token events into one (keeps the last seq)."""
+    merged: List[Dict[str, Any]] = []
+    for event in events:
+        if event["type"] == "token" and merged and merged[-1]["type"] == "token":
+            merged[-1] = {**event, "text": merged[-1]["text"] + event["text"]}
+        else:
+            merged.append(event)
+    return merged
+
+
+# ============================================================================
+# Turn Execution
+# ============================================================================
+
+async def run_turn(channel: SessionChannel, request: Dict[str, Any]) -> None:
+    """
+    Run one turn for a channel, publishing progress and the final result.
+
+    Args:
+        channel: The session's channel
+        request: Client "message" payload
+    """
+    session_id = channel.session_id
+    try:
+        response = await run_chat_turn(
+            request["message"],
+            session_id,
+            turn_budget_seconds(request.get("deadline_ms")),
+            on_event=channel.publish,
+            trace_level=request.get("trace_level")
+        )
+        known_version = request.get("state_version") or channel.last_state_version
+        channel.publish({
+            "type": "done",
+            "result": shape_response(response, request.get("fields"), known_version)
+        })
+        channel.last_state_version = response.state_version
+
+        if response.session_id != session_id:
+            # The session had expired and a new one was created: rebind the channel
+            _channels.pop(session_id, None)
+            channel.session_id = response.session_id
+            _channels[response.session_id] = channel
+            channel.publish({"type": "session", "session_id": response.session_id})
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        status_code, detail = describe_turn_error(e)
+        if status_code == 500:
+            print(f"WebSocket chat error: {str(e)}")
+        channel.publish({"type": "error", "status": status_code, "detail": detail})
+
+
+# ============================================================================
+# API Router
+# ============================================================================
+
+router = APIRouter()
+
+
+async def _send_events(websocket: WebSocket, channel: SessionChannel, cursor: int) -> None:
+    """Push the channel's events to one connection, starting after cursor."""
+    while True:
+        events, gap = channel.since(cursor)
+        if gap:
+            await websocket.send_json({"type": "resume_gap", "oldest_seq": events[0]["seq"] if events else channel.next_seq})
+        if events:
+            for event in coalesce_tokens(events):
+                await asyncio.wait_for(websocket.send_json(event), timeout=WS_SEND_TIMEOUT_SECONDS)
+            cursor = events[-1]["seq"]
+            continue
+        if not await channel.wait_for_events(cursor, WS_HEARTBEAT_SECONDS):
+            await asyncio.wait_for(websocket.send_json({"type": "ping"}), timeout=WS_SEND_TIMEOUT_SECONDS)
+
+
+@router.websocket("/ws/chat")
+async def ws_chat(websocket: WebSocket):
+    """
+    Chat over a WebSocket bound to one session (see module docstring for the protocol).
+
+    Query params:
+        session_id: Session to continue (a new one is created if missing or expired)
+        cursor: Last event seq the client received, to resume after a reconnect
+    """
+    await websocket.accept()
+
+    session_id = websocket.query_params.get("session_id")
+    if not session_id or await aget_session_with_version(session_id) is None:
+        session_id = await acreate_session()
+    try:
+        cursor = int(websocket.query_params.get("cursor", "0"))
+    except ValueError:
+        cursor = 0
+
+    channel = get_channel(session_id)
+    channel.attach()
+    if cursor == 0:
+        # Fresh connection: start from the current end of the log
+        cursor = channel.next_seq - 1
+        channel.publish({"type": "session", "session_id": session_id})
+
+    sender = asyncio.create_task(_send_events(websocket, channel, cursor))
+    try:
+        while True:
+            receive = asyncio.create_task(websocket.receive_text())
+            done, _ = await asyncio.wait({receive, sender}, return_when=asyncio.FIRST_COMPLETED)
+            if sender in done:
+                # Send failed or timed out (client stalled or gone)
+                receive.cancel()
+                sender.result()
+                break
+            try:
+                payload = json.loads(receive.result())
+            except ValueError:
+                payload = None
+
+            kind = payload.get("type") if isinstance(payload, dict) else None
+            if kind == "ping":
+                await websocket.send_json({"type": "pong"})
+            elif kind == "message" and isinstance(payload.get("message"), str):
+                if payload.get("trace_level") not in (None, *TRACE_LEVELS):
+                    channel.publish({"type": "error", "status": 400,
+                                     "detail": f"Unknown trace_level (expected one of {', '.join(TRACE_LEVELS)})."})
+                elif channel.turn_task is not None and not channel.turn_task.done():
+                    channel.publish({"type": "error", "status": 409, "detail": "A message is already being answered."})
+                else:
+                    channel.turn_task = asyncio.create_task(run_turn(channel, payload))
+            else:
+                channel.publish({"type": "error", "status": 400, "detail": "Unknown message type."})
+
+    except (WebSocketDisconnect, asyncio.TimeoutError):
+        pass
+    finally:
+        sender.cancel()
+        channel.detach()
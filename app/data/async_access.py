@@ -0,0 +1,82 @@
+"""
+Async Data Access for CARE Assistant.
+
+Coroutine versions of the loader's query functions, used by the async-native
+tools and graph nodes so data access never blocks the event loop:
+
+- In-memory data with lookup indexes (the default) answers in microseconds
+  from dicts, so queries run inline on the event loop with no thread hop.
+- Everything else does I/O or long scans: the SQLite backend
+  (DATA_BACKEND=sqlite), and in-memory data without indexes. Those queries
+  run in the bounded blocking executor (app/executor.py), under the name
+  "data.<backend>", so their latency and queue wait show up in /api/metrics.
+
+A future service-backed data layer would implement these coroutines with a
+native async client instead; callers don't change.
+
+Usage:
+    from app.data.async_access import aget_user_with_plan
+    user = await aget_user_with_plan("user_001")
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from app.data import loader
+from app.executor import run_blocking
+
+
+def _backend_name(data: Any) -> Optional[str]:
+    """Executor stats name if queries on data block, None if they are in-memory lookups."""
+    if not isinstance(data, dict):
+        return "data.sqlite"
+    if data.get("indexes") is None:
+        return "data.scan"
+    return None
+
+
+async def _query(query: Callable[..., Any], *args: Any) -> Any:
+    data = loader.get_data()
+    backend = _backend_name(data)
+    if backend is None:
+        return query(*args, data)
+    return await run_blocking(backend, query, *args, data)
+
+
+async def aget_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a user by their user_id (see loader.get_user_by_id).
+
+    Raises:
+        RuntimeError: If data hasn't been initialized yet
+    """
+    return await _query(loader.get_user_by_id, user_id)
+
+
+async def afind_user_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a user by first or full name, case-insensitive (see loader.find_user_by_name).
+
+    Raises:
+        RuntimeError: If data hasn't been initialized yet
+    """
+    return await _query(loader.find_user_by_name, name)
+
+
+async def aget_claims_for_user(user_id: str) -> List[Dict[str, Any]]:
+    """
+    Get all claims for a user (see loader.get_claims_for_user).
+
+    Raises:
+        RuntimeError: If data hasn't been initialized yet
+    """
+    return await _query(loader.get_claims_for_user, user_id)
+
+
+async def aget_user_with_plan(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a user profile with their plan under 'plan_details' (see loader.get_user_with_plan).
+
+    Raises:
+        RuntimeError: If data hasn't been initialized yet
+    """
+    return await _query(loader.get_user_with_plan, user_id)
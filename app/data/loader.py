@@ -10,6 +10,35 @@ Data files (located in /data/ at project root):
 - insurance_plans.json: Contains plan types and coverage information
 - claims_data.json: Contains historical claims records
 
+Each dataset may also be given as JSON Lines (claims_data.jsonl) or as
+chunked exports (claims_data.000.jsonl, claims_data.001.jsonl, ...). Files
+are parsed as a stream (see streaming.py): records are validated and
+indexed as they are read, so large claims files never exist in memory as
+text or as a second parsed copy.
+
+Records are stored as compact, immutable User / Plan / Claim objects (see
+records.py). They behave as read-only mappings, so record["name"] and
+record.get("plan_id") work as with the parsed dicts.
+
+The loaded data dict holds the record lists plus lookup indexes:
+    data["indexes"]["users_by_id"]     user_id → user
+    data["indexes"]["users_by_name"]   lowercase full name / first name → user
+    data["indexes"]["plans_by_id"]     plan_id → plan
+    data["indexes"]["claims_by_user"]  user_id → list of claims
+
+The query functions use the indexes when present and fall back to a scan
+for data dicts built by hand (e.g. in benchmarks).
+
+With DATA_BACKEND=sqlite, get_data() returns a SQLiteDataBackend (see
+sqlite_backend.py) instead of a dict, and the query functions below
+delegate to it. Code that only uses the query functions works with either
+backend.
+
+initialize_data() caches the parsed records and indexes in a binary
+snapshot (data/.cache/snapshot.bin, see snapshot.py) and reuses it on later
+starts while the source files are unchanged. data["version"] identifies the
+source contents, so caches derived from the data can be keyed by it.
+
 Usage:
     from app.data.loader import load_all_data, get_user_by_id
 
@@ -20,15 +49,40 @@ Usage:
     user = get_user_by_id("user_001", data)
 """
 
+import hashlib
 import json
+import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+from app.data.records import UserWithPlan, make_record
+from app.data.snapshot import DATA_SNAPSHOT, build_manifest, load_snapshot, manifest_version, save_snapshot
+from app.data.streaming import find_sources, iter_records, print_progress, validate_record
+from app.data.sqlite_backend import DATA_DB_PATH, SQLiteDataBackend, database_is_current, import_from_sources
 
 
 # Get the root-level data directory
 # Navigate from /app/data/loader.py up to project root, then into /data
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 
+# Datasets as (key in the data dict, file stem). Plans load first so they
+# are available while users stream in.
+DATASETS = (
+    ("plans", "insurance_plans"),
+    ("users", "user_profiles"),
+    ("claims", "claims_data"),
+)
+
+# How many invalid records to describe individually per dataset
+MAX_REPORTED_ERRORS = 5
+
+# Binary snapshot of the loaded data
+SNAPSHOT_PATH = DATA_DIR / ".cache" / "snapshot.bin"
+
+# "memory" (default): everything in process memory; "sqlite": query a local database
+DATA_BACKEND = os.getenv("DATA_BACKEND", "memory").lower()
+
 
 def load_json_file(filename: str) -> Dict[str, Any]:
     """
@@ -53,6 +107,119 @@ def load_json_file(filename: str) -> Dict[str, Any]:
         return json.load(f)
 
 
+# ============================================================================
+# Indexes
+# ============================================================================
+
+def new_indexes() -> Dict[str, Dict[str, Any]]:
+    """Create empty lookup indexes (see module docstring)."""
+    return {
+        "users_by_id": {},
+        "users_by_name": {},
+        "plans_by_id": {},
+        "claims_by_user": {},
+    }
+
+
+def index_record(kind: str, record: Dict[str, Any], indexes: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    Add one record to the indexes.
+
+    Args:
+        kind: Dataset name ("users", "plans", "claims")
+        record: Validated record
+        indexes: Indexes from new_indexes()
+
+    Returns:
+        bool: False if the record's id is already indexed (duplicate), True otherwise
+    """
+    if kind == "claims":
+        indexes["claims_by_user"].setdefault(record["user_id"], []).append(record)
+        return True
+
+    if kind == "plans":
+        if record["plan_id"] in indexes["plans_by_id"]:
+            return False
+        indexes["plans_by_id"][record["plan_id"]] = record
+        return True
+
+    if record["user_id"] in indexes["users_by_id"]:
+        return False
+    indexes["users_by_id"][record["user_id"]] = record
+    # First user in file order wins for a name, like the original linear search
+    full_name = record["name"].strip().lower()
+    indexes["users_by_name"].setdefault(full_name, record)
+    if full_name:
+        indexes["users_by_name"].setdefault(full_name.split()[0], record)
+    return True
+
+
+def build_indexes(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Build indexes for a data dict whose record lists are already in memory.
+
+    Args:
+        data: Dict with 'users', 'plans' and 'claims' lists
+
+    Returns:
+        dict: The indexes (also stored as data['indexes'])
+    """
+    indexes = new_indexes()
+    for kind in ("plans", "users", "claims"):
+        for record in data.get(kind, []):
+            index_record(kind, record, indexes)
+    data["indexes"] = indexes
+    return indexes
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def load_dataset(kind: str, stem: str, data: Dict[str, Any], show_progress: bool = True) -> Tuple[int, int]:
+    """
+    Stream every source file of a dataset into data[kind] and the indexes.
+
+    Invalid and duplicate records are skipped and reported.
+
+    Args:
+        kind: Dataset name ("users", "plans", "claims"), also the array key in .json files
+        stem: File stem (e.g. "claims_data")
+        data: Data dict being built (with 'indexes')
+        show_progress: Print progress lines for large files
+
+    Returns:
+        tuple: (records loaded, records skipped)
+
+    Raises:
+        FileNotFoundError: If no source file exists for the dataset
+    """
+    sources = find_sources(DATA_DIR, stem)
+    if not sources:
+        raise FileNotFoundError(f"Data file not found: {DATA_DIR / (stem + '.json')}")
+
+    records = data.setdefault(kind, [])
+    indexes = data["indexes"]
+    loaded = skipped = 0
+
+    for path in sources:
+        for position, record in enumerate(iter_records(path, kind, print_progress if show_progress else None)):
+            problem = validate_record(kind, record)
+            if problem is None:
+                record = make_record(kind, record)
+                if not index_record(kind, record, indexes):
+                    problem = "duplicate id"
+            if problem is not None:
+                skipped += 1
+                if skipped <= MAX_REPORTED_ERRORS:
+                    print(f"  ⚠️  {path.name} record {position}: {problem} (skipped)")
+                continue
+            records.append(record)
+            loaded += 1
+
+    return loaded, skipped
+
+
 def load_all_data() -> Dict[str, Any]:
     """
     Load all mock data files into memory.
@@ -62,6 +229,7 @@ def load_all_data() -> Dict[str, Any]:
             - 'users': List of user profiles
             - 'plans': List of insurance plans
             - 'claims': List of claims records
+            - 'indexes': Lookup indexes (see module docstring)
 
     Example:
         >>> data = load_all_data()
@@ -69,22 +237,18 @@ def load_all_data() -> Dict[str, Any]:
         Loaded 3 users
     """
     print("📂 Loading mock data...")
+    started = time.perf_counter()
 
     try:
-        user_data = load_json_file("user_profiles.json")
-        plan_data = load_json_file("insurance_plans.json")
-        claims_data = load_json_file("claims_data.json")
+        data: Dict[str, Any] = {"users": [], "plans": [], "claims": [], "indexes": new_indexes()}
+        labels = {"users": "user profiles", "plans": "insurance plans", "claims": "claims records"}
 
-        data = {
-            'users': user_data.get('users', []),
-            'plans': plan_data.get('plans', []),
-            'claims': claims_data.get('claims', [])
-        }
-
-        print(f"  ✓ Loaded {len(data['users'])} user profiles")
-        print(f"  ✓ Loaded {len(data['plans'])} insurance plans")
-        print(f"  ✓ Loaded {len(data['claims'])} claims records")
+        for kind, stem in DATASETS:
+            loaded, skipped = load_dataset(kind, stem, data)
+            note = f" ({skipped} invalid skipped)" if skipped else ""
+            print(f"  ✓ Loaded {loaded} {labels[kind]}{note}")
 
+        print(f"  ⏱️  Data loaded in {time.perf_counter() - started:.2f}s")
         return data
 
     except Exception as e:
@@ -109,12 +273,51 @@ def get_user_by_id(user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any
         >>> print(user['name'])
         Sarah Johnson
     """
+    if not isinstance(data, dict):
+        return data.get_user_by_id(user_id)
+
+    indexes = data.get('indexes')
+    if indexes is not None:
+        return indexes['users_by_id'].get(user_id)
+
     for user in data.get('users', []):
         if user.get('user_id') == user_id:
             return user
     return None
 
 
+def find_user_by_name(name: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Find a user by first name or full name (case-insensitive).
+
+    Args:
+        name: Name as given by the member (e.g. "Sarah" or "Sarah Johnson")
+        data: The loaded data dictionary from load_all_data()
+
+    Returns:
+        dict: The first matching user profile, None if no user matches
+
+    Example:
+        >>> data = load_all_data()
+        >>> find_user_by_name("sarah", data)['user_id']
+        'user_001'
+    """
+    if not isinstance(data, dict):
+        return data.find_user_by_name(name)
+
+    wanted = name.strip().lower()
+    indexes = data.get('indexes')
+    if indexes is not None:
+        return indexes['users_by_name'].get(wanted)
+
+    for user in data.get('users', []):
+        user_name = user.get('name', '')
+        first_name = user_name.split()[0].lower() if user_name else ''
+        if wanted == first_name or wanted == user_name.lower():
+            return user
+    return None
+
+
 def get_plan_by_id(plan_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Find an insurance plan by its plan_id.
@@ -132,6 +335,13 @@ def get_plan_by_id(plan_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any
         >>> print(plan['plan_name'])
         PPO Gold
     """
+    if not isinstance(data, dict):
+        return data.get_plan_by_id(plan_id)
+
+    indexes = data.get('indexes')
+    if indexes is not None:
+        return indexes['plans_by_id'].get(plan_id)
+
     for plan in data.get('plans', []):
         if plan.get('plan_id') == plan_id:
             return plan
@@ -155,6 +365,13 @@ def get_claims_for_user(user_id: str, data: Dict[str, Any]) -> List[Dict[str, An
         >>> print(f"User has {len(claims)} claims")
         User has 3 claims
     """
+    if not isinstance(data, dict):
+        return data.get_claims_for_user(user_id)
+
+    indexes = data.get('indexes')
+    if indexes is not None:
+        return list(indexes['claims_by_user'].get(user_id, ()))
+
     return [
         claim for claim in data.get('claims', [])
         if claim.get('user_id') == user_id
@@ -170,7 +387,8 @@ def get_user_with_plan(user_id: str, data: Dict[str, Any]) -> Optional[Dict[str,
         data: The loaded data dictionary from load_all_data()
 
     Returns:
-        dict: User profile with embedded plan details, None if user not found
+        Mapping: Read-only view of the user profile with the plan under
+                 'plan_details' (no copy is made), None if user not found
 
     Example:
         >>> data = load_all_data()
@@ -184,32 +402,84 @@ def get_user_with_plan(user_id: str, data: Dict[str, Any]) -> Optional[Dict[str,
 
     plan = get_plan_by_id(user.get('plan_id'), data)
 
-    # Create a copy of user with plan details embedded
-    user_with_plan = user.copy()
-    user_with_plan['plan_details'] = plan
+    # View over the shared user and plan records instead of a copy
+    return UserWithPlan(user, plan)
+
 
-    return user_with_plan
+# Module-level storage for loaded data (set at application startup):
+# a data dict, or a SQLiteDataBackend when DATA_BACKEND=sqlite
+_LOADED_DATA: Optional[Any] = None
 
 
-# Module-level storage for loaded data (set at application startup)
-_LOADED_DATA: Optional[Dict[str, Any]] = None
+def all_sources() -> List[Path]:
+    """Every source file of every dataset, in load order."""
+    return [path for _, stem in DATASETS for path in find_sources(DATA_DIR, stem)]
 
 
 def initialize_data():
     """
     Initialize the module-level data storage.
     Call this once at application startup.
-    """
-    global _LOADED_DATA
-    _LOADED_DATA = load_all_data()
 
+    Uses the binary snapshot if it matches the source files; otherwise parses
+    the sources and writes a fresh snapshot (unless DATA_SNAPSHOT=0).
 
-def get_data() -> Dict[str, Any]:
+    With DATA_BACKEND=sqlite, opens the database instead, importing the
+    source files first if the database is missing or out of date.
+    """
+    global _LOADED_DATA
+    sources = all_sources()
+
+    if DATA_BACKEND == "sqlite":
+        db_path = Path(DATA_DB_PATH)
+        if not database_is_current(db_path, sources):
+            print(f"📥 Importing data into {db_path}...")
+            started = time.perf_counter()
+            counts = import_from_sources(DATA_DIR, db_path, DATASETS)
+            print(f"  ✓ Imported {counts['users']} users, {counts['plans']} plans, {counts['claims']} claims "
+                  f"in {time.perf_counter() - started:.2f}s")
+        _LOADED_DATA = SQLiteDataBackend(db_path)
+        counts = _LOADED_DATA.counts
+        print(f"🗄️  Using SQLite data backend ({counts['users']} users, {counts['plans']} plans, "
+              f"{counts['claims']} claims)")
+        return
+
+    if DATA_SNAPSHOT:
+        started = time.perf_counter()
+        data = load_snapshot(SNAPSHOT_PATH, sources)
+        if data is not None:
+            print(
+                f"⚡ Loaded data snapshot in {(time.perf_counter() - started) * 1000:.0f} ms "
+                f"({len(data['users'])} users, {len(data['plans'])} plans, {len(data['claims'])} claims)"
+            )
+            _LOADED_DATA = data
+            return
+
+        # Describe the sources before parsing, so edits made during the load
+        # leave the snapshot stale rather than silently out of date
+        manifest = build_manifest(sources)
+        data = load_all_data()
+        data["version"] = manifest_version(manifest)
+        try:
+            size = save_snapshot(SNAPSHOT_PATH, data, manifest)
+            print(f"  💾 Wrote data snapshot ({size / 1024:.0f} KB)")
+        except OSError as e:
+            print(f"  ⚠️  Could not write data snapshot: {e}")
+    else:
+        data = load_all_data()
+        # Cheap version without hashing: file names, sizes and mtimes
+        stamp = ";".join(f"{p.name}:{p.stat().st_size}:{p.stat().st_mtime_ns}" for p in sources)
+        data["version"] = hashlib.sha256(stamp.encode("utf-8")).hexdigest()[:16]
+
+    _LOADED_DATA = data
+
+
+def get_data() -> Any:
     """
     Get the loaded data from module-level storage.
 
     Returns:
-        dict: The loaded data
+        dict: The loaded data (a SQLiteDataBackend when DATA_BACKEND=sqlite)
 
     Raises:
         RuntimeError: If data hasn't been initialized yet
@@ -219,3 +489,16 @@ def get_data() -> Dict[str, Any]:
             "Data not initialized. Call initialize_data() first."
         )
     return _LOADED_DATA
+
+
+def get_data_version() -> str:
+    """
+    Get the identifier of the loaded data's source contents.
+
+    Returns:
+        str: Version string, "unversioned" for data dicts without one
+
+    Raises:
+        RuntimeError: If data hasn't been initialized yet
+    """
+    return get_data().get("version", "unversioned")
@@ -0,0 +1,301 @@
+"""
+Compact, Immutable Record Types for Users, Plans and Claims.
+
+Parsed JSON records are dicts: a hash table per record plus a separate string
+object for every value, even when a million claims share the same status.
+The loader stores records as instances of the classes below instead:
+- one fixed __slots__ layout per dataset (no per-record hash table)
+- low-cardinality strings (claim status, network, plan type, provider,
+  dates, ids shared between records) are interned, so each distinct value
+  exists once
+- records are immutable, so they can be shared by reference: plans are
+  never copied per user, and get_user_with_plan() returns a UserWithPlan
+  view instead of a copy
+
+Every record is a read-only Mapping with the same keys and values as the
+source JSON object (fields missing in the source stay missing, unknown
+fields are kept), so code written against dicts (record["name"],
+record.get("plan_id"), dict(record), f"{record}") keeps working. Values
+nested inside a record (a plan's coverage table) are plain dicts shared by
+every reader: treat them as read-only.
+
+Records are not JSON types. Use to_builtin() to convert a result tree
+before handing it to a serializer that only knows dicts, or
+json_default() as the `default=` hook of json.dumps().
+
+Usage:
+    claim = Claim.from_dict({"claim_id": "CLM-1", "claim_status": "Approved", ...})
+    claim["claim_status"]      # "Approved"
+    claim.claim_status         # same value, as an attribute
+    json.dumps(claims, default=json_default)
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, ClassVar, Dict, FrozenSet, Iterator, Optional, Tuple
+
+
+# Marks a field that the source record did not have
+_MISSING = object()
+
+
+class Record(Mapping):
+    """
+    Base class: an immutable Mapping over a fixed set of slots.
+
+    Subclasses list their fields in FIELDS (also their __slots__) and the
+    string fields worth interning in INTERNED. Keys not in FIELDS are kept
+    in a small side dict.
+    """
+
+    __slots__ = ("_extra",)
+
+    FIELDS: ClassVar[Tuple[str, ...]] = ()
+    INTERNED: ClassVar[FrozenSet[str]] = frozenset()
+    _field_set: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __init__(self, **values: Any):
+        _fill(self, values)
+
+    @classmethod
+    def from_dict(cls, record: Mapping) -> "Record":
+        """
+        Build a record from a parsed JSON object (records of this type are returned as-is).
+
+        Args:
+            record: Source mapping
+
+        Returns:
+            Record: Immutable record with the same keys and values
+        """
+        if type(record) is cls:
+            return record
+        instance = object.__new__(cls)
+        _fill(instance, record)
+        return instance
+
+    # ---- immutability -----------------------------------------------------
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __reduce__(self):
+        # Compact pickling (data snapshots): values in field order, missing fields as a bitmask
+        values = tuple(getattr(self, name, None) for name in self.FIELDS)
+        missing = sum(1 << i for i, name in enumerate(self.FIELDS) if not hasattr(self, name))
+        return (_restore, (type(self), values, missing, self._extra))
+
+    # ---- Mapping interface ------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_set:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._field_set:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        # Render like the source dict, so prompts built from records are unchanged
+        return repr(dict(self))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy of the record (nested values are shared)."""
+        return dict(self)
+
+
+def _fill(instance: Record, values: Mapping) -> None:
+    """Set a new record's slots from a mapping."""
+    fields = instance._field_set
+    interned = instance.INTERNED
+    extra = None
+    for key, value in values.items():
+        if key in fields:
+            if key in interned and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(instance, key, value)
+        else:
+            if extra is None:
+                extra = {}
+            extra[key] = value
+    object.__setattr__(instance, "_extra", extra)
+
+
+def _restore(cls, values: Tuple[Any, ...], missing: int, extra: Optional[Dict[str, Any]]) -> Record:
+    """Unpickle a record written by Record.__reduce__."""
+    instance = object.__new__(cls)
+    for i, (name, value) in enumerate(zip(cls.FIELDS, values)):
+        if not missing >> i & 1:
+            object.__setattr__(instance, name, value)
+    object.__setattr__(instance, "_extra", extra)
+    return instance
+
+
+# ============================================================================
+# Record Types
+# ============================================================================
+
+class User(Record):
+    """A member profile (user_profiles.json)."""
+
+    FIELDS = (
+        "user_id", "name", "age", "plan_id", "member_since",
+        "deductible_annual", "deductible_met", "out_of_pocket_max", "out_of_pocket_spent",
+        "dependents", "notes",
+    )
+    __slots__ = FIELDS
+    INTERNED = frozenset({"plan_id", "member_since"})
+
+
+class Plan(Record):
+    """An insurance plan (insurance_plans.json). Shared by every member on the plan."""
+
+    FIELDS = ("plan_id", "plan_name", "plan_type", "monthly_premium", "description", "coverage", "network_info")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"plan_id", "plan_type"})
+
+
+class Claim(Record):
+    """A claim (claims_data.json)."""
+
+    FIELDS = (
+        "claim_id", "user_id", "service_date", "service_type", "provider_name", "provider_network",
+        "claim_status", "billed_amount", "insurance_paid", "patient_responsibility",
+        "applied_to_deductible", "notes",
+    )
+    __slots__ = FIELDS
+    INTERNED = frozenset({
+        "user_id", "service_date", "service_type", "provider_name", "provider_network", "claim_status",
+    })
+
+
+# Record class per dataset name
+RECORD_TYPES: Dict[str, type] = {"users": User, "plans": Plan, "claims": Claim}
+
+
+def make_record(kind: str, record: Mapping) -> Record:
+    """
+    Convert a parsed record of a dataset to its record type.
+
+    Args:
+        kind: Dataset name ("users", "plans", "claims")
+        record: Validated source record
+
+    Returns:
+        Record: User, Plan or Claim
+    """
+    return RECORD_TYPES[kind].from_dict(record)
+
+
+class UserWithPlan(Mapping):
+    """
+    Read-only view of a user with their plan under "plan_details".
+
+    Replaces copying the user dict on every get_user_with_plan() call: the
+    view holds references to the shared user and plan records.
+
+    Args:
+        user: User record (or dict)
+        plan: The user's plan, or None if it does not exist
+    """
+
+    __slots__ = ("user", "plan")
+
+    def __init__(self, user: Mapping, plan: Optional[Mapping]):
+        object.__setattr__(self, "user", user)
+        object.__setattr__(self, "plan", plan)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("UserWithPlan is a read-only view")
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "plan_details":
+            return self.plan
+        return self.user[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "plan_details":
+            return self.plan
+        return self.user.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key == "plan_details" or key in self.user
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.user:
+            if key != "plan_details":
+                yield key
+        yield "plan_details"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+# ============================================================================
+# JSON Conversion
+# ============================================================================
+
+def to_builtin(value: Any) -> Any:
+    """
+    Convert records (and views) anywhere inside a value to plain dicts.
+
+    Dicts, lists and tuples are rebuilt only along paths that contain a
+    record; everything else is returned as-is.
+
+    Args:
+        value: Any JSON-like value, e.g. a tool result
+
+    Returns:
+        The value with every non-dict Mapping replaced by a dict
+    """
+    if isinstance(value, dict):
+        converted = {key: to_builtin(item) for key, item in value.items()}
+        return value if all(converted[key] is value[key] for key in value) else converted
+    if isinstance(value, Mapping):
+        return {key: to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        converted = [to_builtin(item) for item in value]
+        if all(new is old for new, old in zip(converted, value)):
+            return value
+        return converted if isinstance(value, list) else tuple(converted)
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps() hook: records become dicts, other unknown objects their str()."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
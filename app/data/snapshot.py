@@ -0,0 +1,160 @@
+"""
+Binary Snapshot Cache for Loaded Data.
+
+Parsing the JSON sources and building indexes is the slow part of startup on
+large datasets. After a successful load, initialize_data() writes the
+resulting data dict (records and indexes) to a binary snapshot; later starts
+load the snapshot instead of re-parsing, as long as the sources are
+unchanged.
+
+Snapshot file (data/.cache/snapshot.bin):
+    MAGIC (8 bytes) | header length (4 bytes, big endian) | header JSON | pickle payload
+
+The header holds the format version and a manifest of every source file
+(name, size, mtime_ns, sha256). A snapshot is used only if the manifest
+matches the current sources:
+- size and mtime equal: match (no hashing on the fast path)
+- size equal but mtime changed: the file is re-hashed and compared, so a
+  touched-but-identical file does not force a rebuild
+- anything else: the snapshot is stale and rebuilt after the next load
+
+Pickle keeps shared references, so indexes point at the same record objects
+as the record lists instead of duplicating them. The snapshot is written by
+this server for its own use only; never load snapshots from untrusted sources.
+
+Configuration:
+    DATA_SNAPSHOT   "1" (default) to use and write snapshots, "0" to always parse the sources
+"""
+
+import gc
+import hashlib
+import json
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+DATA_SNAPSHOT = os.getenv("DATA_SNAPSHOT", "1") != "0"
+
+# Bump when the pickled data layout changes (2: records.py record types)
+SNAPSHOT_FORMAT = 2
+MAGIC = b"CARESNAP"
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest(sources: List[Path]) -> List[Dict[str, Any]]:
+    """
+    Describe the source files a snapshot is built from.
+
+    Args:
+        sources: Every data file, in load order
+
+    Returns:
+        list: One entry per file with name, size, mtime_ns and sha256
+    """
+    manifest = []
+    for path in sources:
+        stat = path.stat()
+        manifest.append({
+            "name": path.name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(path),
+        })
+    return manifest
+
+
+def manifest_version(manifest: List[Dict[str, Any]]) -> str:
+    """Short identifier for a set of source contents (changes whenever any file changes)."""
+    digest = hashlib.sha256()
+    for entry in manifest:
+        digest.update(f"{entry['name']}:{entry['sha256']};".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def manifest_matches(manifest: List[Dict[str, Any]], sources: List[Path]) -> bool:
+    """True if the sources still have the contents described by the manifest."""
+    if [entry["name"] for entry in manifest] != [path.name for path in sources]:
+        return False
+    for entry, path in zip(manifest, sources):
+        stat = path.stat()
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns != entry["mtime_ns"] and file_sha256(path) != entry["sha256"]:
+            return False
+    return True
+
+
+def _read_header(f) -> Optional[Dict[str, Any]]:
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    (length,) = struct.unpack(">I", f.read(4))
+    return json.loads(f.read(length))
+
+
+def load_snapshot(path: Path, sources: List[Path]) -> Optional[Dict[str, Any]]:
+    """
+    Load a snapshot if it exists and matches the sources.
+
+    Args:
+        path: Snapshot file
+        sources: Current source files, in load order
+
+    Returns:
+        dict: The data dict stored in the snapshot, or None if it is missing,
+              stale or unreadable
+    """
+    if not path.is_file():
+        return None
+    try:
+        with open(path, "rb") as f:
+            header = _read_header(f)
+            if header is None or header.get("format") != SNAPSHOT_FORMAT:
+                return None
+            if not manifest_matches(header["manifest"], sources):
+                return None
+            # Unpickling millions of small objects is much faster without GC passes
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError, struct.error) as e:
+        print(f"  ⚠️  Ignoring unreadable data snapshot: {e}")
+        return None
+
+
+def save_snapshot(path: Path, data: Dict[str, Any], manifest: List[Dict[str, Any]]) -> int:
+    """
+    Write a snapshot atomically (temp file + rename).
+
+    Args:
+        path: Snapshot file
+        data: Loaded data dict (records and indexes)
+        manifest: Manifest of the sources the data was loaded from
+
+    Returns:
+        int: Snapshot size in bytes
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = json.dumps({"format": SNAPSHOT_FORMAT, "manifest": manifest}).encode("utf-8")
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack(">I", len(header)))
+        f.write(header)
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path.stat().st_size
@@ -0,0 +1,341 @@
+"""
+SQLite Data Backend for datasets larger than RAM.
+
+The default backend keeps every user, plan and claim in process memory. This
+backend answers the same queries from a local SQLite database instead, so
+only the rows a query touches are ever loaded:
+- users(user_id) primary key, plus indexes on lowercase full and first name
+- plans(plan_id) primary key
+- claims indexed by (user_id, service_date)
+
+Each row also stores the original record as JSON, so queries return the
+same User / Plan / Claim records (records.py) as the in-memory backend. Reads go through a small pool of
+read-only connections (one per concurrent tool thread). Each connection
+caches its compiled statements, and the SQL text is constant, so every
+query runs as a prepared statement.
+
+The loader query functions (get_user_by_id, get_plan_by_id,
+get_claims_for_user, get_user_with_plan, find_user_by_name) dispatch to this
+backend when get_data() returns it, so the tools work unchanged.
+
+Enable with:
+    DATA_BACKEND=sqlite
+    DATA_DB_PATH=data/care.db   (optional)
+
+Build (or rebuild) the database from the JSON files:
+    python -m app.data.sqlite_backend import [--db data/care.db]
+
+initialize_data() also imports automatically when the database is missing
+or older than the source files.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.data.records import Claim, Plan, User, json_default
+from app.data.snapshot import build_manifest, manifest_matches, manifest_version
+from app.data.streaming import find_sources, iter_records, validate_record
+
+
+DATA_DB_PATH = os.getenv("DATA_DB_PATH", str(Path(__file__).parent.parent.parent / "data" / "care.db"))
+DATA_DB_POOL_SIZE = int(os.getenv("DATA_DB_POOL_SIZE", "4"))
+
+# Rows per executemany() batch during import
+IMPORT_BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE plans (
+    plan_id TEXT PRIMARY KEY,
+    record  TEXT NOT NULL
+);
+CREATE TABLE users (
+    user_id    TEXT PRIMARY KEY,
+    name_lower TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    plan_id    TEXT,
+    record     TEXT NOT NULL
+);
+CREATE TABLE claims (
+    claim_id     TEXT NOT NULL,
+    user_id      TEXT NOT NULL,
+    service_date TEXT,
+    record       TEXT NOT NULL
+);
+"""
+
+# Indexes are created after the bulk insert (much faster than maintaining them row by row)
+INDEXES = """
+CREATE INDEX idx_users_name ON users (name_lower);
+CREATE INDEX idx_users_first_name ON users (first_name);
+CREATE INDEX idx_claims_user ON claims (user_id, service_date);
+"""
+
+# Query text is fixed so each pooled connection compiles it once
+SQL_USER_BY_ID = "SELECT record FROM users WHERE user_id = ?"
+SQL_USER_BY_NAME = (
+    "SELECT record FROM users WHERE name_lower = ?1 OR first_name = ?1 ORDER BY rowid LIMIT 1"
+)
+SQL_ALL_PLANS = "SELECT record FROM plans ORDER BY rowid"
+SQL_CLAIMS_FOR_USER = "SELECT record FROM claims WHERE user_id = ? ORDER BY rowid"
+
+
+# ============================================================================
+# Import
+# ============================================================================
+
+def _to_json(record: Dict[str, Any]) -> str:
+    return json.dumps(record, default=json_default)
+
+
+def _user_row(record: Dict[str, Any]) -> tuple:
+    name = record["name"].strip().lower()
+    return (record["user_id"], name, name.split()[0] if name else "", record.get("plan_id"), _to_json(record))
+
+
+def build_database(
+    db_path: Path,
+    datasets: Dict[str, Iterable[Dict[str, Any]]],
+    meta: Dict[str, str]
+) -> Dict[str, int]:
+    """
+    Build a fresh database from record iterables.
+
+    Records are inserted in batches as they are produced, so the datasets can
+    be streams that never fit in memory. The database is written to a temp
+    file and renamed into place when complete.
+
+    Args:
+        db_path: Target database file
+        datasets: Maps "plans", "users", "claims" to iterables of records
+        meta: Values for the meta table ("version" is required)
+
+    Returns:
+        dict: Rows inserted per dataset (invalid records are skipped)
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(str(tmp_path))
+    counts: Dict[str, int] = {}
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(SCHEMA)
+
+        statements = {
+            "plans": ("INSERT OR IGNORE INTO plans VALUES (?, ?)",
+                      lambda r: (r["plan_id"], _to_json(r))),
+            "users": ("INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?, ?)", _user_row),
+            "claims": ("INSERT INTO claims VALUES (?, ?, ?, ?)",
+                       lambda r: (r["claim_id"], r["user_id"], r.get("service_date"), _to_json(r))),
+        }
+
+        for kind in ("plans", "users", "claims"):
+            sql, to_row = statements[kind]
+            batch: List[tuple] = []
+            counts[kind] = 0
+            for record in datasets.get(kind, ()):
+                if validate_record(kind, record) is not None:
+                    continue
+                batch.append(to_row(record))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    conn.executemany(sql, batch)
+                    counts[kind] += len(batch)
+                    batch.clear()
+            if batch:
+                conn.executemany(sql, batch)
+                counts[kind] += len(batch)
+
+        conn.executescript(INDEXES)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+def import_from_sources(data_dir: Path, db_path: Path, datasets) -> Dict[str, int]:
+    """
+    Build the database by streaming the JSON / JSON Lines source files.
+
+    Args:
+        data_dir: Directory with the source files
+        db_path: Target database file
+        datasets: (kind, stem) pairs, as in loader.DATASETS
+
+    Returns:
+        dict: Rows inserted per dataset
+    """
+    sources = {kind: find_sources(data_dir, stem) for kind, stem in datasets}
+    manifest = build_manifest([path for kind, _ in datasets for path in sources[kind]])
+
+    def stream(kind: str):
+        for path in sources[kind]:
+            yield from iter_records(path, kind)
+
+    # The manifest records what the database was built from, to detect stale databases
+    return build_database(
+        db_path,
+        {kind: stream(kind) for kind, _ in datasets},
+        {"version": manifest_version(manifest), "manifest": json.dumps(manifest)}
+    )
+
+
+def database_is_current(db_path: Path, sources: List[Path]) -> bool:
+    """True if the database exists and was built from the current sources."""
+    if not db_path.is_file():
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'manifest'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return row is not None and manifest_matches(json.loads(row[0]), sources)
+
+
+# ============================================================================
+# Backend
+# ============================================================================
+
+class SQLiteDataBackend:
+    """
+    Read-only query backend over a database built by build_database().
+
+    Implements the loader query API as methods. get_data() returns an
+    instance of this class when DATA_BACKEND=sqlite; the loader functions
+    dispatch to it.
+
+    Args:
+        db_path: Database file
+        pool_size: Maximum number of open read-only connections
+    """
+
+    def __init__(self, db_path: Path, pool_size: int = DATA_DB_POOL_SIZE):
+        self.db_path = Path(db_path)
+        if not self.db_path.is_file():
+            raise FileNotFoundError(f"Data database not found: {self.db_path}")
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._open_lock = threading.Lock()
+        self._pool_size = max(1, pool_size)
+
+        with self._connection() as conn:
+            self.version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            # Plans are few and used by the service index: keep them in memory
+            self.plans = [Plan.from_dict(json.loads(row[0])) for row in conn.execute(SQL_ALL_PLANS)]
+            self.counts = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("users", "plans", "claims")
+            }
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=64
+        )
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a connection from the pool (opening one if below the limit)."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._open_lock:
+                can_open = self._opened < self._pool_size
+                if can_open:
+                    self._opened += 1
+            conn = self._open() if can_open else self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _user(self, sql: str, params: tuple) -> Optional[User]:
+        with self._connection() as conn:
+            row = conn.execute(sql, params).fetchone()
+        return User.from_dict(json.loads(row[0])) if row else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Dict-style access for code that reads small, whole datasets.
+
+        Only "plans" and "version" are available; users and claims are
+        reachable through the query methods only.
+        """
+        if key == "plans":
+            return self.plans
+        if key == "version":
+            return self.version
+        return default
+
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """See loader.get_user_by_id."""
+        return self._user(SQL_USER_BY_ID, (user_id,))
+
+    def find_user_by_name(self, name: str) -> Optional[User]:
+        """See loader.find_user_by_name."""
+        return self._user(SQL_USER_BY_NAME, (name.strip().lower(),))
+
+    def get_plan_by_id(self, plan_id: str) -> Optional[Plan]:
+        """See loader.get_plan_by_id."""
+        for plan in self.plans:
+            if plan.get("plan_id") == plan_id:
+                return plan
+        return None
+
+    def get_claims_for_user(self, user_id: str) -> List[Claim]:
+        """See loader.get_claims_for_user."""
+        with self._connection() as conn:
+            rows = conn.execute(SQL_CLAIMS_FOR_USER, (user_id,)).fetchall()
+        return [Claim.from_dict(json.loads(row[0])) for row in rows]
+
+
+# ============================================================================
+# Command Line
+# ============================================================================
+
+def main():
+    """Import command: python -m app.data.sqlite_backend import [--db PATH]"""
+    from app.data.loader import DATA_DIR, DATASETS
+
+    parser = argparse.ArgumentParser(description="Build the SQLite data backend from the JSON data files")
+    parser.add_argument("command", choices=["import"])
+    parser.add_argument("--db", default=DATA_DB_PATH, help="database file (default: %(default)s)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    print(f"📥 Importing {DATA_DIR} → {args.db}")
+    counts = import_from_sources(DATA_DIR, Path(args.db), DATASETS)
+    for kind, count in counts.items():
+        print(f"  ✓ {count:,} {kind}")
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Streaming JSON Readers for the Data Loader.
+
+json.load() on a large file holds the whole text, the parsed tree and the
+final records in memory at once. These readers yield one record at a time
+instead, so the loader can validate and index records as they arrive and
+peak memory stays close to the final in-memory footprint.
+
+Supported inputs for a dataset (e.g. stem "claims_data", key "claims"):
+- claims_data.json                  {"claims": [ {...}, {...} ]} or a bare [ ... ]
+- claims_data.jsonl / .ndjson       one JSON record per line
+- claims_data.<part>.jsonl          chunked exports, read in name order
+                                    (e.g. claims_data.000.jsonl, claims_data.001.jsonl)
+
+All matching files are read, in the order listed above.
+
+Usage:
+    for record in iter_records(path, "claims", on_progress=print_progress):
+        ...
+"""
+
+import json
+import re
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# Characters read from a JSON file per chunk
+CHUNK_SIZE = 1 << 20
+
+# Seconds between progress callbacks
+PROGRESS_INTERVAL = 1.0
+
+# Fields every record of a dataset must have
+REQUIRED_FIELDS: Dict[str, tuple] = {
+    "users": ("user_id", "name", "plan_id"),
+    "plans": ("plan_id", "plan_name", "coverage"),
+    "claims": ("claim_id", "user_id", "claim_status"),
+}
+
+# Separators between array elements
+_SEPARATORS = re.compile(r"[\s,]*")
+
+ProgressCallback = Callable[[Path, int, int, int], None]
+
+
+def find_sources(data_dir: Path, stem: str) -> List[Path]:
+    """
+    Find every input file for a dataset.
+
+    Args:
+        data_dir: Directory holding the data files
+        stem: Dataset file stem (e.g. "claims_data")
+
+    Returns:
+        list: Existing files, in read order
+    """
+    sources = [data_dir / f"{stem}.json", data_dir / f"{stem}.jsonl", data_dir / f"{stem}.ndjson"]
+    sources = [path for path in sources if path.is_file()]
+    chunks = sorted(data_dir.glob(f"{stem}.*.jsonl")) + sorted(data_dir.glob(f"{stem}.*.ndjson"))
+    return sources + [path for path in chunks if path not in sources]
+
+
+def validate_record(kind: str, record: Any) -> Optional[str]:
+    """
+    Check a record has the fields its dataset requires.
+
+    Args:
+        kind: Dataset name ("users", "plans", "claims")
+        record: Parsed record
+
+    Returns:
+        str: Problem description, or None if the record is valid
+    """
+    if not isinstance(record, Mapping):
+        return f"expected an object, got {type(record).__name__}"
+    missing = [name for name in REQUIRED_FIELDS.get(kind, ()) if record.get(name) in (None, "")]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    return None
+
+
+class _Progress:
+    """Rate-limited progress reporting for one file."""
+
+    def __init__(self, path: Path, callback: Optional[ProgressCallback]):
+        self.path = path
+        self.callback = callback
+        self.total = path.stat().st_size
+        self.records = 0
+        self._last = time.monotonic()
+
+    def tick(self, done: int) -> None:
+        self.records += 1
+        if self.callback is not None and time.monotonic() - self._last >= PROGRESS_INTERVAL:
+            self._last = time.monotonic()
+            self.callback(self.path, min(done, self.total), self.total, self.records)
+
+
+def iter_jsonl(path: Path, on_progress: Optional[ProgressCallback] = None) -> Iterator[Any]:
+    """
+    Yield one record per non-empty line of a JSON Lines file.
+
+    Raises:
+        ValueError: If a line is not valid JSON (message includes the line number)
+    """
+    progress = _Progress(path, on_progress)
+    done = 0
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            done += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path.name}:{line_number}: {e}") from None
+            progress.tick(done)
+            yield record
+
+
+def iter_json_array(path: Path, key: Optional[str], on_progress: Optional[ProgressCallback] = None) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array one at a time without loading the file.
+
+    The array is either the whole document or the value of a top-level key
+    ({"claims": [...]}). Only one chunk of text (plus one partial element) is
+    held in memory at a time.
+
+    Args:
+        path: JSON file
+        key: Top-level key holding the array, or None for a bare array
+        on_progress: Optional callback(path, chars_read, file_size, records)
+
+    Raises:
+        ValueError: If the array is not found or the file ends early
+    """
+    decoder = json.JSONDecoder()
+    keyed = re.compile(r'"%s"\s*:\s*\[' % re.escape(key)) if key else None
+    progress = _Progress(path, on_progress)
+    read = 0
+
+    with open(path, "r", encoding="utf-8") as f:
+        # Find the opening bracket of the array
+        buffer = ""
+        while True:
+            stripped = buffer.lstrip()
+            if stripped.startswith("["):
+                # Bare array document
+                pos = len(buffer) - len(stripped) + 1
+                break
+            match = keyed.search(buffer) if keyed and stripped else None
+            if match:
+                pos = match.end()
+                break
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(f"{path.name}: no array found" + (f" under '{key}'" if key else ""))
+            read += len(chunk)
+            buffer += chunk
+
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if pos >= len(buffer):
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    raise ValueError(f"{path.name}: unexpected end of file inside array")
+                read += len(chunk)
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element continues in the next chunk
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    raise ValueError(f"{path.name}: invalid or truncated JSON near character {read - len(buffer) + pos}")
+                read += len(chunk)
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            pos = end
+            progress.tick(read - (len(buffer) - pos))
+            yield record
+
+
+def iter_records(path: Path, key: str, on_progress: Optional[ProgressCallback] = None) -> Iterator[Any]:
+    """
+    Yield the records of one input file, choosing the reader by extension.
+
+    Args:
+        path: .json, .jsonl or .ndjson file
+        key: Top-level key of the records array in .json files
+        on_progress: Optional progress callback
+    """
+    if path.suffix in (".jsonl", ".ndjson"):
+        return iter_jsonl(path, on_progress)
+    return iter_json_array(path, key, on_progress)
+
+
+def print_progress(path: Path, done: int, total: int, records: int) -> None:
+    """Default progress callback: one line per update."""
+    percent = done / total * 100 if total else 100.0
+    print(f"  … {path.name}: {percent:5.1f}% ({records:,} records)")
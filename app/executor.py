@@ -0,0 +1,243 @@
+"""
+Bounded Executor for Blocking Work.
+
+Graph nodes run on the event loop, so a blocking call made there (a tool
+that queries a database synchronously, a SQLite data backend lookup) stalls
+every session on the server. Such calls are handed to this executor instead:
+
+- A dedicated thread pool of BLOCKING_WORKERS threads, separate from the
+  default asyncio executor, so blocking backends can't starve other users
+  of asyncio.to_thread().
+- At most BLOCKING_MAX_QUEUE calls wait for a thread; beyond that, calls fail
+  fast with ExecutorBusyError instead of queueing without bound.
+- Per-name statistics: calls, errors, rejections, run time and queue wait
+  (time from submission until a thread picks the call up), in flight and
+  waiting.
+
+Async-native tools (coroutines, see app/tools) bypass the pool but are timed
+under the same statistics through record_call(), so /api/metrics shows every
+tool side by side.
+
+Configuration:
+    BLOCKING_WORKERS     threads for blocking calls (default 8)
+    BLOCKING_MAX_QUEUE   calls allowed to wait for a thread (default 64)
+
+Usage:
+    result = await run_blocking("data.sqlite", backend.get_user_by_id, user_id)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+
+BLOCKING_WORKERS = int(os.getenv("BLOCKING_WORKERS", "8"))
+BLOCKING_MAX_QUEUE = int(os.getenv("BLOCKING_MAX_QUEUE", "64"))
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when a blocking call is rejected because the executor queue is full."""
+
+    def __init__(self, name: str, waiting: int):
+        super().__init__(f"Executor busy: {waiting} calls already waiting (rejected {name})")
+        self.name = name
+        self.waiting = waiting
+
+
+class CallStats:
+    """Counters for one name (tool or backend)."""
+
+    __slots__ = ("calls", "errors", "rejected", "in_flight", "waiting",
+                 "total_ms", "max_ms", "total_wait_ms", "max_wait_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters as a plain dict."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0,
+            "max_ms": round(self.max_ms, 2),
+            "avg_wait_ms": round(self.total_wait_ms / self.calls, 2) if self.calls else 0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
+
+
+# ============================================================================
+# Executor
+# ============================================================================
+
+class BlockingExecutor:
+    """
+    Thread pool with a bounded wait queue and per-name call statistics.
+
+    Attributes:
+        max_workers: Threads in the pool
+        max_queue: Calls allowed to wait for a free thread
+    """
+
+    def __init__(self, max_workers: int = BLOCKING_WORKERS, max_queue: int = BLOCKING_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0  # submitted and not finished (running + waiting)
+        self._stats: Dict[str, CallStats] = {}
+
+    def _stats_for(self, name: str) -> CallStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats.setdefault(name, CallStats())
+        return stats
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="blocking")
+        return self._pool
+
+    async def run(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking function in the pool and await its result.
+
+        Args:
+            name: Statistics key (e.g. the tool name)
+            fn: Blocking callable
+            *args: Positional arguments for fn
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            ExecutorBusyError: If max_queue calls are already waiting for a thread
+        """
+        stats = self._stats_for(name)
+        with self._lock:
+            waiting = max(0, self._pending - self.max_workers)
+            if waiting >= self.max_queue:
+                stats.rejected += 1
+                raise ExecutorBusyError(name, waiting)
+            self._pending += 1
+            stats.waiting += 1
+
+        submitted = time.perf_counter()
+
+        def call() -> Any:
+            started = time.perf_counter()
+            wait_ms = (started - submitted) * 1000
+            with self._lock:
+                stats.waiting -= 1
+                stats.in_flight += 1
+                stats.total_wait_ms += wait_ms
+                stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+            failed = True
+            try:
+                result = fn(*args)
+                failed = False
+                return result
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    stats.in_flight -= 1
+                    stats.calls += 1
+                    stats.errors += failed
+                    stats.total_ms += elapsed
+                    stats.max_ms = max(stats.max_ms, elapsed)
+                    self._pending -= 1
+
+        future = self._get_pool().submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.cancel():
+                # Cancelled before a thread picked it up: undo the queue accounting
+                with self._lock:
+                    stats.waiting -= 1
+                    self._pending -= 1
+            raise
+
+    @contextmanager
+    def record_call(self, name: str):
+        """
+        Time a call that runs on the event loop (an async-native tool) under name.
+
+        Example:
+            with executor.record_call("coverage_lookup"):
+                result = await coverage_lookup.ainvoke(args)
+        """
+        stats = self._stats_for(name)
+        stats.in_flight += 1
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                stats.in_flight -= 1
+                stats.calls += 1
+                stats.errors += failed
+                stats.total_ms += elapsed
+                stats.max_ms = max(stats.max_ms, elapsed)
+
+    def shutdown(self) -> None:
+        """Stop the pool, letting running calls finish. A later run() starts a new one."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            dict: Pool size and queue limit, calls currently running and waiting,
+                  and per name: calls, errors, rejected, in_flight, waiting,
+                  avg/max run time and avg/max queue wait
+        """
+        with self._lock:
+            pending = self._pending
+            calls = {name: stats.snapshot() for name, stats in sorted(self._stats.items())}
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": min(pending, self.max_workers),
+            "waiting": max(0, pending - self.max_workers),
+            "calls": calls,
+        }
+
+
+# Process-wide executor for every blocking tool and backend call
+executor = BlockingExecutor()
+
+
+async def run_blocking(name: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking call in the shared executor (see BlockingExecutor.run)."""
+    return await executor.run(name, fn, *args)
+
+
+def shutdown_executor() -> None:
+    """Stop the shared executor's threads (at application shutdown)."""
+    executor.shutdown()
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Get blocking executor and per-tool call statistics (see BlockingExecutor.stats)."""
+    return executor.stats()
@@ -0,0 +1,272 @@
+"""
+In-Memory Frontend Serving for CARE Assistant.
+
+The Next.js static export (frontend/out) is scanned once into a route table
+held in memory, so serving a page or asset never touches the disk:
+- Every file is read once; text assets (HTML, JS, CSS, JSON, SVG, ...) are
+  precompressed with gzip (and brotli if installed) at load time.
+- Each asset has a strong ETag (content hash); requests with a matching
+  If-None-Match get 304 Not Modified.
+- Hashed build assets under /_next/static are served with
+  "Cache-Control: public, max-age=31536000, immutable"; HTML and other files
+  are revalidated on every use ("no-cache"), which is cheap thanks to the ETag.
+- Routes follow the export layout: "/" → index.html, "/about" → about.html.
+  Unknown non-asset paths fall back to index.html for client-side routing.
+
+Loading and compression run in a worker thread, and a watcher reloads the
+table when the build directory changes, so a rebuilt frontend is picked up
+without restarting the server.
+
+Configuration:
+    FRONTEND_WATCH_SECONDS   how often to check frontend/out for changes (default 5, 0 disables)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import Response
+
+from app.api.compression import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+FRONTEND_BUILD_DIR = Path(__file__).parent.parent / "frontend" / "out"
+FRONTEND_WATCH_SECONDS = float(os.getenv("FRONTEND_WATCH_SECONDS", "5"))
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = (
+    "text/", "application/javascript", "application/json", "application/xml",
+    "image/svg+xml", "application/manifest+json",
+)
+
+# Smallest file worth compressing
+MIN_COMPRESS_BYTES = 256
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    """
+    One file of the frontend build, held in memory.
+
+    Attributes:
+        body: Uncompressed content
+        content_type: MIME type
+        etag: Strong ETag (quoted content hash)
+        cache_control: Cache-Control header value
+        encoded: Precompressed variants by encoding ("br", "gzip"),
+                 only kept when smaller than the original
+    """
+    body: bytes
+    content_type: str
+    etag: str
+    cache_control: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+
+def _content_type(path: Path) -> str:
+    if path.suffix == ".js":
+        return "application/javascript"
+    guessed, _ = mimetypes.guess_type(path.name)
+    return guessed or "application/octet-stream"
+
+
+def load_asset(path: Path, cache_control: str) -> StaticAsset:
+    """
+    Read one file and precompute its ETag and compressed variants.
+
+    Args:
+        path: File to load
+        cache_control: Cache-Control value to serve it with
+
+    Returns:
+        StaticAsset: The file in memory
+    """
+    body = path.read_bytes()
+    content_type = _content_type(path)
+    encoded: Dict[str, bytes] = {}
+
+    if len(body) >= MIN_COMPRESS_BYTES and content_type.startswith(COMPRESSIBLE_TYPES):
+        candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            candidates["br"] = brotli.compress(body, quality=11)
+        encoded = {name: data for name, data in candidates.items() if len(data) < len(body)}
+
+    return StaticAsset(
+        body=body,
+        content_type=content_type,
+        etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+        cache_control=cache_control,
+        encoded=encoded,
+    )
+
+
+def build_route_table(build_dir: Path) -> Dict[str, StaticAsset]:
+    """
+    Load a static export into a route table.
+
+    Args:
+        build_dir: Next.js export directory (frontend/out)
+
+    Returns:
+        dict: Maps URL path (without leading slash) to StaticAsset.
+              HTML pages are also reachable without ".html", and
+              "dir/index.html" as "dir" ("" is the home page).
+    """
+    routes: Dict[str, StaticAsset] = {}
+    for path in sorted(build_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        url = path.relative_to(build_dir).as_posix()
+        immutable = url.startswith("_next/static/")
+        asset = load_asset(path, IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE)
+        routes[url] = asset
+
+        if url.endswith(".html"):
+            page = url[:-len(".html")]
+            if page == "index" or page.endswith("/index"):
+                page = page[:-len("index")].rstrip("/")
+            routes.setdefault(page, asset)
+    return routes
+
+
+def _directory_signature(build_dir: Path) -> Optional[Tuple[int, float]]:
+    """Cheap change detector: (file count, newest mtime), or None if the build is missing."""
+    if not build_dir.is_dir():
+        return None
+    count, newest = 0, 0.0
+    for path in build_dir.rglob("*"):
+        if path.is_file():
+            count += 1
+            newest = max(newest, path.stat().st_mtime)
+    return count, newest
+
+
+# ============================================================================
+# Frontend Bundle
+# ============================================================================
+
+class FrontendBundle:
+    """
+    The frontend route table plus the logic to serve and reload it.
+
+    Args:
+        build_dir: Next.js export directory
+    """
+
+    def __init__(self, build_dir: Path = FRONTEND_BUILD_DIR):
+        self.build_dir = build_dir
+        self.routes: Dict[str, StaticAsset] = {}
+        self._signature: Optional[Tuple[int, float]] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True if a build with an index.html is loaded."""
+        return "index.html" in self.routes
+
+    def load(self) -> int:
+        """
+        (Re)load the build directory. Blocking; call from a worker thread.
+
+        Returns:
+            int: Number of files loaded
+        """
+        signature = _directory_signature(self.build_dir)
+        routes = build_route_table(self.build_dir) if signature else {}
+        # Swap in the new table in one assignment; requests never see a partial table
+        self.routes = routes
+        self._signature = signature
+        return len({id(asset) for asset in routes.values()})
+
+    def changed(self) -> bool:
+        """True if the build directory differs from what is loaded. Blocking."""
+        return _directory_signature(self.build_dir) != self._signature
+
+    async def watch(self, interval: float = FRONTEND_WATCH_SECONDS) -> None:
+        """
+        Reload the route table whenever the build directory changes.
+
+        A rebuild deletes and rewrites files while they are being scanned;
+        errors from that are logged and the reload is retried on the next
+        tick (the previous route table keeps serving until then).
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await asyncio.to_thread(self.changed):
+                    count = await asyncio.to_thread(self.load)
+                    print(f"🔄 Frontend reloaded ({count} files)")
+            except OSError as e:
+                print(f"⚠️  Frontend reload failed, retrying in {interval:g}s: {e}")
+
+    def lookup(self, path: str) -> Optional[StaticAsset]:
+        """
+        Find the asset for a request path.
+
+        Args:
+            path: URL path without leading slash
+
+        Returns:
+            StaticAsset: Matching file, index.html for unknown page routes,
+                         or None for unknown build assets
+        """
+        path = path.strip("/")
+        asset = self.routes.get(path)
+        if asset is not None:
+            return asset
+        if path.startswith("_next/"):
+            return None
+        return self.routes.get("index.html")
+
+    def respond(self, path: str, if_none_match: Optional[str], accept_encoding: Optional[str]) -> Optional[Response]:
+        """
+        Build the HTTP response for a request path.
+
+        Args:
+            path: URL path without leading slash
+            if_none_match: If-None-Match request header
+            accept_encoding: Accept-Encoding request header
+
+        Returns:
+            Response: 200 with the (possibly compressed) body, 304 if the
+                      client's copy is current, 404 for unknown build assets,
+                      or None if no frontend build is loaded
+        """
+        if not self.loaded:
+            return None
+
+        asset = self.lookup(path)
+        if asset is None:
+            return Response(status_code=404)
+
+        headers = {
+            "ETag": asset.etag,
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if if_none_match and asset.etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in asset.encoded and (encoding in accepted or "*" in accepted):
+                headers["Content-Encoding"] = encoding
+                return Response(content=asset.encoded[encoding], media_type=asset.content_type, headers=headers)
+
+        return Response(content=asset.body, media_type=asset.content_type, headers=headers)
+
+
+# Shared bundle used by app.main
+frontend = FrontendBundle()
@@ -0,0 +1,296 @@
+"""
+Background Member Briefing for CARE Assistant.
+
+After identify_user finds a member, the graph stops on the welcome message
+(first_greeting) and the server idles until the first question arrives. The
+briefing uses that gap:
+
+1. All three tools run for the member (coverage, every benefit, all claims).
+   Their results land in the tool result cache (app/tools/cache.py). The
+   first question's coverage_lookup and unfiltered claims_status calls are
+   cache hits; its benefit_verify call is one only when the question names no
+   specific service (a named service is a different cache key).
+2. A compact member briefing (plan, deductible and out-of-pocket status,
+   claim counts, pending claims) is built from those results, without an LLM.
+3. The response prompt prefix (instructions, member profile with the
+   briefing, conversation so far) is sent to the response model with a
+   one-token output cap, so Ollama holds it in its KV cache and the first
+   answer only evaluates the new question.
+
+The briefing runs as a background task in the "background" priority class of
+the LLM scheduler, attributed to the member's session. It is cancelled if the
+member identifies again in the same session, and the prefix warm-up is
+dropped if the first question arrives while it is still queued for the LLM
+(the question's own calls would be behind it otherwise).
+
+generate_response takes the briefing once and stores it in the conversation
+state (member_briefing), so the prompt prefix stays identical for the rest of
+the session, including after the session moves to another worker. Briefings
+of sessions that expire, are evicted or are deleted before their first
+question are dropped by the session cleanup (prune_member_briefings).
+
+Configuration:
+    MEMBER_BRIEFING        1 (default) to run briefings, 0 to disable
+    MEMBER_BRIEFING_WARM   1 (default) to warm the prompt prefix, 0 for tools only
+
+Usage:
+    start_member_briefing(session_id, user_id, state)   # in identify_user
+    briefing = take_member_briefing(session_id)          # in generate_response
+"""
+
+import asyncio
+import contextvars
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.llm.scheduler import priority_scope, scheduled, session_scope
+from app.tools import benefit_verify, claims_status, coverage_lookup
+from app.tools.cache import ainvoke_cached
+
+
+MEMBER_BRIEFING = os.getenv("MEMBER_BRIEFING", "1") != "0"
+MEMBER_BRIEFING_WARM = os.getenv("MEMBER_BRIEFING_WARM", "1") != "0"
+
+# Briefings kept for sessions whose first question hasn't arrived yet
+MAX_PENDING_BRIEFINGS = 1024
+
+# Pending claims listed in the briefing
+BRIEFING_PENDING_CLAIMS = 3
+
+
+# ============================================================================
+# Briefing Text
+# ============================================================================
+
+def build_briefing(tool_results: Dict[str, Any]) -> str:
+    """
+    Build the compact member briefing from tool results.
+
+    Args:
+        tool_results: Results of coverage_lookup, benefit_verify and claims_status
+
+    Returns:
+        str: Briefing text for the response prompt, "" if no tool succeeded
+    """
+    lines: List[str] = []
+
+    coverage = tool_results.get("coverage_lookup") or {}
+    if coverage.get("status") == "success":
+        info = coverage["data"]
+        lines.append(f"- Plan: {info.get('plan_name')} ({info.get('plan_type')})")
+        lines.append(
+            f"- Deductible remaining: ${info.get('deductible_remaining', 0):,} "
+            f"of ${info.get('deductible_annual') or 0:,}"
+        )
+        lines.append(
+            f"- Out-of-pocket remaining: ${info.get('out_of_pocket_remaining', 0):,} "
+            f"of ${info.get('out_of_pocket_max') or 0:,}"
+        )
+
+    benefits = tool_results.get("benefit_verify") or {}
+    if benefits.get("status") == "success" and benefits.get("not_covered"):
+        lines.append(f"- Not covered: {', '.join(benefits['not_covered'])}")
+
+    claims = tool_results.get("claims_status") or {}
+    if claims.get("status") == "success":
+        breakdown = claims.get("summary", {}).get("status_breakdown", {})
+        counts = ", ".join(f"{status} {count}" for status, count in sorted(breakdown.items()))
+        lines.append(f"- Claims: {claims.get('claims_count', 0)}" + (f" ({counts})" if counts else ""))
+        pending = [claim for claim in claims.get("claims", []) if claim.get("claim_status") == "Pending"]
+        for claim in pending[:BRIEFING_PENDING_CLAIMS]:
+            lines.append(
+                f"- Pending claim {claim.get('claim_id')}: {claim.get('service_type')} on "
+                f"{claim.get('service_date')}, ${claim.get('billed_amount', 0):,.2f} billed"
+            )
+
+    return "Member Briefing:\n" + "\n".join(lines) if lines else ""
+
+
+# ============================================================================
+# Background Task
+# ============================================================================
+
+class _Briefing:
+    __slots__ = ("task", "phase", "text")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.phase = "tools"   # tools → queued → warming → done
+        self.text = ""
+
+
+# Session id → briefing, oldest first
+_BRIEFINGS: "OrderedDict[str, _Briefing]" = OrderedDict()
+
+_STATS = {
+    "started": 0, "built": 0, "completed": 0, "cancelled": 0, "failed": 0, "used": 0,
+    "warmed": 0, "warm_skipped": 0, "tool_ms": 0.0, "warm_ms": 0.0
+}
+
+
+async def _run_briefing(session_id: str, user_id: str, state: Dict[str, Any], briefing: _Briefing) -> None:
+    calls = {
+        "coverage_lookup": (coverage_lookup, {"user_id": user_id, "query": ""}),
+        "benefit_verify": (benefit_verify, {"user_id": user_id, "service_types": []}),
+        "claims_status": (claims_status, {"user_id": user_id}),
+    }
+    started = time.perf_counter()
+    with session_scope(session_id):
+        outcomes = await asyncio.gather(*(
+            ainvoke_cached(tool_fn, tool_args) for tool_fn, tool_args in calls.values()
+        ))
+    _STATS["tool_ms"] += (time.perf_counter() - started) * 1000
+    _STATS["built"] += 1
+    briefing.text = build_briefing({name: result for name, (result, _) in zip(calls, outcomes)})
+
+    if MEMBER_BRIEFING_WARM and briefing.text:
+        # Imported here: nodes imports this module
+        from app.graph.nodes import build_response_prompt
+        from app.llm.registry import get_prefill_llm
+
+        _, prompt_messages = build_response_prompt({**state, "member_briefing": briefing.text, "tool_results": None})
+        briefing.phase = "queued"
+        started = time.perf_counter()
+        with session_scope(session_id), priority_scope("background"):
+            await scheduled("response", _warm(get_prefill_llm("response"), prompt_messages, briefing))
+        _STATS["warm_ms"] += (time.perf_counter() - started) * 1000
+        _STATS["warmed"] += 1
+
+    briefing.phase = "done"
+    _STATS["completed"] += 1
+
+
+async def _warm(llm: Any, prompt_messages: List[Any], briefing: _Briefing) -> None:
+    briefing.phase = "warming"
+    await llm.ainvoke(prompt_messages)
+
+
+def _on_done(session_id: str, task: asyncio.Task) -> None:
+    if task.cancelled():
+        _STATS["cancelled"] += 1
+    elif task.exception() is not None:
+        _STATS["failed"] += 1
+        print(f"⚠️  Member briefing failed for session {session_id}: {task.exception()}")
+
+
+def start_member_briefing(session_id: Optional[str], user_id: str, state: Dict[str, Any]) -> bool:
+    """
+    Start the background briefing for a member who was just identified.
+
+    Must be called from the event loop (e.g. in a graph node). Any briefing
+    still running for the session is cancelled first.
+
+    Args:
+        session_id: Session the member was identified in (None: not started)
+        user_id: The identified member
+        state: Conversation state after identification (profile and messages
+               as they will be at the start of the next turn)
+
+    Returns:
+        bool: True if a briefing was started
+    """
+    if not MEMBER_BRIEFING or not session_id:
+        return False
+    cancel_member_briefing(session_id)
+
+    briefing = _Briefing()
+    # A fresh context: the task must not inherit the turn's deadline, run
+    # callbacks or progress stream, which end when the turn does
+    briefing.task = asyncio.create_task(
+        _run_briefing(session_id, user_id, state, briefing),
+        context=contextvars.Context()
+    )
+    briefing.task.add_done_callback(lambda task: _on_done(session_id, task))
+    _BRIEFINGS[session_id] = briefing
+    while len(_BRIEFINGS) > MAX_PENDING_BRIEFINGS:
+        _, oldest = _BRIEFINGS.popitem(last=False)
+        oldest.task.cancel()
+    _STATS["started"] += 1
+    return True
+
+
+def cancel_member_briefing(session_id: str) -> bool:
+    """
+    Cancel and forget a session's briefing.
+
+    Returns:
+        bool: True if a running briefing was cancelled
+    """
+    briefing = _BRIEFINGS.pop(session_id, None)
+    return briefing is not None and briefing.task.cancel()
+
+
+def prune_member_briefings(ended_sessions: Iterable[str]) -> int:
+    """
+    Drop the briefings of sessions that ended before their first question.
+
+    Args:
+        ended_sessions: Ids of sessions that expired, were evicted or were
+                        deleted (e.g. from pending_briefing_sessions())
+
+    Returns:
+        int: Number of briefings dropped
+    """
+    dropped = 0
+    for session_id in ended_sessions:
+        if session_id in _BRIEFINGS:
+            cancel_member_briefing(session_id)
+            dropped += 1
+    return dropped
+
+
+def pending_briefing_sessions() -> List[str]:
+    """Session ids with a briefing waiting for their first question."""
+    return list(_BRIEFINGS)
+
+
+def take_member_briefing(session_id: Optional[str]) -> str:
+    """
+    Take a session's briefing text for its first question.
+
+    A prefix warm-up still waiting for LLM admission is cancelled: the
+    question's own LLM calls would otherwise queue behind it. The briefing is
+    removed from the registry once its text is taken.
+
+    Args:
+        session_id: The session answering its first question
+
+    Returns:
+        str: Briefing text, "" if none is ready
+    """
+    briefing = _BRIEFINGS.get(session_id) if session_id else None
+    if briefing is None:
+        return ""
+    if not briefing.text:
+        # Tools still running (their results still reach the tool cache),
+        # or none of them succeeded
+        if briefing.task.done():
+            del _BRIEFINGS[session_id]
+        return ""
+    if briefing.phase == "queued":
+        briefing.task.cancel()
+        _STATS["warm_skipped"] += 1
+    del _BRIEFINGS[session_id]
+    _STATS["used"] += 1
+    return briefing.text
+
+
+def get_briefing_stats() -> Dict[str, Any]:
+    """
+    Get member briefing statistics.
+
+    Returns:
+        dict: Briefings started, built, completed, cancelled, failed and used
+              by a first question; prefix warm-ups done and skipped; average tool
+              and warm-up time
+    """
+    built = _STATS["built"]
+    return {
+        "enabled": MEMBER_BRIEFING,
+        "pending": len(_BRIEFINGS),
+        **{key: value for key, value in _STATS.items() if not key.endswith("_ms")},
+        "avg_tool_ms": round(_STATS["tool_ms"] / built, 1) if built else 0.0,
+        "avg_warm_ms": round(_STATS["warm_ms"] / _STATS["warmed"], 1) if _STATS["warmed"] else 0.0
+    }
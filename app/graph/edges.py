@@ -26,7 +26,9 @@ def should_continue_after_identify(state: ConversationState) -> Literal["orchest
 
     Returns:
         str: "orchestrate_tools" if user is identified and not first greeting,
-             END if waiting for name or showing first greeting
+             END if waiting for name or showing first greeting.
+             In one_shot graph mode, graph.py maps "orchestrate_tools" to the
+             prefetch_tools node.
     """
     # If this is the first greeting after identification, stop and wait for user question
     if state.get("first_greeting"):
@@ -8,19 +8,34 @@ This module builds and compiles the conversation graph by:
 4. Compiling the graph into an executable agent
 
 The compiled graph can then be invoked with an initial state to run conversations.
+
+Two topologies are available, selected with GRAPH_MODE:
+- "two_call" (default): an LLM call in orchestrate_tools picks the tools, then
+  a second LLM call in generate_response writes the answer.
+- "one_shot": prefetch_tools runs the cheap in-memory tools up front without an
+  LLM, and a single LLM call in generate_response answers from that context.
 """
 
+import os
+from functools import lru_cache
+from typing import Optional
 from langgraph.graph import StateGraph, END
 from .state import ConversationState
 from .nodes import (
     identify_user,
     orchestrate_tools,
+    prefetch_tools,
     generate_response
 )
 from .edges import should_continue_after_identify
 
 
-def create_graph() -> StateGraph:
+# Graph topology: "two_call" or "one_shot"
+GRAPH_MODE = os.getenv("GRAPH_MODE", "two_call").lower()
+GRAPH_MODES = ("two_call", "one_shot")
+
+
+def create_graph(mode: Optional[str] = None) -> StateGraph:
     """
     Create and configure the LangGraph state graph for CARE Assistant.
 
@@ -32,6 +47,8 @@ def create_graph() -> StateGraph:
 
     The graph structure:
         START → identify_user → orchestrate_tools → generate_response → END
+    or, in one_shot mode:
+        START → identify_user → prefetch_tools → generate_response → END
 
     The orchestrate_tools node uses LLM with tool binding to intelligently
     determine which tools to call (coverage_lookup, benefit_verify, claims_status).
@@ -45,14 +62,27 @@ def create_graph() -> StateGraph:
     - Eliminating manual intent classification (LLM handles it automatically)
     - Graph entry and exit points
 
+    Args:
+        mode: Graph topology ("two_call" or "one_shot"). Defaults to GRAPH_MODE.
+
     Returns:
         StateGraph: Configured (but not compiled) graph
 
+    Raises:
+        ValueError: If mode is not a known topology
+
     Example:
         >>> graph = create_graph()
         >>> compiled = graph.compile()
         >>> result = compiled.invoke({"messages": [], "execution_trace": []})
     """
+    mode = (mode or GRAPH_MODE).lower()
+    if mode not in GRAPH_MODES:
+        raise ValueError(f"Unknown graph mode '{mode}'. Expected one of: {', '.join(GRAPH_MODES)}")
+
+    # Tool step: LLM-routed orchestration, or LLM-free prefetch in one-shot mode
+    tool_node = "prefetch_tools" if mode == "one_shot" else "orchestrate_tools"
+
     # Create the state graph with ConversationState schema
     # This tells LangGraph what fields exist in state and how to merge updates
     workflow = StateGraph(ConversationState)
@@ -66,9 +96,13 @@ def create_graph() -> StateGraph:
     # User identification node (first step)
     workflow.add_node("identify_user", identify_user)
 
-    # Tool orchestration node (LLM intelligently calls one or more tools based on question)
-    # This replaces manual intent classification - the LLM handles multi-intent questions
-    workflow.add_node("orchestrate_tools", orchestrate_tools)
+    if mode == "one_shot":
+        # Tool prefetch node (runs tools up front, no LLM routing call)
+        workflow.add_node("prefetch_tools", prefetch_tools)
+    else:
+        # Tool orchestration node (LLM intelligently calls one or more tools based on question)
+        # This replaces manual intent classification - the LLM handles multi-intent questions
+        workflow.add_node("orchestrate_tools", orchestrate_tools)
 
     # Response generation node (synthesizes tool results into natural language)
     workflow.add_node("generate_response", generate_response)
@@ -87,13 +121,13 @@ def create_graph() -> StateGraph:
         "identify_user",
         should_continue_after_identify,
         {
-            "orchestrate_tools": "orchestrate_tools",
+            "orchestrate_tools": tool_node,
             "__end__": END
         }
     )
 
-    # After orchestrate_tools completes, go to generate_response
-    workflow.add_edge("orchestrate_tools", "generate_response")
+    # After the tool step completes, go to generate_response
+    workflow.add_edge(tool_node, "generate_response")
 
     # generate_response is the final node, so it goes to END
     workflow.add_edge("generate_response", END)
@@ -101,7 +135,7 @@ def create_graph() -> StateGraph:
     return workflow
 
 
-def compile_agent():
+def compile_agent(mode: Optional[str] = None):
     """
     Create and compile the CARE Assistant agent.
 
@@ -115,6 +149,9 @@ def compile_agent():
     - Optimizes the execution plan
     - Returns a runnable agent that can be invoked
 
+    Args:
+        mode: Graph topology ("two_call" or "one_shot"). Defaults to GRAPH_MODE.
+
     Returns:
         CompiledGraph: The compiled agent ready to run conversations
 
@@ -134,19 +171,28 @@ def compile_agent():
         For multi-turn conversations, you need to pass the previous state
         back in on the next invocation to maintain conversation context.
     """
-    graph = create_graph()
+    graph = create_graph(mode)
     return graph.compile()
 
 
 # ============================================================================
-# Module-level compiled agent (optional convenience)
+# Shared compiled agent
 # ============================================================================
 
-# You can uncomment this to have a module-level agent instance
-# that's compiled once when the module is imported:
-#
-# agent = compile_agent()
-#
-# Then in other modules:
-# from app.graph.graph import agent
-# result = agent.invoke(...)
+@lru_cache(maxsize=1)
+def get_agent():
+    """
+    Get the shared compiled agent, compiling it on first use.
+
+    The compiled graph holds no per-conversation state, so one instance can
+    serve every request (single turns, batch items, concurrent sessions).
+    API endpoints use this instead of compiling the graph per request.
+
+    Returns:
+        CompiledGraph: The shared compiled agent
+
+    Example:
+        >>> from app.graph.graph import get_agent
+        >>> result = await get_agent().ainvoke(state)
+    """
+    return compile_agent()
@@ -11,27 +11,64 @@ Nodes are the building blocks of LangGraph. They define the logic at each step
 of the conversation flow.
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from typing import Dict, Any, List, Literal, Optional, Tuple
 from datetime import datetime
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_ollama import ChatOllama
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from langgraph.config import get_stream_writer
 from pydantic import BaseModel, Field
 
+from .briefing import start_member_briefing, take_member_briefing
+from .routing_cache import routing_cache
 from .state import ConversationState
-from app.data.loader import get_data
+from .tracing import Details, make_trace_entry
+from app.data.async_access import afind_user_by_name
+from app.llm.deadline import DeadlineExceeded, run_with_deadline
+from app.llm.registry import get_llm
+from app.llm.scheduler import current_session, scheduled
 from app.tools import coverage_lookup, benefit_verify, claims_status
+from app.tools.cache import ainvoke_cached
+from app.tools.service_index import find_services, resolve_service
 
 
 # ============================================================================
-# LLM Instance (Shared across nodes)
+# LLM Clients
 # ============================================================================
 
-# Initialize ChatOllama once and reuse across all nodes
-# This is more efficient than creating a new instance for each LLM call
-llm = ChatOllama(
-    model="llama3.2",
-    temperature=0.7,  # Moderate creativity for conversational responses
-)
+# Each LLM call fetches its client from the model registry by purpose
+# ("extraction", "routing", "response"), so every purpose can use its own
+# model and parameters. Clients are created once and shared across nodes.
+# See app/llm/registry.py for configuration.
+#
+# Every LLM call goes through call_llm(): it waits for admission by the
+# priority scheduler (app/llm/scheduler.py) and is bounded by a share of the
+# turn's remaining budget (app/llm/deadline.py). Tool waits use
+# run_with_deadline() directly.
+
+
+# Friendly progress messages shown in the UI while each tool runs
+TOOL_PROGRESS_MESSAGES = {
+    "coverage_lookup": "Let me check your coverage details...",
+    "benefit_verify": "Now let me verify what benefits are covered...",
+    "claims_status": "Let me look up your claims history..."
+}
+
+# One-shot mode: how many of the most recent claims to keep in the prompt
+ONE_SHOT_MAX_CLAIMS = 5
+
+# Static instructions for generate_response. This block is the first thing in
+# every response prompt and must not contain per-user or per-turn data, so the
+# LLM server can keep it in its prompt cache.
+RESPONSE_INSTRUCTIONS = """You are a helpful insurance coverage assistant for CARE Insurance.
+You help users understand their insurance coverage, benefits, and claims.
+
+IMPORTANT INSTRUCTIONS:
+1. Use ONLY the exact information provided in the user profile and tool results. Do NOT make up or guess any data.
+2. You are running locally with the user's consent. You MAY share personal information from their profile when asked (age, member date, deductible amounts, etc.).
+3. If specific information is not provided in the user profile or tool results, say you don't have that information.
+4. Be conversational, friendly, and helpful. Explain insurance terms in simple language.
+5. If tool results are provided with the latest question, use them to give specific, accurate information about it."""
 
 
 # ============================================================================
@@ -57,36 +94,264 @@ class NameExtraction(BaseModel):
     )
 
 
+class ToolSelection(BaseModel):
+    """
+    Structured output model for the tool-routing decision in orchestrate_tools.
+
+    The routing LLM call is constrained to this JSON schema, so the model can
+    only emit known tool names plus optional, validated arguments.
+    """
+    tools: List[Literal["coverage_lookup", "benefit_verify", "claims_status"]] = Field(
+        description="Tools needed to answer the question"
+    )
+    service_types: List[str] = Field(
+        default_factory=list,
+        description="Medical services named in the question, e.g. 'MRI', 'specialist', 'generic drugs'"
+    )
+    claim_status_filter: Optional[Literal["all", "pending", "approved", "denied"]] = Field(
+        default="all",
+        description="Only claims with this status"
+    )
+    date_from: Optional[str] = Field(
+        default=None,
+        pattern=r"^\d{4}-\d{2}-\d{2}$",
+        description="Earliest claim service date (YYYY-MM-DD)"
+    )
+    date_to: Optional[str] = Field(
+        default=None,
+        pattern=r"^\d{4}-\d{2}-\d{2}$",
+        description="Latest claim service date (YYYY-MM-DD)"
+    )
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def add_trace_entry(trace: list, node_name: str, action: str, details: Dict[str, Any] = None) -> list:
+def add_trace_entry(trace: list, node_name: str, action: str, details: Details = None) -> list:
     """
     Helper function to add an entry to the execution trace.
 
     The execution trace provides visibility into how the graph executes,
     which is essential for learning and debugging LangGraph applications.
+    How much is recorded depends on the turn's trace level (see
+    app/graph/tracing.py): nothing when tracing is off, and details only
+    in full traces.
 
     Args:
         trace: Current execution trace list from state
         node_name: Name of the node being executed
         action: Description of what the node is doing
-        details: Optional additional information (LLM prompts, tool results, etc.)
+        details: Optional additional information (LLM prompts, tool results, etc.),
+                 or a callable returning it. Kept by reference, not copied.
+
+    Returns:
+        list: Updated trace with new entry appended (trace itself when nothing is recorded)
+    """
+    entry = make_trace_entry(node_name, action, details)
+    if entry is None:
+        return trace
+    return trace + [entry]
+
+
+def build_tool_calls(user_id: str, user_message: str) -> Dict[str, Tuple[Any, Dict[str, Any]]]:
+    """
+    Build the call arguments for every tool, for one user and question.
+
+    All arguments are known without an LLM: tools are keyed by user_id, and
+    benefit_verify's services come from the service index (an empty list
+    verifies every service in the plan).
+
+    Args:
+        user_id: Identified user
+        user_message: The user's question
 
     Returns:
-        list: Updated trace with new entry appended
+        dict: Maps tool name to (tool, args)
     """
-    entry = {
-        "node": node_name,
-        "timestamp": datetime.now().isoformat(),
-        "action": action,
+    services = [match.label for match in find_services(user_message)]
+    return {
+        "coverage_lookup": (coverage_lookup, {"user_id": user_id, "query": user_message}),
+        "benefit_verify": (benefit_verify, {"user_id": user_id, "service_types": services}),
+        "claims_status": (claims_status, {"user_id": user_id}),
     }
 
-    if details:
-        entry.update(details)
 
-    return trace + [entry]
+def emit_progress(event: Dict[str, Any]) -> None:
+    """
+    Send a progress event to streaming clients (e.g. /ws/chat).
+
+    Does nothing when the graph is not streamed or the node is called directly.
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer(event)
+
+
+async def call_llm(purpose: str, awaitable: Any) -> Any:
+    """
+    Run an LLM call through the admission scheduler under the turn's deadline.
+
+    Queue wait counts against the deadline, so a call that can't be admitted
+    in time is dropped from the queue.
+
+    Args:
+        purpose: Model registry purpose, also used as the deadline stage
+        awaitable: The LLM call, not yet awaited
+
+    Returns:
+        The LLM call's result
+
+    Raises:
+        DeadlineExceeded: If the call (including queue wait) runs out of budget
+    """
+    return await run_with_deadline(scheduled(purpose, awaitable), purpose)
+
+
+async def _run_tool_timed(tool_fn: Any, tool_args: Dict[str, Any]) -> Tuple[Any, float, bool]:
+    """
+    Run a tool without blocking the event loop, answering from the tool cache when possible.
+
+    Returns (result, elapsed_ms, cache_hit).
+    """
+    started = time.perf_counter()
+    result, cache_hit = await ainvoke_cached(tool_fn, tool_args)
+    return result, (time.perf_counter() - started) * 1000, cache_hit
+
+
+def start_speculative_tools(tool_calls: Dict[str, Tuple[Any, Dict[str, Any]]]) -> Dict[str, "asyncio.Task"]:
+    """
+    Start every tool call as a background task.
+
+    Used by orchestrate_tools so the tools run while the routing LLM call is
+    in flight; the routing decision then only picks which results to use.
+
+    Args:
+        tool_calls: Output of build_tool_calls()
+
+    Returns:
+        dict: Maps tool name to a task resolving to (result, elapsed_ms, cache_hit)
+    """
+    return {
+        tool_name: asyncio.create_task(_run_tool_timed(tool_fn, tool_args))
+        for tool_name, (tool_fn, tool_args) in tool_calls.items()
+    }
+
+
+def build_response_prompt(state: ConversationState) -> Tuple[str, List[BaseMessage]]:
+    """
+    Build the system prompt and message list for generate_response.
+
+    The prompt is assembled in fixed layers, from most to least stable, so
+    Ollama can reuse its cached prompt prefix (KV cache) across turns and users:
+    1. Static instructions (identical for every user and turn)
+    2. Per-user profile and member briefing (identical for every turn of a
+       member's session)
+    3. Conversation history (grows by one exchange per turn)
+    4. Per-turn tool results, folded into the final user message
+
+    Only layers 1 and 2 are system messages. Ollama merges every system
+    message into the single system block at the top of the prompt, so tool
+    results sent as a system message would land in front of the history and
+    invalidate the cached prefix on every tool turn.
+
+    Kept separate from the node so the prompt can be inspected and
+    benchmarked without calling the LLM.
+
+    Args:
+        state: Current conversation state
+
+    Returns:
+        tuple: (system text of layers 1-2, full list of prompt messages for the LLM)
+    """
+    # Get conversation history
+    messages = state.get("messages", [])
+    tool_results = state.get("tool_results")
+    user_profile = state.get("user_profile", {})
+
+    # Layer 2: per-user profile details
+    user_details = ""
+    if user_profile:
+        user_details = f"""Current User Profile:
+- Name: {user_profile.get('name', 'Unknown')}
+- Age: {user_profile.get('age', 'Unknown')}
+- Plan ID: {user_profile.get('plan_id', 'Unknown')}
+- Member Since: {user_profile.get('member_since', 'Unknown')}
+- Annual Deductible: ${user_profile.get('deductible_annual', 0):,}
+- Deductible Met: ${user_profile.get('deductible_met', 0):,}
+- Out-of-Pocket Maximum: ${user_profile.get('out_of_pocket_max', 0):,}
+- Out-of-Pocket Spent: ${user_profile.get('out_of_pocket_spent', 0):,}
+- Dependents: {user_profile.get('dependents', 0)}"""
+        if state.get("member_briefing"):
+            user_details += f"\n\n{state['member_briefing']}"
+
+    # Layer 4: per-turn tool results
+    # tool_results can now be a dict with multiple tool outputs
+    tool_context = ""
+    if tool_results:
+        tool_context = "Tool Results for the latest question:\n"
+
+        # Check if it's the new multi-tool format (dict of tool_name: result)
+        # or old single-tool format (single dict with 'status')
+        if isinstance(tool_results, dict) and "status" in tool_results:
+            # Old single-tool format
+            tool_context += f"{tool_results}\n"
+        elif isinstance(tool_results, dict):
+            # New multi-tool format - iterate through each tool's results
+            for tool_name, result in tool_results.items():
+                tool_context += f"\n--- {tool_name.upper()} ---\n"
+                tool_context += f"{result}\n"
+
+    prompt_messages: List[BaseMessage] = [SystemMessage(content=RESPONSE_INSTRUCTIONS)]
+    if user_details:
+        prompt_messages.append(SystemMessage(content=user_details))
+    prompt_messages.extend(messages)
+    if tool_context:
+        # The stored history keeps the plain question; only this prompt's copy
+        # of it carries the tool results
+        if prompt_messages and isinstance(prompt_messages[-1], HumanMessage):
+            question = prompt_messages.pop()
+            prompt_messages.append(HumanMessage(content=f"{question.content}\n\n{tool_context}"))
+        else:
+            prompt_messages.append(HumanMessage(content=tool_context))
+
+    system_prompt = "\n\n".join(part for part in (RESPONSE_INSTRUCTIONS, user_details) if part)
+
+    return system_prompt, prompt_messages
+
+
+def prompt_cache_stats(response: BaseMessage, prompt_chars: int) -> Dict[str, Any]:
+    """
+    Extract prompt-evaluation counters from an Ollama response.
+
+    Ollama only evaluates the part of the prompt that isn't already in its
+    KV cache, so a low prompt_eval_count relative to the prompt size means
+    the stable prefix was reused.
+
+    Args:
+        response: AIMessage returned by ChatOllama
+        prompt_chars: Total characters in the prompt messages
+
+    Returns:
+        dict: prompt_eval_count, prompt_eval_ms, eval_count, prompt_chars and an
+              estimated cached-prefix ratio (assumes ~4 characters per token);
+              empty if the model didn't report counters
+    """
+    meta = getattr(response, "response_metadata", None) or {}
+    if "prompt_eval_count" not in meta:
+        return {}
+
+    prompt_eval_count = meta.get("prompt_eval_count") or 0
+    estimated_prompt_tokens = max(prompt_chars // 4, 1)
+    return {
+        "prompt_eval_count": prompt_eval_count,
+        "prompt_eval_ms": round((meta.get("prompt_eval_duration") or 0) / 1_000_000, 1),
+        "eval_count": meta.get("eval_count"),
+        "prompt_chars": prompt_chars,
+        "estimated_cached_ratio": round(max(0.0, 1 - prompt_eval_count / estimated_prompt_tokens), 2)
+    }
 
 
 # ============================================================================
@@ -188,7 +453,7 @@ async def identify_user(state: ConversationState) -> Dict[str, Any]:
     )
 
     # Create an LLM with structured output to extract the name
-    llm_with_structure = llm.with_structured_output(NameExtraction)
+    llm_with_structure = get_llm("extraction").with_structured_output(NameExtraction)
 
     # Prompt the LLM to extract just the name
     extraction_prompt = f"""Extract the person's name from this message: "{user_input}"
@@ -203,7 +468,7 @@ Examples:
 Only extract the actual name, nothing else. If you're not sure, set confidence to 'low'."""
 
     # Get the structured extraction
-    extraction_result = await llm_with_structure.ainvoke(extraction_prompt)
+    extraction_result = await call_llm("extraction", llm_with_structure.ainvoke(extraction_prompt))
     extracted_name = extraction_result.name
 
     trace = add_trace_entry(
@@ -230,18 +495,8 @@ Only extract the actual name, nothing else. If you're not sure, set confidence t
         f"Searching for user by extracted name: {extracted_name}"
     )
 
-    # Load data and search for user by name (case-insensitive)
-    data = get_data()
-    found_user = None
-
-    for user in data.get("users", []):
-        # Check if the extracted name matches the user's first name or full name (case-insensitive)
-        user_name = user.get("name", "")
-        first_name = user_name.split()[0].lower() if user_name else ""
-
-        if extracted_name.lower() == first_name or extracted_name.lower() == user_name.lower():
-            found_user = user
-            break
+    # Search for user by name (case-insensitive)
+    found_user = await afind_user_by_name(extracted_name)
 
     if found_user:
         # User found! Load their profile
@@ -275,6 +530,15 @@ Only extract the actual name, nothing else. If you're not sure, set confidence t
                 content=f"Welcome {first_name}! ❤️ I found your account. Do you have any questions about your plan, benefits, or claims?"
             )
 
+        # Use the idle time until the first question: run the tools and warm
+        # the response prompt prefix in the background
+        if start_member_briefing(
+            current_session(),
+            user_id,
+            {**state, "user_profile": found_user, "messages": messages + [welcome_message]}
+        ):
+            trace = add_trace_entry(trace, "identify_user", "Started background member briefing")
+
         return {
             "user_id": user_id,
             "user_profile": found_user,
@@ -313,11 +577,16 @@ async def orchestrate_tools(state: ConversationState) -> Dict[str, Any]:
     which tools to call (and in what order) to answer complex user questions.
 
     The flow:
-    1. LLM sees the user question and available tools
-    2. LLM decides which tools to call (can call multiple)
-    3. Tools are executed and results stored
-    4. Results are accumulated in tool_results dict
-    5. Node sets needs_tool_call=False to signal completion
+    1. All tools start speculatively in the background (cheap, keyed by user_id)
+    2. LLM sees the user question and available tools
+    3. LLM decides which tools to call (can call multiple), answering with
+       schema-constrained JSON (ToolSelection) that may include tool arguments.
+       Questions similar to earlier ones reuse the cached decision instead
+       (see routing_cache.py)
+    4. Results of the selected tools are collected; unused ones are discarded
+       and their cost is recorded in the trace
+    5. Results are accumulated in tool_results dict
+    6. Node sets needs_tool_call=False to signal completion
 
     This enables handling requests like:
     "What plan do I have, how long have I been a member, what does it offer,
@@ -352,73 +621,73 @@ async def orchestrate_tools(state: ConversationState) -> Dict[str, Any]:
         "Determining which tools to call for complex request"
     )
 
-    # Create a prompt that tells the LLM which tools to call
-    # Ollama doesn't support native tool binding, so we use text-based orchestration
-    user_question_msg = HumanMessage(content=f"""Analyze this insurance question and determine which tools to call:
+    # Speculatively start every tool now: they are cheap lookups keyed by
+    # user_id, so they run while the LLM decides which ones are needed
+    tool_calls = build_tool_calls(user_id, user_message)
+    speculative_tasks = start_speculative_tools(tool_calls)
 
-Question: "{user_message}"
-
-Available tools:
-- coverage_lookup: Returns plan details, deductibles, limits, member since date
-- benefit_verify: Checks if specific medical services are covered
-- claims_status: Returns claims history and pending/approved/denied claims
-
-Instructions:
-1. Read the question carefully
-2. Identify what information is being asked for
-3. List ONLY the tool names needed, one per line
-4. Do not include any explanation or extra text
-
-Examples:
-Question: "What plan do I have and when did I become a member?"
-Response:
-coverage_lookup
-
-Question: "Do I have any pending claims?"
-Response:
-claims_status
-
-Question: "What plan do I have, what does it cover, and do I have outstanding claims?"
-Response:
-coverage_lookup
-benefit_verify
-claims_status
-
-Now analyze the question above and respond with only the tool names:""")
-
-    # Let the LLM decide which tools to call
     trace = add_trace_entry(
         trace,
         "orchestrate_tools",
-        "Asking LLM to determine which tools are needed"
+        f"Speculatively started tools: {list(speculative_tasks)}"
     )
 
-    response = await llm.ainvoke([user_question_msg])
-
-    trace = add_trace_entry(
-        trace,
-        "orchestrate_tools",
-        f"LLM suggested tools: {response.content}"
-    )
+    # Routing depends only on the question: reuse the decision made for a
+    # similar question when there is one
+    cached_route = routing_cache.lookup(user_message)
 
-    # Parse the LLM's response to extract tool names
-    tool_names = []
-    for line in response.content.strip().split('\n'):
-        line = line.strip().lower()
-        if 'coverage_lookup' in line:
-            tool_names.append('coverage_lookup')
-        elif 'benefit_verify' in line:
-            tool_names.append('benefit_verify')
-        elif 'claims_status' in line:
-            tool_names.append('claims_status')
+    if cached_route is not None and not cached_route["verify"]:
+        selection = ToolSelection(**cached_route["decision"])
+        trace = add_trace_entry(
+            trace,
+            "orchestrate_tools",
+            f"Routing cache hit, skipped LLM routing: {selection.tools}",
+            {"similarity": cached_route["similarity"], "matched": cached_route["matched"]}
+        )
+    else:
+        selection, routed, trace = await _route_with_llm(user_message, tool_calls, speculative_tasks, trace)
+        if routed and _is_cacheable_route(selection, tool_calls):
+            disagreed = routing_cache.record(
+                user_message,
+                {"tools": selection.tools, "claim_status_filter": selection.claim_status_filter},
+                verified=cached_route is not None
+            )
+            if disagreed:
+                trace = add_trace_entry(
+                    trace,
+                    "orchestrate_tools",
+                    "LLM routing disagreed with the routing cache, cached decision replaced",
+                    {"cached": cached_route["decision"], "similarity": cached_route["similarity"]}
+                )
 
     # Remove duplicates while preserving order
-    tool_names = list(dict.fromkeys(tool_names))
+    tool_names = list(dict.fromkeys(selection.tools))
+
+    # Apply the arguments the LLM extracted. Tools whose arguments differ from
+    # the speculative call are re-run with the new arguments.
+    if selection.service_types:
+        services = tool_calls["benefit_verify"][1]["service_types"]
+        for service in selection.service_types:
+            match = resolve_service(service)
+            if match and match.label not in services:
+                services = services + [match.label]
+        _refresh_tool_call(tool_calls, speculative_tasks, "benefit_verify", {"service_types": services})
+
+    claims_args = {}
+    if selection.claim_status_filter and selection.claim_status_filter != "all":
+        claims_args["status_filter"] = selection.claim_status_filter
+    if selection.date_from:
+        claims_args["date_from"] = selection.date_from
+    if selection.date_to:
+        claims_args["date_to"] = selection.date_to
+    if claims_args:
+        _refresh_tool_call(tool_calls, speculative_tasks, "claims_status", claims_args)
 
     trace = add_trace_entry(
         trace,
         "orchestrate_tools",
-        f"Extracted tool names: {tool_names}"
+        f"Extracted tool names: {tool_names}",
+        lambda: {"tool_args": {name: tool_calls[name][1] for name in tool_names}}
     )
 
     # Initialize or get existing tool_results dict
@@ -428,49 +697,55 @@ Now analyze the question above and respond with only the tool names:""")
 
     # Execute the tools the LLM selected
     if tool_names:
-        # Execute each tool call
-        for tool_name in tool_names:
-            # Add friendly progress message for this tool
-            tool_progress_messages = {
-                "coverage_lookup": "Let me check your coverage details...",
-                "benefit_verify": "Now let me verify what benefits are covered...",
-                "claims_status": "Let me look up your claims history..."
-            }
-
-            if tool_name in tool_progress_messages:
-                progress_messages.append(tool_progress_messages[tool_name])
+        # Execute each tool call. If the turn is cancelled or fails while
+        # waiting on one, the speculative tasks not awaited yet are cancelled
+        # too, so they don't keep running (or hold executor threads).
+        try:
+            for tool_name in tool_names:
+                # Add friendly progress message for this tool
+                tool_progress_messages = TOOL_PROGRESS_MESSAGES
+
+                if tool_name in tool_progress_messages:
+                    progress_messages.append(tool_progress_messages[tool_name])
+
+                trace = add_trace_entry(
+                    trace,
+                    "orchestrate_tools",
+                    f"Executing tool: {tool_name}",
+                    {"tool_name": tool_name, "progress_message": tool_progress_messages.get(tool_name, "")}
+                )
 
-            trace = add_trace_entry(
-                trace,
-                "orchestrate_tools",
-                f"Executing tool: {tool_name}",
-                {"tool_name": tool_name, "progress_message": tool_progress_messages.get(tool_name, "")}
-            )
+                emit_progress({"type": "tool", "tool": tool_name, "stage": "started",
+                               "message": tool_progress_messages.get(tool_name, "")})
+
+                # The tool was started speculatively; usually it has already finished
+                try:
+                    result, elapsed_ms, cache_hit = await run_with_deadline(speculative_tasks.pop(tool_name), "tools")
+                except DeadlineExceeded as e:
+                    result = {"status": "error", "message": f"{tool_name} did not finish in time"}
+                    elapsed_ms = e.budget_seconds * 1000
+                    cache_hit = False
+
+                emit_progress({"type": "tool", "tool": tool_name, "stage": "finished",
+                               "status": result.get("status") if isinstance(result, dict) else "success"})
+                all_tool_results[tool_name] = result
+
+                trace = add_trace_entry(
+                    trace,
+                    "orchestrate_tools",
+                    f"Tool {tool_name} completed",
+                    {
+                        "status": result.get('status') if isinstance(result, dict) else 'success',
+                        "tool_ms": round(elapsed_ms, 3),
+                        "cache_hit": cache_hit
+                    }
+                )
+        except BaseException:
+            for task in speculative_tasks.values():
+                task.cancel()
+            raise
 
-            # Call the appropriate tool with user_id and query
-            tool_args = {
-                "user_id": user_id,
-                "query": user_message
-            }
-
-            if tool_name == "coverage_lookup":
-                result = coverage_lookup.invoke(tool_args)
-                all_tool_results["coverage_lookup"] = result
-            elif tool_name == "benefit_verify":
-                # benefit_verify needs service_type, extract from question or default
-                tool_args["service_type"] = "general medical"  # Default for now
-                result = benefit_verify.invoke(tool_args)
-                all_tool_results["benefit_verify"] = result
-            elif tool_name == "claims_status":
-                result = claims_status.invoke(tool_args)
-                all_tool_results["claims_status"] = result
-
-            trace = add_trace_entry(
-                trace,
-                "orchestrate_tools",
-                f"Tool {tool_name} completed",
-                {"status": result.get('status') if isinstance(result, dict) else 'success'}
-            )
+        trace = _discard_speculative_tools(trace, speculative_tasks)
 
         # All tools executed, ready to generate response
         return {
@@ -486,6 +761,7 @@ Now analyze the question above and respond with only the tool names:""")
             "orchestrate_tools",
             "No tool calls needed (unusual - LLM decided question doesn't need tools)"
         )
+        trace = _discard_speculative_tools(trace, speculative_tasks)
 
         return {
             "needs_tool_call": False,
@@ -493,6 +769,250 @@ Now analyze the question above and respond with only the tool names:""")
         }
 
 
+async def _route_with_llm(
+    user_message: str,
+    tool_calls: Dict[str, Tuple[Any, Dict[str, Any]]],
+    speculative_tasks: Dict[str, "asyncio.Task"],
+    trace: list
+) -> Tuple[ToolSelection, bool, list]:
+    """
+    Ask the routing LLM which tools a question needs.
+
+    Returns:
+        tuple: (selection, routed, trace). routed is False when the LLM output
+               failed validation or timed out and every tool is used instead.
+    """
+    # Create a prompt that tells the LLM which tools to call.
+    # The answer is constrained to the ToolSelection JSON schema, so the model
+    # only decodes a handful of tokens instead of free text.
+    user_question_msg = HumanMessage(content=f"""Select the tools needed to answer this insurance question.
+
+Question: "{user_message}"
+
+Available tools:
+- coverage_lookup: Returns plan details, deductibles, limits, member since date
+- benefit_verify: Checks if specific medical services are covered
+- claims_status: Returns claims history and pending/approved/denied claims
+
+Fill service_types only with services named in the question. Set claim_status_filter
+and date_from/date_to (YYYY-MM-DD) only if the question asks for them.""")
+
+    # Let the LLM decide which tools to call
+    trace = add_trace_entry(
+        trace,
+        "orchestrate_tools",
+        "Asking LLM to determine which tools are needed"
+    )
+
+    router = get_llm("routing").with_structured_output(ToolSelection, method="json_schema", include_raw=True)
+
+    try:
+        routing = await call_llm("routing", router.ainvoke([user_question_msg]))
+    except DeadlineExceeded as e:
+        # Routing ran out of budget: keep going with every speculative result
+        routing = {"parsed": None, "raw": None, "parsing_error": e}
+    except BaseException:
+        # Routing failed or the turn was cancelled: stop the speculative work
+        for task in speculative_tasks.values():
+            task.cancel()
+        raise
+
+    selection = routing.get("parsed")
+    raw_output = getattr(routing.get("raw"), "content", "")
+
+    if selection is None:
+        # Output didn't validate against the schema (or routing timed out):
+        # fall back to every tool
+        selection = ToolSelection(tools=list(tool_calls))
+        timed_out = isinstance(routing.get("parsing_error"), DeadlineExceeded)
+        trace = add_trace_entry(
+            trace,
+            "orchestrate_tools",
+            "LLM routing timed out, using all tools" if timed_out else "LLM routing output failed validation, using all tools",
+            {"raw_output": raw_output, "error": str(routing.get("parsing_error"))}
+        )
+    else:
+        trace = add_trace_entry(
+            trace,
+            "orchestrate_tools",
+            f"LLM selected tools: {selection.tools}",
+            lambda: {"selection": selection.model_dump(), "raw_output": raw_output}
+        )
+
+    return selection, routing.get("parsed") is not None, trace
+
+
+def _is_cacheable_route(selection: ToolSelection, tool_calls: Dict[str, Tuple[Any, Dict[str, Any]]]) -> bool:
+    """
+    Whether a routing decision can be reused for similar questions.
+
+    Cached decisions keep only the tools and the claim status filter, so
+    decisions with dates, or with services the local service index didn't
+    detect, can't be reproduced from the cache.
+    """
+    if selection.date_from or selection.date_to:
+        return False
+    services = tool_calls["benefit_verify"][1]["service_types"]
+    for service in selection.service_types:
+        match = resolve_service(service)
+        if match and match.label not in services:
+            return False
+    return True
+
+
+def _refresh_tool_call(
+    tool_calls: Dict[str, Tuple[Any, Dict[str, Any]]],
+    speculative_tasks: Dict[str, "asyncio.Task"],
+    tool_name: str,
+    new_args: Dict[str, Any]
+) -> None:
+    """
+    Update a tool's arguments after routing and restart it if they changed.
+
+    The speculative result computed with the old arguments is kept under a
+    separate key so its cost is still reported as discarded work.
+    """
+    tool_fn, tool_args = tool_calls[tool_name]
+    merged = {**tool_args, **new_args}
+    if merged == tool_args:
+        return
+    tool_calls[tool_name] = (tool_fn, merged)
+    speculative_tasks[f"{tool_name} (speculative args)"] = speculative_tasks.pop(tool_name)
+    speculative_tasks[tool_name] = asyncio.create_task(_run_tool_timed(tool_fn, merged))
+
+
+def _discard_speculative_tools(trace: list, unused_tasks: Dict[str, "asyncio.Task"]) -> list:
+    """
+    Drop speculative tool results the LLM did not ask for, recording their cost.
+
+    Finished tasks report how long they ran (wasted work); tasks still running
+    are cancelled so they never hold up the response.
+    """
+    if not unused_tasks:
+        return trace
+
+    wasted_ms = 0.0
+    cancelled = []
+    for tool_name, task in unused_tasks.items():
+        if task.done() and not task.cancelled() and task.exception() is None:
+            wasted_ms += task.result()[1]
+        else:
+            task.cancel()
+            cancelled.append(tool_name)
+
+    return add_trace_entry(
+        trace,
+        "orchestrate_tools",
+        f"Discarded speculative results: {list(unused_tasks)}",
+        {"speculative_wasted_ms": round(wasted_ms, 3), "speculative_cancelled": cancelled}
+    )
+
+
+# ============================================================================
+# Node 2b: Prefetch Tools (one-shot graph mode)
+# ============================================================================
+
+def trim_tool_results(tool_results: Dict[str, Any], max_claims: int = ONE_SHOT_MAX_CLAIMS) -> Dict[str, Any]:
+    """
+    Shrink prefetched tool results before they go into the prompt.
+
+    Claims lists are cut to the most recent max_claims entries (the summary
+    still covers all claims). Other results are passed through unchanged.
+
+    Args:
+        tool_results: Dict mapping tool names to their results
+        max_claims: Number of most recent claims to keep
+
+    Returns:
+        dict: Trimmed copy of tool_results
+    """
+    trimmed = dict(tool_results)
+    claims_result = trimmed.get("claims_status")
+    if isinstance(claims_result, dict) and len(claims_result.get("claims", [])) > max_claims:
+        claims_result = dict(claims_result)
+        claims_result["claims_omitted"] = len(claims_result["claims"]) - max_claims
+        claims_result["claims"] = claims_result["claims"][:max_claims]
+        trimmed["claims_status"] = claims_result
+    return trimmed
+
+
+async def prefetch_tools(state: ConversationState) -> Dict[str, Any]:
+    """
+    Run the in-memory tools up front, without an LLM routing call.
+
+    Used in the one-shot graph mode (GRAPH_MODE=one_shot), where a single LLM
+    call in generate_response answers from pre-fetched context:
+    - coverage_lookup and claims_status always run (cheap local lookups)
+    - benefit_verify runs only for services mentioned in the question
+      (fast path via the service index)
+    - Results are trimmed so the prompt stays small
+
+    Args:
+        state: Current conversation state
+
+    Returns:
+        dict: State updates with tool_results, execution trace, and progress_messages
+    """
+    trace = state.get("execution_trace", [])
+    user_id = state.get("user_id")
+    messages = state.get("messages", [])
+
+    if not messages:
+        return {
+            "needs_tool_call": False,
+            "execution_trace": trace
+        }
+
+    user_message = messages[-1].content
+    tool_calls = build_tool_calls(user_id, user_message)
+    services = tool_calls["benefit_verify"][1]["service_types"]
+    if not services:
+        # No service mentioned: coverage_lookup already lists the plan's coverage
+        del tool_calls["benefit_verify"]
+
+    trace = add_trace_entry(
+        trace,
+        "prefetch_tools",
+        f"Prefetching tools without LLM routing: {list(tool_calls)}",
+        {"services_detected": services}
+    )
+
+    async def run_tool(tool_name: str, tool_fn: Any, tool_args: Dict[str, Any]) -> Tuple[Any, bool]:
+        emit_progress({"type": "tool", "tool": tool_name, "stage": "started",
+                       "message": TOOL_PROGRESS_MESSAGES[tool_name]})
+        result, cache_hit = await ainvoke_cached(tool_fn, tool_args)
+        emit_progress({"type": "tool", "tool": tool_name, "stage": "finished",
+                       "status": result.get("status")})
+        return result, cache_hit
+
+    # The tools are independent, so they run concurrently
+    progress_messages = [TOOL_PROGRESS_MESSAGES[tool_name] for tool_name in tool_calls]
+    outcomes = await asyncio.gather(*(
+        run_tool(tool_name, tool_fn, tool_args) for tool_name, (tool_fn, tool_args) in tool_calls.items()
+    ))
+    tool_results = {tool_name: result for tool_name, (result, _) in zip(tool_calls, outcomes)}
+    cache_hits = {tool_name: cache_hit for tool_name, (_, cache_hit) in zip(tool_calls, outcomes)}
+
+    tool_results = trim_tool_results(tool_results)
+
+    trace = add_trace_entry(
+        trace,
+        "prefetch_tools",
+        "Prefetched tool results ready",
+        lambda: {
+            "statuses": {name: result.get("status") for name, result in tool_results.items()},
+            "cache_hits": cache_hits
+        }
+    )
+
+    return {
+        "tool_results": tool_results,
+        "needs_tool_call": False,
+        "execution_trace": trace,
+        "progress_messages": progress_messages
+    }
+
+
 # ============================================================================
 # Node 3: Generate Response
 # ============================================================================
@@ -526,64 +1046,24 @@ async def generate_response(state: ConversationState) -> Dict[str, Any]:
         "Generating response with LLM"
     )
 
-    # Get conversation history
-    messages = state.get("messages", [])
-    tool_results = state.get("tool_results")
-    user_profile = state.get("user_profile", {})
-
-    # Build context for the LLM
-    # Format user profile details for the LLM
-    user_details = ""
-    if user_profile:
-        user_details = f"""
-Current User Profile:
-- Name: {user_profile.get('name', 'Unknown')}
-- Age: {user_profile.get('age', 'Unknown')}
-- Plan ID: {user_profile.get('plan_id', 'Unknown')}
-- Member Since: {user_profile.get('member_since', 'Unknown')}
-- Annual Deductible: ${user_profile.get('deductible_annual', 0):,}
-- Deductible Met: ${user_profile.get('deductible_met', 0):,}
-- Out-of-Pocket Maximum: ${user_profile.get('out_of_pocket_max', 0):,}
-- Out-of-Pocket Spent: ${user_profile.get('out_of_pocket_spent', 0):,}
-- Dependents: {user_profile.get('dependents', 0)}
-"""
-
-    system_prompt = f"""You are a helpful insurance coverage assistant for CARE Insurance.
-You help users understand their insurance coverage, benefits, and claims.
+    # The member briefing prepared in the background after identification
+    # joins the per-user prompt layer for the rest of the session
+    updates: Dict[str, Any] = {}
+    if not state.get("member_briefing"):
+        briefing = take_member_briefing(current_session())
+        if briefing:
+            updates["member_briefing"] = briefing
+            state = {**state, "member_briefing": briefing}
+            trace = add_trace_entry(trace, "generate_response", "Using member briefing prepared in the background")
 
-{user_details}
-
-IMPORTANT INSTRUCTIONS:
-1. Use ONLY the exact information provided above from the user profile. Do NOT make up or guess any data.
-2. You are running locally with the user's consent. You MAY share personal information from their profile when asked (age, member date, deductible amounts, etc.).
-3. If specific information is not provided in the user profile or tool results, say you don't have that information.
-4. Be conversational, friendly, and helpful. Explain insurance terms in simple language.
-5. If tool results are provided below, use them to give specific, accurate information."""
-
-    # Add tool results to context if available
-    # tool_results can now be a dict with multiple tool outputs
-    if tool_results:
-        tool_context = "\n\nTool Results:\n"
-
-        # Check if it's the new multi-tool format (dict of tool_name: result)
-        # or old single-tool format (single dict with 'status')
-        if isinstance(tool_results, dict) and "status" in tool_results:
-            # Old single-tool format
-            tool_context += f"{tool_results}\n"
-        elif isinstance(tool_results, dict):
-            # New multi-tool format - iterate through each tool's results
-            for tool_name, result in tool_results.items():
-                tool_context += f"\n--- {tool_name.upper()} ---\n"
-                tool_context += f"{result}\n"
-
-        system_prompt += tool_context
-
-    # Create prompt with full conversation context
-    prompt_messages = [SystemMessage(content=system_prompt)] + messages
+    tool_results = state.get("tool_results")
+    system_prompt, prompt_messages = build_response_prompt(state)
 
     try:
         # Generate response
-        response = await llm.ainvoke(prompt_messages)
+        response = await call_llm("response", get_llm("response").ainvoke(prompt_messages))
+
+        prompt_chars = sum(len(str(message.content)) for message in prompt_messages)
 
         trace = add_trace_entry(
             trace,
@@ -592,7 +1072,8 @@ IMPORTANT INSTRUCTIONS:
             {
                 "llm_prompt_length": len(system_prompt),
                 "has_tool_results": tool_results is not None,
-                "response_length": len(response.content)
+                "response_length": len(response.content),
+                "prompt_cache": prompt_cache_stats(response, prompt_chars)
             }
         )
 
@@ -601,7 +1082,25 @@ IMPORTANT INSTRUCTIONS:
         # They will be replaced when new tools are called in the next turn
         return {
             "messages": [AIMessage(content=response.content)],
-            "execution_trace": trace
+            "execution_trace": trace,
+            **updates
+        }
+
+    except DeadlineExceeded as e:
+        # Out of time: the Ollama request has been cancelled
+        trace = add_trace_entry(
+            trace,
+            "generate_response",
+            "Response generation stopped at the deadline",
+            {"error": str(e)}
+        )
+
+        return {
+            "messages": [AIMessage(
+                content="I'm sorry, that took longer than expected. Could you please ask again?"
+            )],
+            "execution_trace": trace,
+            **updates
         }
 
     except Exception as e:
@@ -619,5 +1118,6 @@ IMPORTANT INSTRUCTIONS:
 
         return {
             "messages": [error_response],
-            "execution_trace": trace
+            "execution_trace": trace,
+            **updates
         }
@@ -0,0 +1,501 @@
+"""
+Routing Decision Cache for CARE Assistant.
+
+Which tools orchestrate_tools runs depends only on the question text, not on
+the member asking it, yet every paraphrase of "do I have pending claims" costs
+a routing LLM call. This cache remembers the LLM's routing decisions and
+answers similar questions without the call.
+
+Question signature:
+- The question is tokenized, stop words are dropped and the remaining words
+  are lemmatized with a few suffix rules ("claims" → "claim",
+  "denied" → "deny"), giving a normalized text.
+- Unigrams and bigrams of the normalized tokens are hashed into a sparse
+  vector (feature hashing, CRC32).
+- Medical services found by the service index are replaced by one
+  placeholder token, so "is an MRI covered" and "is physical therapy
+  covered" share a signature (tool arguments come from the local extraction).
+- Guard terms must match exactly: the claim statuses mentioned (pending /
+  approved / denied), time words and numbers, and whether a medical service
+  was detected. "pending claims" and "denied claims" are near-identical
+  texts but need different decisions.
+
+Lookup is an exact match on the normalized text first, then a nearest-neighbor
+search (cosine similarity over entries sharing at least one word, found
+through an inverted index). A neighbor at or above ROUTING_CACHE_THRESHOLD
+is a hit.
+
+Only decisions that can be reproduced without the LLM are cached: the tool
+list and the claim status filter. Decisions that extracted dates, or services
+the local service index doesn't detect, are not cached. On a hit, tool
+arguments come from the local extraction (build_tool_calls) as usual.
+
+A sample of hits (ROUTING_CACHE_VERIFY_RATE) is still sent to the LLM; the
+share where it disagrees with the cache is the disagreement rate, and a
+disagreement replaces the cached decision.
+
+Entries are evicted least recently used and persisted to
+data/.cache/routing_cache.json (on the periodic cleanup and at shutdown), so
+they survive restarts. The file is discarded when the routing model or
+ROUTING_PROMPT_VERSION changes. With several workers, each keeps its own
+cache and the last one to save wins.
+
+Configuration:
+    ROUTING_CACHE_SIZE         max cached decisions (default 5000, 0 disables)
+    ROUTING_CACHE_THRESHOLD    min cosine similarity for a hit (default 0.85)
+    ROUTING_CACHE_VERIFY_RATE  share of hits re-checked with the LLM (default 0.05)
+    ROUTING_CACHE_PATH         persistence file (default data/.cache/routing_cache.json)
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from app.tools.service_index import find_services, tokenize
+
+
+ROUTING_CACHE_SIZE = int(os.getenv("ROUTING_CACHE_SIZE", "5000"))
+ROUTING_CACHE_THRESHOLD = float(os.getenv("ROUTING_CACHE_THRESHOLD", "0.85"))
+ROUTING_CACHE_VERIFY_RATE = float(os.getenv("ROUTING_CACHE_VERIFY_RATE", "0.05"))
+ROUTING_CACHE_PATH = Path(os.getenv(
+    "ROUTING_CACHE_PATH",
+    str(Path(__file__).parent.parent.parent / "data" / ".cache" / "routing_cache.json")
+))
+
+# Bump when the routing prompt or ToolSelection schema changes: cached
+# decisions made under the old prompt are then discarded on load
+ROUTING_PROMPT_VERSION = 1
+
+# Persistence file layout version
+CACHE_FORMAT = 1
+
+# Hashed feature space (2^20 buckets) and bigram weight relative to unigrams
+FEATURE_BUCKETS = 1 << 20
+BIGRAM_WEIGHT = 0.5
+
+STOP_WORDS = {
+    "a", "about", "am", "an", "and", "any", "are", "be", "been", "can", "could",
+    "current", "currently", "d", "did", "do", "does", "for", "from", "get", "give",
+    "has", "have", "hello", "hey", "hi", "how", "i", "im", "is", "it", "know", "let",
+    "like", "ll", "m", "many", "me", "mine", "much", "my", "need", "of", "on", "or",
+    "please", "re", "s", "see", "show", "so", "t", "tell", "thank", "thanks", "that",
+    "the", "there", "this", "to", "u", "ve", "want", "was", "we", "were", "what",
+    "whats", "which", "will", "with", "would", "you", "your",
+}
+
+# Placeholder for a service mention
+SERVICE_TOKEN = "<service>"
+
+# Lemmas that name a claim status, mapped to the status
+STATUS_TERMS = {
+    "pend": "pending", "pending": "pending", "outstand": "pending", "outstanding": "pending",
+    "approv": "approved", "approval": "approved",
+    "deny": "denied", "denial": "denied", "reject": "denied",
+}
+
+# Lemmas that ask for a time range
+TIME_TERMS = {
+    "today", "yesterday", "week", "month", "year", "ytd", "last", "since", "before",
+    "after", "between", "recent", "recently", "latest", "past", "ago",
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december",
+}
+
+# Irregular forms the suffix rules get wrong
+IRREGULAR_LEMMAS = {"paid": "paid", "covered": "cover"}
+
+
+# ============================================================================
+# Question Signature
+# ============================================================================
+
+def lemmatize(token: str) -> str:
+    """Reduce a token to a crude lemma with a few suffix rules ("claims" → "claim")."""
+    if token in IRREGULAR_LEMMAS:
+        return IRREGULAR_LEMMAS[token]
+    if len(token) > 4 and token.endswith(("ies", "ied")):
+        return token[:-3] + "y"
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 4 and token.endswith("ed"):
+        return token[:-2] if not token.endswith("eed") else token[:-1]
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+class Signature(NamedTuple):
+    """Normalized form of a question used as the cache key."""
+    text: str
+    guard: FrozenSet[str]
+    vector: Dict[int, float]
+
+
+def _feature(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8")) % FEATURE_BUCKETS
+
+
+def _mask_services(tokens: List[str]) -> List[str]:
+    """Replace each service mention found by the service index with SERVICE_TOKEN."""
+    try:
+        terms = {tuple(match.term.split()) for match in find_services(" ".join(tokens))}
+    except RuntimeError:
+        # Data not loaded (offline tooling): no service detection
+        return tokens
+    masked: List[str] = []
+    i = 0
+    while i < len(tokens):
+        for term in sorted(terms, key=len, reverse=True):
+            if tuple(tokens[i:i + len(term)]) == term:
+                masked.append(SERVICE_TOKEN)
+                i += len(term)
+                break
+        else:
+            masked.append(tokens[i])
+            i += 1
+    return masked
+
+
+def question_signature(question: str) -> Signature:
+    """
+    Compute the signature of a question.
+
+    Args:
+        question: The member's question
+
+    Returns:
+        Signature: Normalized text, exact-match guard terms and hashed n-gram vector
+    """
+    lemmas = [
+        token if token == SERVICE_TOKEN else lemmatize(token)
+        for token in _mask_services(tokenize(question))
+        if token not in STOP_WORDS
+    ]
+    return _signature(lemmas)
+
+
+def _signature(lemmas: List[str]) -> Signature:
+    guard: Set[str] = {"services" if SERVICE_TOKEN in lemmas else "no_services"}
+    for lemma in lemmas:
+        if lemma in STATUS_TERMS:
+            guard.add(f"status:{STATUS_TERMS[lemma]}")
+        elif lemma in TIME_TERMS or any(char.isdigit() for char in lemma):
+            guard.add(f"time:{lemma}")
+
+    vector: Dict[int, float] = {}
+    for lemma in lemmas:
+        key = _feature(lemma)
+        vector[key] = vector.get(key, 0.0) + 1.0
+    for first, second in zip(lemmas, lemmas[1:]):
+        key = _feature(f"{first} {second}")
+        vector[key] = vector.get(key, 0.0) + BIGRAM_WEIGHT
+    norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+    vector = {key: weight / norm for key, weight in vector.items()}
+
+    return Signature(" ".join(lemmas), frozenset(guard), vector)
+
+
+def _similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(key, 0.0) for key, weight in a.items())
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class _Entry:
+    __slots__ = ("signature", "decision", "hits")
+
+    def __init__(self, signature: Signature, decision: Dict[str, Any], hits: int = 0):
+        self.signature = signature
+        self.decision = decision
+        self.hits = hits
+
+
+class RoutingCache:
+    """
+    LRU cache of routing decisions with nearest-neighbor lookup.
+
+    Decisions are plain dicts: {"tools": [...], "claim_status_filter": "all"}.
+
+    Attributes:
+        max_entries: Max cached decisions (0 disables the cache)
+        threshold: Min cosine similarity for a near hit
+        verify_rate: Share of hits that are still checked with the LLM
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ROUTING_CACHE_SIZE,
+        threshold: float = ROUTING_CACHE_THRESHOLD,
+        verify_rate: float = ROUTING_CACHE_VERIFY_RATE
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.verify_rate = verify_rate
+        self._entries: "OrderedDict[Tuple[str, FrozenSet[str]], _Entry]" = OrderedDict()
+        # Unigram feature → keys of entries containing it (nearest-neighbor candidates)
+        self._postings: Dict[int, Set[Tuple[str, FrozenSet[str]]]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._counts = {
+            "lookups": 0, "exact_hits": 0, "near_hits": 0, "misses": 0, "inserts": 0,
+            "evictions": 0, "verified": 0, "disagreements": 0, "loaded": 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _unigrams(signature: Signature) -> List[int]:
+        return [_feature(lemma) for lemma in set(signature.text.split())]
+
+    def _find(self, signature: Signature) -> Tuple[Optional[_Entry], float]:
+        """Best entry for a signature and its similarity (caller holds the lock)."""
+        exact = self._entries.get((signature.text, signature.guard))
+        if exact is not None:
+            return exact, 1.0
+        candidates: Set[Tuple[str, FrozenSet[str]]] = set()
+        for feature in self._unigrams(signature):
+            candidates.update(self._postings.get(feature, ()))
+        best, best_score = None, 0.0
+        for key in candidates:
+            if key[1] != signature.guard:
+                continue
+            entry = self._entries[key]
+            score = _similarity(signature.vector, entry.signature.vector)
+            if score > best_score:
+                best, best_score = entry, score
+        return best, best_score
+
+    def lookup(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached routing decision for a question, or None on a miss.
+
+        Args:
+            question: The member's question
+
+        Returns:
+            dict: {"decision": {...}, "similarity": float, "matched": normalized text,
+                   "verify": bool (also ask the LLM and compare)} or None
+        """
+        if not self.enabled:
+            return None
+        signature = question_signature(question)
+        if not signature.text:
+            return None
+        with self._lock:
+            self._counts["lookups"] += 1
+            entry, score = self._find(signature)
+            if entry is None or score < self.threshold:
+                self._counts["misses"] += 1
+                return None
+            self._counts["exact_hits" if score >= 1.0 else "near_hits"] += 1
+            entry.hits += 1
+            self._entries.move_to_end((entry.signature.text, entry.signature.guard))
+            return {
+                "decision": dict(entry.decision),
+                "similarity": round(score, 3),
+                "matched": entry.signature.text,
+                "verify": random.random() < self.verify_rate
+            }
+
+    def record(self, question: str, decision: Dict[str, Any], verified: bool = False) -> bool:
+        """
+        Store the LLM's routing decision for a question.
+
+        Args:
+            question: The member's question
+            decision: {"tools": [...], "claim_status_filter": ...}
+            verified: True if this decision re-checks a cache hit
+
+        Returns:
+            bool: True if the LLM disagreed with a cached decision for this question
+        """
+        if not self.enabled:
+            return False
+        signature = question_signature(question)
+        if not signature.text:
+            return False
+        decision = {"tools": list(decision["tools"]), "claim_status_filter": decision.get("claim_status_filter") or "all"}
+        with self._lock:
+            entry, score = self._find(signature)
+            disagrees = entry is not None and score >= self.threshold and entry.decision != decision
+            if verified:
+                self._counts["verified"] += 1
+            if disagrees:
+                self._counts["disagreements"] += 1
+            if disagrees and score < 1.0:
+                # The neighbor's decision is wrong for questions like this one
+                self._remove((entry.signature.text, entry.signature.guard))
+            self._insert(signature, decision)
+            return disagrees
+
+    def _insert(self, signature: Signature, decision: Dict[str, Any], hits: int = 0) -> None:
+        key = (signature.text, signature.guard)
+        existing = self._entries.get(key)
+        if existing is not None:
+            existing.decision = decision
+            self._entries.move_to_end(key)
+        else:
+            self._entries[key] = _Entry(signature, decision, hits)
+            for feature in self._unigrams(signature):
+                self._postings.setdefault(feature, set()).add(key)
+            self._counts["inserts"] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._counts["evictions"] += 1
+        self._dirty = True
+
+    def _remove(self, key: Tuple[str, FrozenSet[str]]) -> None:
+        entry = self._entries.pop(key)
+        for feature in self._unigrams(entry.signature):
+            keys = self._postings.get(feature)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[feature]
+
+    # ------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------
+
+    def load(self, path: Path, fingerprint: str) -> int:
+        """
+        Load persisted decisions, skipping the file if it was written for another
+        routing model or prompt version.
+
+        Returns:
+            int: Number of decisions loaded
+        """
+        if not self.enabled or not path.exists():
+            return 0
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Routing cache ignored ({path.name} unreadable: {e})")
+            return 0
+        if payload.get("format") != CACHE_FORMAT or payload.get("fingerprint") != fingerprint:
+            print("⚪ Routing cache discarded (routing model or prompt changed)")
+            return 0
+        with self._lock:
+            for item in payload.get("entries", []):
+                signature = _signature(item["lemmas"])
+                self._insert(signature, item["decision"], item.get("hits", 0))
+            self._counts["loaded"] = len(self._entries)
+            self._dirty = False
+            return len(self._entries)
+
+    def save(self, path: Path, fingerprint: str) -> bool:
+        """
+        Write the cached decisions to path (atomically) if they changed since the last save.
+
+        Returns:
+            bool: True if the file was written
+
+        Raises:
+            OSError: If the file can't be written (the decisions stay marked
+                     as changed, so the next save retries)
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            entries = [
+                {
+                    # Only the normalized lemmas are stored, never the member's wording
+                    "lemmas": entry.signature.text.split(),
+                    "decision": entry.decision,
+                    "hits": entry.hits
+                }
+                for entry in self._entries.values()
+            ]
+            self._dirty = False
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_text(
+                json.dumps({"format": CACHE_FORMAT, "fingerprint": fingerprint, "saved_at": time.time(), "entries": entries}),
+                encoding="utf-8"
+            )
+            os.replace(tmp_path, path)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+            raise
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entries, hits (exact / near), misses, hit rate, verified hits and
+                  the share of them where the LLM disagreed
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            entries = len(self._entries)
+        hits = counts["exact_hits"] + counts["near_hits"]
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            **counts,
+            "hits": hits,
+            "hit_rate": round(hits / counts["lookups"], 3) if counts["lookups"] else 0.0,
+            "disagreement_rate": round(counts["disagreements"] / counts["verified"], 3) if counts["verified"] else 0.0
+        }
+
+
+# Process-wide cache shared by every session
+routing_cache = RoutingCache()
+
+
+def _fingerprint() -> str:
+    # Imported here: the registry pulls in the Ollama client
+    from app.llm.registry import get_model_config
+    return f"{get_model_config('routing').model}|prompt-v{ROUTING_PROMPT_VERSION}"
+
+
+def load_routing_cache() -> int:
+    """Load persisted routing decisions from ROUTING_CACHE_PATH (at startup)."""
+    count = routing_cache.load(ROUTING_CACHE_PATH, _fingerprint())
+    if count:
+        print(f"🧭 Loaded {count} cached routing decisions")
+    return count
+
+
+def save_routing_cache() -> bool:
+    """
+    Persist routing decisions to ROUTING_CACHE_PATH if they changed.
+
+    Write errors (read-only filesystem, disk full, permissions) are logged
+    and the save is retried on the next call; they never propagate, so the
+    periodic cleanup task and shutdown keep going.
+
+    Returns:
+        bool: True if the file was written
+    """
+    if not routing_cache.enabled:
+        return False
+    try:
+        return routing_cache.save(ROUTING_CACHE_PATH, _fingerprint())
+    except OSError as e:
+        print(f"⚠️  Could not save routing cache to {ROUTING_CACHE_PATH}: {e}")
+        return False
+
+
+def get_routing_cache_stats() -> Dict[str, Any]:
+    """Get routing decision cache statistics (see RoutingCache.stats)."""
+    return routing_cache.stats()
@@ -6,7 +6,7 @@ State is the core of LangGraph - it's how data is passed between nodes and persi
 across the conversation.
 """
 
-from typing import TypedDict, List, Optional, Annotated
+from typing import Any, Mapping, TypedDict, List, Optional, Annotated
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
@@ -31,6 +31,8 @@ class ConversationState(TypedDict):
 
         user_profile: Full user data loaded from user_profiles.json.
                       Contains insurance plan, coverage details, deductible info, etc.
+                      The shared, read-only User record from the data layer (a dict
+                      after a session round-trip through a persistent store).
 
         tool_results: Results from tool calls (coverage_lookup, benefit_verify, claims_status).
                       Stored here so generate_response can access them.
@@ -44,6 +46,10 @@ class ConversationState(TypedDict):
         execution_trace: List of trace entries showing graph execution flow.
                         Each entry contains: node name, timestamp, action, LLM calls, state changes.
                         Used for learning visibility - shows exactly how the graph executes.
+
+        member_briefing: Compact summary of the member's plan and claims, prepared in
+                         the background after identification (see briefing.py) and
+                         included in every later response prompt.
     """
 
     # Message history with automatic appending behavior
@@ -53,7 +59,7 @@ class ConversationState(TypedDict):
 
     # User identification and profile data
     user_id: Optional[str]
-    user_profile: Optional[dict]
+    user_profile: Optional[Mapping[str, Any]]
 
     # Tool results from current turn - now supports multiple tools
     # Dictionary mapping tool names to their results
@@ -74,3 +80,7 @@ class ConversationState(TypedDict):
     # Flag to indicate this is the first greeting after user identification
     # When True, skip orchestrate_tools and go straight to END
     first_greeting: Optional[bool]
+
+    # Compact member briefing (plan, deductible, claims) prepared in the
+    # background after identification; part of the per-user prompt layer
+    member_briefing: Optional[str]
@@ -0,0 +1,181 @@
+"""
+Execution Trace Levels and Sampling for CARE Assistant.
+
+Every graph node appends entries to the conversation's execution_trace, which
+the observability UI shows next to the chat. Building those entries costs
+time on every turn and the entries stay in the session, yet the UI only needs
+detailed traces for a fraction of sessions. This module decides how much of
+each turn is traced:
+
+    off      no entries at all
+    summary  node, time and action only
+    full     summary plus each entry's details (prompts, tool arguments,
+             routing decisions, the identified profile, ...)
+
+The level is set globally (TRACE_LEVEL) and can be overridden per request
+(ChatRequest.trace_level). Full traces are head-sampled: when the global level
+is "full", only TRACE_SAMPLE_RATE of sessions get full traces and the rest
+get summaries. The decision is made once per session (a hash of the session
+id), so a sampled conversation is traced in full on every turn. An explicit
+per-request level is not sampled.
+
+Entries are cheap to record:
+- The timestamp is stored as a float and formatted to ISO 8601 only when the
+  trace is serialized (format_trace_timestamp).
+- Details are stored by reference, never copied; values in them must not be
+  mutated afterwards (profiles and tool results are immutable records or
+  fresh dicts, so nodes pass them as they are).
+- Details can be passed as a zero-argument callable, which is only called at
+  the full level, so summaries never build them.
+
+Configuration:
+    TRACE_LEVEL         "off", "summary" or "full" (default full)
+    TRACE_SAMPLE_RATE   share of sessions traced in full at the full level (default 1.0)
+
+Usage:
+    with trace_scope(request.trace_level, session_id):
+        result = await agent.ainvoke(state)
+"""
+
+import os
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Union
+
+
+TRACE_LEVELS = ("off", "summary", "full")
+
+TRACE_LEVEL = os.getenv("TRACE_LEVEL", "full").lower()
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+
+if TRACE_LEVEL not in TRACE_LEVELS:
+    raise ValueError(f"Unknown TRACE_LEVEL: {TRACE_LEVEL!r} (expected one of {', '.join(TRACE_LEVELS)})")
+
+# Level of the current turn; outside a trace_scope() the global level applies
+_level: ContextVar[Optional[str]] = ContextVar("trace_level", default=None)
+
+_STATS: Dict[str, int] = {"off": 0, "summary": 0, "full": 0, "sampled_out": 0, "entries": 0}
+
+
+# ============================================================================
+# Level Selection
+# ============================================================================
+
+def _sampled(session_id: Optional[str]) -> bool:
+    """Head-sampling decision for a session (stable for the session's lifetime)."""
+    if TRACE_SAMPLE_RATE >= 1:
+        return True
+    if TRACE_SAMPLE_RATE <= 0:
+        return False
+    if session_id is None:
+        return False
+    return zlib.crc32(session_id.encode("utf-8")) / 0xFFFFFFFF < TRACE_SAMPLE_RATE
+
+
+def resolve_trace_level(requested: Optional[str] = None, session_id: Optional[str] = None) -> str:
+    """
+    Trace level for a turn.
+
+    Args:
+        requested: Level asked for by the request (None: use TRACE_LEVEL with sampling)
+        session_id: Session of the turn, the key for head sampling
+
+    Returns:
+        str: One of TRACE_LEVELS
+
+    Raises:
+        ValueError: If requested is not a known level
+    """
+    if requested is not None:
+        if requested not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level: {requested!r}")
+        return requested
+    if TRACE_LEVEL == "full" and not _sampled(session_id):
+        _STATS["sampled_out"] += 1
+        return "summary"
+    return TRACE_LEVEL
+
+
+@contextmanager
+def trace_scope(requested: Optional[str] = None, session_id: Optional[str] = None):
+    """
+    Trace every graph node inside the scope at one level (see resolve_trace_level).
+
+    Yields:
+        str: The level in effect
+    """
+    level = resolve_trace_level(requested, session_id)
+    _STATS[level] += 1
+    token = _level.set(level)
+    try:
+        yield level
+    finally:
+        _level.reset(token)
+
+
+def current_trace_level() -> str:
+    """Level set by the innermost trace_scope(), or TRACE_LEVEL outside any scope."""
+    return _level.get() or TRACE_LEVEL
+
+
+# ============================================================================
+# Entries
+# ============================================================================
+
+Details = Union[Dict[str, Any], Callable[[], Dict[str, Any]], None]
+
+
+def make_trace_entry(node_name: str, action: str, details: Details = None) -> Optional[Dict[str, Any]]:
+    """
+    Build one trace entry at the current level.
+
+    Args:
+        node_name: Name of the node being executed
+        action: Description of what the node is doing
+        details: Extra information, or a callable returning it (only called
+                 at the full level). Stored by reference.
+
+    Returns:
+        dict: The entry, or None when tracing is off
+    """
+    level = current_trace_level()
+    if level == "off":
+        return None
+    entry = {"node": node_name, "ts": time.time(), "action": action}
+    if level == "full" and details:
+        entry["details"] = details() if callable(details) else details
+    _STATS["entries"] += 1
+    return entry
+
+
+def format_trace_timestamp(entry: Dict[str, Any]) -> str:
+    """
+    ISO 8601 timestamp of a trace entry, formatted for serialization.
+
+    Entries written before timestamps were stored as floats carry an ISO
+    string already and are returned as they are.
+    """
+    ts = entry.get("ts")
+    if ts is None:
+        return entry.get("timestamp", "")
+    return datetime.fromtimestamp(ts).isoformat()
+
+
+def get_trace_stats() -> Dict[str, Any]:
+    """
+    Get trace level statistics.
+
+    Returns:
+        dict: Configured level and sample rate, turns traced at each level,
+              turns downgraded to summary by sampling, and entries recorded
+    """
+    return {
+        "level": TRACE_LEVEL,
+        "sample_rate": TRACE_SAMPLE_RATE,
+        "turns": {level: _STATS[level] for level in TRACE_LEVELS},
+        "sampled_out": _STATS["sampled_out"],
+        "entries": _STATS["entries"]
+    }
@@ -0,0 +1,3 @@
+"""
+LLM client management: per-purpose model registry and call statistics.
+"""
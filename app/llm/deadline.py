@@ -0,0 +1,181 @@
+"""
+Request Deadlines and Cancellation Accounting for CARE Assistant.
+
+Every chat turn runs under a deadline: an absolute point in time by which the
+answer must be ready. The deadline is stored in a context variable, so it
+follows the turn through LangGraph nodes, asyncio tasks and worker threads
+without being threaded through every function signature.
+
+Each stage (LLM call or tool) gets a timeout derived from the budget that is
+left when it starts:
+- extraction / routing: a share of the remaining budget, so a slow
+  classification call can't eat the time the answer needs
+- tools: a share of the remaining budget
+- response: whatever is left
+
+When a stage runs out of time its awaitable is cancelled (for LLM calls this
+closes the HTTP request, which stops the Ollama generation) and
+DeadlineExceeded is raised.
+
+Configuration:
+    CHAT_DEADLINE_SECONDS   default budget for one chat turn (default 120)
+
+Usage:
+    with deadline_scope(30):
+        result = await run_with_deadline(llm.ainvoke(prompt), "routing")
+"""
+
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Optional
+
+
+# Default budget for one chat turn, in seconds
+CHAT_DEADLINE_SECONDS = float(os.getenv("CHAT_DEADLINE_SECONDS", "120"))
+
+# Fraction of the remaining budget each stage may use
+STAGE_BUDGET_SHARES: Dict[str, float] = {
+    "extraction": 0.5,
+    "routing": 0.3,
+    "tools": 0.3,
+    "response": 1.0,
+}
+
+# Absolute deadline (time.monotonic()) of the current turn, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("chat_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage of a chat turn runs past the turn's deadline."""
+
+    def __init__(self, stage: str, budget_seconds: float):
+        self.stage = stage
+        self.budget_seconds = budget_seconds
+        super().__init__(f"Deadline exceeded during {stage} (budget {budget_seconds:.2f}s)")
+
+
+# ============================================================================
+# Deadline Scope
+# ============================================================================
+
+@contextmanager
+def deadline_scope(seconds: Optional[float] = None):
+    """
+    Run the enclosed code under a deadline.
+
+    Tasks created inside the scope inherit the deadline (asyncio copies the
+    current context into new tasks and asyncio.to_thread workers).
+
+    Args:
+        seconds: Budget in seconds. Defaults to CHAT_DEADLINE_SECONDS.
+    """
+    budget = CHAT_DEADLINE_SECONDS if seconds is None else seconds
+    token = _deadline.set(time.monotonic() + budget)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    """
+    Get the budget left for the current turn.
+
+    Returns:
+        float: Seconds until the deadline (never negative), or None outside a deadline scope
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def stage_timeout(stage: str) -> Optional[float]:
+    """
+    Get the timeout for a stage starting now.
+
+    Args:
+        stage: Stage name (see STAGE_BUDGET_SHARES; unknown stages get the full remainder)
+
+    Returns:
+        float: Timeout in seconds, or None if there is no deadline
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return None
+    return remaining * STAGE_BUDGET_SHARES.get(stage, 1.0)
+
+
+async def run_with_deadline(awaitable: Awaitable[Any], stage: str) -> Any:
+    """
+    Await something under the stage's share of the remaining budget.
+
+    On timeout the awaitable is cancelled and the timeout is counted.
+
+    Args:
+        awaitable: Coroutine or task to await
+        stage: Stage name, used for the timeout share and metrics
+
+    Returns:
+        The awaitable's result
+
+    Raises:
+        DeadlineExceeded: If the stage timeout elapses first
+    """
+    timeout = stage_timeout(stage)
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    except asyncio.TimeoutError:
+        record_timeout(stage)
+        raise DeadlineExceeded(stage, timeout) from None
+
+
+# ============================================================================
+# Cancellation Metrics
+# ============================================================================
+
+_STATS: Dict[str, Any] = {
+    "client_disconnects": 0,
+    "cancelled_runs": 0,
+    "deadline_exceeded": 0,
+    "stage_timeouts": {},
+}
+
+
+def record_timeout(stage: str) -> None:
+    """Count a stage that ran out of budget."""
+    _STATS["stage_timeouts"][stage] = _STATS["stage_timeouts"].get(stage, 0) + 1
+
+
+def record_cancellation(reason: str) -> None:
+    """
+    Count a chat turn that was stopped before it finished.
+
+    Args:
+        reason: "client_disconnect" or "deadline_exceeded"
+    """
+    _STATS["cancelled_runs"] += 1
+    if reason == "client_disconnect":
+        _STATS["client_disconnects"] += 1
+    elif reason == "deadline_exceeded":
+        _STATS["deadline_exceeded"] += 1
+
+
+def get_cancellation_stats() -> Dict[str, Any]:
+    """
+    Get cancellation and timeout counters.
+
+    Returns:
+        dict: cancelled_runs, client_disconnects, deadline_exceeded,
+              stage_timeouts (per stage) and the default budget
+    """
+    return {
+        **_STATS,
+        "stage_timeouts": dict(_STATS["stage_timeouts"]),
+        "default_deadline_seconds": CHAT_DEADLINE_SECONDS,
+    }
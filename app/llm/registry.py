@@ -0,0 +1,278 @@
+"""
+Per-Purpose Model Registry for CARE Assistant.
+
+Each LLM call in the graph has a purpose, and each purpose can use its own
+model and generation parameters:
+- extraction: pull the member's name out of their reply (identify_user)
+- routing: choose which tools to call (orchestrate_tools)
+- response: write the answer (generate_response)
+- background: low-priority work such as member briefings
+
+Classification purposes default to temperature 0 and small output caps, so a
+tiny model can handle routing and extraction while a larger one answers.
+
+Configuration (later sources override earlier ones):
+1. Built-in defaults (below)
+2. JSON file named by MODEL_REGISTRY_FILE, e.g.
+       {"routing": {"model": "llama3.2:1b", "num_predict": 64},
+        "response": {"model": "llama3.1:8b", "num_ctx": 8192}}
+3. Environment variables:
+       LLM_MODEL                      default model for every purpose
+       LLM_<PURPOSE>_MODEL            e.g. LLM_ROUTING_MODEL=llama3.2:1b
+       LLM_<PURPOSE>_TEMPERATURE
+       LLM_<PURPOSE>_NUM_CTX
+       LLM_<PURPOSE>_NUM_PREDICT
+       LLM_<PURPOSE>_KEEP_ALIVE       e.g. "30m"
+
+Usage:
+    from app.llm.registry import get_llm
+    response = await get_llm("response").ainvoke(messages)
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_ollama import ChatOllama
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+@dataclass
+class ModelConfig:
+    """
+    Model name and generation parameters for one purpose.
+
+    Attributes:
+        model: Ollama model name
+        temperature: Sampling temperature
+        num_ctx: Context window size (None = Ollama default)
+        num_predict: Maximum tokens to generate (None = no cap)
+        keep_alive: How long Ollama keeps the model loaded (e.g. "30m")
+    """
+    model: str = "llama3.2"
+    temperature: float = 0.7
+    num_ctx: Optional[int] = None
+    num_predict: Optional[int] = None
+    keep_alive: Optional[str] = None
+
+
+PURPOSES = ("extraction", "routing", "response", "background")
+
+DEFAULT_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "extraction": {"temperature": 0, "num_predict": 64},
+    "routing": {"temperature": 0, "num_predict": int(os.getenv("ROUTER_NUM_PREDICT", "96"))},
+    "response": {"temperature": 0.7},  # Moderate creativity for conversational responses
+    "background": {"temperature": 0.3, "num_predict": 256},
+}
+
+_ENV_CASTS = {"temperature": float, "num_ctx": int, "num_predict": int, "model": str, "keep_alive": str}
+
+
+def load_model_configs() -> Dict[str, ModelConfig]:
+    """
+    Build the configuration for every purpose from defaults, file and env.
+
+    Returns:
+        dict: Maps purpose to ModelConfig
+
+    Raises:
+        ValueError: If the registry file names an unknown purpose or field
+    """
+    file_configs: Dict[str, Dict[str, Any]] = {}
+    registry_file = os.getenv("MODEL_REGISTRY_FILE")
+    if registry_file:
+        with open(Path(registry_file), "r", encoding="utf-8") as f:
+            file_configs = json.load(f)
+        unknown = set(file_configs) - set(PURPOSES)
+        if unknown:
+            raise ValueError(f"Unknown purpose(s) in {registry_file}: {', '.join(sorted(unknown))}")
+
+    known_fields = {f.name for f in fields(ModelConfig)}
+    configs = {}
+    for purpose in PURPOSES:
+        values: Dict[str, Any] = {"model": os.getenv("LLM_MODEL", ModelConfig.model)}
+        values.update(DEFAULT_CONFIGS.get(purpose, {}))
+        values.update(file_configs.get(purpose, {}))
+
+        for name, cast in _ENV_CASTS.items():
+            raw = os.getenv(f"LLM_{purpose.upper()}_{name.upper()}")
+            if raw:
+                values[name] = cast(raw)
+
+        bad = set(values) - known_fields
+        if bad:
+            raise ValueError(f"Unknown model setting(s) for '{purpose}': {', '.join(sorted(bad))}")
+        configs[purpose] = ModelConfig(**values)
+
+    return configs
+
+
+# ============================================================================
+# Per-Purpose Statistics
+# ============================================================================
+
+class PurposeStats(BaseCallbackHandler):
+    """
+    Callback handler that records call counts, latency and token counts for one purpose.
+
+    Attached to the purpose's client, so it also sees calls made through
+    with_structured_output() wrappers.
+    """
+
+    # Counters only; run in the caller's thread/event loop instead of an executor
+    run_inline = True
+
+    def __init__(self, purpose: str):
+        self.purpose = purpose
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs) -> None:
+        self._finish(run_id)
+        for generations in response.generations:
+            for generation in generations:
+                meta = getattr(getattr(generation, "message", None), "response_metadata", None) or {}
+                self.prompt_tokens += meta.get("prompt_eval_count") or 0
+                self.output_tokens += meta.get("eval_count") or 0
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        self._finish(run_id)
+        self.errors += 1
+
+    def _finish(self, run_id: UUID) -> None:
+        started = self._started.pop(run_id, None)
+        self.calls += 1
+        if started is not None:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.total_ms += elapsed
+            self.max_ms = max(self.max_ms, elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters as a plain dict."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": len(self._started),
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0,
+            "max_ms": round(self.max_ms, 1),
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+_CONFIGS: Optional[Dict[str, ModelConfig]] = None
+_CLIENTS: Dict[str, Any] = {}
+
+# Client each prefill copy was made from (rebuilt after override_llm)
+_PREFILL_SOURCES: Dict[str, Any] = {}
+
+_STATS: Dict[str, PurposeStats] = {purpose: PurposeStats(purpose) for purpose in PURPOSES}
+
+
+def get_model_config(purpose: str) -> ModelConfig:
+    """
+    Get the configuration for a purpose.
+
+    Raises:
+        KeyError: If the purpose is unknown
+    """
+    global _CONFIGS
+    if _CONFIGS is None:
+        _CONFIGS = load_model_configs()
+    return _CONFIGS[purpose]
+
+
+def get_llm(purpose: str):
+    """
+    Get the shared chat model client for a purpose, creating it on first use.
+
+    Args:
+        purpose: One of PURPOSES
+
+    Returns:
+        ChatOllama: Client configured for the purpose (or a test override)
+
+    Raises:
+        KeyError: If the purpose is unknown
+    """
+    client = _CLIENTS.get(purpose)
+    if client is None:
+        config = get_model_config(purpose)
+        kwargs = {k: v for k, v in asdict(config).items() if v is not None}
+        client = ChatOllama(**kwargs, callbacks=[_STATS[purpose]])
+        _CLIENTS[purpose] = client
+    return client
+
+
+def get_prefill_llm(purpose: str):
+    """
+    Get a purpose's client capped at one output token, for prompt warm-ups.
+
+    Same model and parameters as get_llm(purpose), so a prompt sent through it
+    leaves its prefix in the server's KV cache for the real call.
+
+    Args:
+        purpose: One of PURPOSES
+
+    Returns:
+        ChatOllama: Copy of the purpose's client with num_predict=1 (test
+                    overrides without num_predict are returned unchanged)
+    """
+    client = get_llm(purpose)
+    key = f"{purpose}:prefill"
+    prefill = _CLIENTS.get(key)
+    if prefill is None or _PREFILL_SOURCES.get(key) is not client:
+        prefill = client.model_copy(update={"num_predict": 1}) if hasattr(client, "num_predict") else client
+        _CLIENTS[key] = prefill
+        _PREFILL_SOURCES[key] = client
+    return prefill
+
+
+def override_llm(purpose: str, client: Any) -> None:
+    """
+    Replace the client for a purpose (used by benchmarks and tests to install stub models).
+
+    Args:
+        purpose: One of PURPOSES
+        client: Any LangChain chat model (or compatible object)
+    """
+    if purpose not in PURPOSES:
+        raise KeyError(purpose)
+    _CLIENTS[purpose] = client
+
+
+def get_llm_stats() -> Dict[str, Any]:
+    """
+    Get per-purpose configuration and call statistics.
+
+    Returns:
+        dict: For each purpose: model settings, calls, errors, latency, tokens
+              and the purpose's share of all calls
+    """
+    total_calls = sum(stats.calls for stats in _STATS.values())
+    report = {}
+    for purpose in PURPOSES:
+        snapshot = _STATS[purpose].snapshot()
+        snapshot["share_of_calls"] = round(snapshot["calls"] / total_calls, 3) if total_calls else 0
+        report[purpose] = {"config": asdict(get_model_config(purpose)), **snapshot}
+    return report
@@ -0,0 +1,313 @@
+"""
+Priority Admission Scheduler for LLM Calls.
+
+Ollama serves a limited number of generations at once. Without admission
+control, short latency-critical calls (name extraction, tool routing) queue
+behind long answer generations and batch jobs in plain arrival order.
+
+Every LLM call is admitted through this scheduler first:
+- At most LLM_MAX_CONCURRENCY calls run at once.
+- Waiting calls are served by priority class:
+      interactive  extraction and routing (short, the user is waiting)
+      response     answer generation
+      background   batch turns, summaries, prefetch
+- Within a class, sessions take turns (round-robin), so one busy session
+  can't fill the queue for everyone else.
+- Aging: every LLM_AGING_SECONDS a call has waited lifts it one class, and
+  calls of the same effective class are served oldest first, so a call that
+  has aged up to "interactive" goes ahead of newer interactive calls and
+  background work is never starved indefinitely.
+
+Queue wait per class is exposed through get_scheduler_stats().
+
+Configuration:
+    LLM_MAX_CONCURRENCY   concurrent LLM calls (default 2)
+    LLM_AGING_SECONDS     wait after which a call moves up one class (default 5)
+
+Usage:
+    with session_scope(session_id):
+        result = await scheduled("routing", router.ainvoke(messages))
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Deque, Dict, Optional
+
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+LLM_AGING_SECONDS = float(os.getenv("LLM_AGING_SECONDS", "5"))
+
+# Priority classes, highest first
+PRIORITY_CLASSES = ("interactive", "response", "background")
+
+# Default class for each model registry purpose
+PURPOSE_CLASSES = {
+    "extraction": "interactive",
+    "routing": "interactive",
+    "response": "response",
+    "background": "background",
+}
+
+# Session the current task works for (round-robin key)
+_session: ContextVar[Optional[str]] = ContextVar("llm_session", default=None)
+
+# Forces every call in scope into one class (e.g. batch turns run as background)
+_class_override: ContextVar[Optional[str]] = ContextVar("llm_class_override", default=None)
+
+
+@contextmanager
+def session_scope(session_id: Optional[str]):
+    """Attribute LLM calls made inside the scope to a session."""
+    token = _session.set(session_id)
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+
+def current_session() -> Optional[str]:
+    """Session id set by the innermost session_scope(), or None."""
+    return _session.get()
+
+
+@contextmanager
+def priority_scope(priority_class: str):
+    """
+    Run every LLM call inside the scope in one priority class.
+
+    Args:
+        priority_class: One of PRIORITY_CLASSES
+
+    Raises:
+        ValueError: If the class is unknown
+    """
+    if priority_class not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {priority_class}")
+    token = _class_override.set(priority_class)
+    try:
+        yield
+    finally:
+        _class_override.reset(token)
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+class _Waiter:
+    """A call waiting for admission."""
+    __slots__ = ("future", "priority_class", "enqueued_at")
+
+    def __init__(self, future: "asyncio.Future", priority_class: str):
+        self.future = future
+        self.priority_class = priority_class
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionScheduler:
+    """
+    Admits LLM calls by priority class, with per-session round-robin and aging.
+
+    Args:
+        max_concurrency: Maximum calls running at once
+        aging_seconds: Wait after which a queued call is treated as one class
+                       higher (0 disables aging)
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, aging_seconds: float = LLM_AGING_SECONDS):
+        self.max_concurrency = max(1, max_concurrency)
+        self.aging_seconds = aging_seconds
+        self.in_flight = 0
+        # class -> session -> FIFO of waiters; sessions rotate to the back when served
+        self._queues: Dict[str, "OrderedDict[Optional[str], Deque[_Waiter]]"] = {
+            name: OrderedDict() for name in PRIORITY_CLASSES
+        }
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: {"admitted": 0, "total_wait_ms": 0.0, "max_wait_ms": 0.0, "aged": 0}
+            for name in PRIORITY_CLASSES
+        }
+
+    async def acquire(self, priority_class: str, session_id: Optional[str] = None) -> None:
+        """
+        Wait until the call may run.
+
+        Raises:
+            asyncio.CancelledError: If the caller is cancelled while queued
+        """
+        if self.in_flight < self.max_concurrency and not self.waiting():
+            self.in_flight += 1
+            self._record(priority_class, 0.0, aged=False)
+            return
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority_class)
+        self._queues[priority_class].setdefault(session_id, deque()).append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as we were cancelled: hand the slot on
+                self.release()
+            else:
+                self._remove(waiter, session_id)
+            raise
+
+    def release(self) -> None:
+        """Free a slot and admit the next waiter(s)."""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._dispatch()
+
+    def waiting(self) -> int:
+        """Number of queued calls."""
+        return sum(len(q) for sessions in self._queues.values() for q in sessions.values())
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.max_concurrency:
+            picked = self._pick()
+            if picked is None:
+                return
+            priority_class, session_id, waiter = picked
+            waited_ms = (time.monotonic() - waiter.enqueued_at) * 1000
+            self.in_flight += 1
+            self._record(priority_class, waited_ms, aged=self._effective_rank(waiter) < PRIORITY_CLASSES.index(priority_class))
+            waiter.future.set_result(None)
+
+    def _effective_rank(self, waiter: _Waiter) -> int:
+        rank = PRIORITY_CLASSES.index(waiter.priority_class)
+        if self.aging_seconds > 0:
+            rank -= int((time.monotonic() - waiter.enqueued_at) / self.aging_seconds)
+        return max(0, rank)
+
+    def _pick(self):
+        """
+        Pop the next waiter: best effective class, then the longest waiting,
+        with round-robin across sessions within a class.
+        """
+        best = None
+        for priority_class in PRIORITY_CLASSES:
+            sessions = self._queues[priority_class]
+            head = self._live_head(sessions)
+            if head is None:
+                continue
+            # The head of the next session in rotation represents this class
+            session_id, queue = head
+            key = (self._effective_rank(queue[0]), queue[0].enqueued_at)
+            if best is None or key < best[0]:
+                best = (key, priority_class, session_id)
+
+        if best is None:
+            return None
+
+        _, priority_class, session_id = best
+        sessions = self._queues[priority_class]
+        queue = sessions.pop(session_id)
+        waiter = queue.popleft()
+        if queue:
+            # Session goes to the back of the rotation
+            sessions[session_id] = queue
+        return priority_class, session_id, waiter
+
+    @staticmethod
+    def _live_head(sessions: "OrderedDict[Optional[str], Deque[_Waiter]]"):
+        """
+        Next (session_id, queue) in rotation whose head is still waiting.
+
+        A caller cancelled while queued has its future cancelled at once, but
+        only removes its waiter when its task runs again. Waiters whose future
+        is already done are dropped here, so they are never admitted.
+        """
+        while sessions:
+            session_id, queue = next(iter(sessions.items()))
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if queue:
+                return session_id, queue
+            del sessions[session_id]
+        return None
+
+    def _remove(self, waiter: _Waiter, session_id: Optional[str]) -> None:
+        sessions = self._queues[waiter.priority_class]
+        queue = sessions.get(session_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del sessions[session_id]
+
+    def _record(self, priority_class: str, waited_ms: float, aged: bool) -> None:
+        stats = self._stats[priority_class]
+        stats["admitted"] += 1
+        stats["total_wait_ms"] += waited_ms
+        stats["max_wait_ms"] = max(stats["max_wait_ms"], waited_ms)
+        if aged:
+            stats["aged"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+
+        Returns:
+            dict: max_concurrency, in_flight, waiting, and per class:
+                  admitted, waiting, avg_wait_ms, max_wait_ms, aged
+        """
+        classes = {}
+        for priority_class in PRIORITY_CLASSES:
+            stats = self._stats[priority_class]
+            admitted = stats["admitted"]
+            classes[priority_class] = {
+                "admitted": int(admitted),
+                "waiting": sum(len(q) for q in self._queues[priority_class].values()),
+                "avg_wait_ms": round(stats["total_wait_ms"] / admitted, 1) if admitted else 0,
+                "max_wait_ms": round(stats["max_wait_ms"], 1),
+                "aged": int(stats["aged"]),
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "aging_seconds": self.aging_seconds,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting(),
+            "classes": classes,
+        }
+
+
+# Process-wide scheduler shared by every LLM call
+scheduler = AdmissionScheduler()
+
+
+async def scheduled(purpose: str, awaitable: Awaitable[Any]) -> Any:
+    """
+    Run an LLM call once the scheduler admits it.
+
+    The call's class comes from its purpose (PURPOSE_CLASSES) unless a
+    priority_scope() is active; its session from session_scope().
+
+    Args:
+        purpose: Model registry purpose ("extraction", "routing", "response", "background")
+        awaitable: The LLM call, not yet awaited
+
+    Returns:
+        The awaitable's result
+    """
+    priority_class = _class_override.get() or PURPOSE_CLASSES.get(purpose, "background")
+    try:
+        await scheduler.acquire(priority_class, _session.get())
+    except BaseException:
+        # Never admitted: don't leave an un-awaited coroutine behind
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise
+    try:
+        return await awaitable
+    finally:
+        scheduler.release()
+
+
+def get_scheduler_stats() -> Dict[str, Any]:
+    """Get LLM admission queue statistics (see AdmissionScheduler.stats)."""
+    return scheduler.stats()
@@ -12,11 +12,9 @@ Run with: uvicorn app.main:app --reload
 
 import asyncio
 import os
-from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -29,7 +27,14 @@ from app.data.loader import initialize_data
 # Import API routers
 from app.api.chat import router as chat_router
 from app.api.graph import router as graph_router
-from app.api.sessions import cleanup_sessions
+from app.api.metrics import router as metrics_router
+from app.api.ws_chat import router as ws_chat_router
+from app.api.sessions import acleanup_sessions
+from app.graph.routing_cache import load_routing_cache, save_routing_cache
+from app.executor import shutdown_executor
+
+# In-memory frontend route table
+from app.frontend import FRONTEND_WATCH_SECONDS, frontend
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -51,13 +56,8 @@ app.add_middleware(
 # Include API routers
 app.include_router(chat_router)
 app.include_router(graph_router)
-
-# Serve static files from Next.js build
-FRONTEND_BUILD_DIR = Path(__file__).parent.parent / "frontend" / "out"
-
-# Mount static assets (_next folder) first with longer paths
-if (FRONTEND_BUILD_DIR / "_next").exists():
-    app.mount("/_next", StaticFiles(directory=str(FRONTEND_BUILD_DIR / "_next")), name="next-static")
+app.include_router(metrics_router)
+app.include_router(ws_chat_router)
 
 
 @app.get("/health")
@@ -74,19 +74,23 @@ async def health_check():
     }
 
 
-# Background task for session cleanup
+# Background tasks for session cleanup and frontend reloads
 cleanup_task = None
+frontend_watch_task = None
 
 
 async def periodic_session_cleanup():
     """
     Background task that runs every 5 minutes to clean up expired sessions.
+    Memory pressure between runs is handled by the store's LRU budget.
+    Also persists new routing cache decisions.
     """
     while True:
         await asyncio.sleep(300)  # 5 minutes
-        cleaned = cleanup_sessions(max_inactive_minutes=30)
+        cleaned = await acleanup_sessions(max_inactive_minutes=30)
         if cleaned > 0:
             print(f"🧹 Cleaned up {cleaned} expired session(s)")
+        await asyncio.to_thread(save_routing_cache)
 
 
 # Application lifecycle events
@@ -95,9 +99,10 @@ async def startup_event():
     """
     Runs when the application starts.
     Loads mock data into memory for use by the agent.
+    Loads the frontend build into memory and watches it for changes.
     Starts the periodic session cleanup task.
     """
-    global cleanup_task
+    global cleanup_task, frontend_watch_task
 
     print("🚀 Starting CARE Assistant - Coverage Analysis and Recommendation Engine...")
     print("📚 Version 0.8.0 - LangSmith Observability")
@@ -117,6 +122,18 @@ async def startup_event():
     # Load mock data into memory
     initialize_data()
 
+    # Restore routing decisions cached by earlier runs
+    load_routing_cache()
+
+    # Load (and precompress) the frontend build off the event loop
+    file_count = await asyncio.to_thread(frontend.load)
+    if frontend.loaded:
+        print(f"🖥️  Frontend loaded into memory ({file_count} files)")
+    else:
+        print("⚪ Frontend not built (run 'cd frontend && npm run build')")
+    if FRONTEND_WATCH_SECONDS > 0:
+        frontend_watch_task = asyncio.create_task(frontend.watch())
+
     # Start periodic session cleanup task
     cleanup_task = asyncio.create_task(periodic_session_cleanup())
     print("🧹 Session cleanup task started (runs every 5 minutes)")
@@ -128,7 +145,7 @@ async def startup_event():
 async def shutdown_event():
     """
     Runs when the application shuts down.
-    Cancels the cleanup task.
+    Cancels the cleanup and frontend watch tasks and stops the blocking executor.
     """
     global cleanup_task
 
@@ -142,35 +159,45 @@ async def shutdown_event():
         except asyncio.CancelledError:
             print("🧹 Session cleanup task cancelled")
 
+    if frontend_watch_task:
+        frontend_watch_task.cancel()
+
+    if save_routing_cache():
+        print("🧭 Routing cache saved")
+
+    shutdown_executor()
+
     print("✅ Shutdown complete!")
 
 
 # Catch-all route to serve index.html for SPA routing
 # This must be AFTER all API routes
-@app.get("/{full_path:path}")
-async def serve_frontend(full_path: str):
+@app.api_route("/{full_path:path}", methods=["GET", "HEAD"])
+async def serve_frontend(full_path: str, request: Request):
     """
-    Serve the Next.js static frontend.
+    Serve the Next.js static frontend from memory.
 
-    For any route that doesn't match an API endpoint, try to serve the corresponding
-    .html file from the Next.js export. Falls back to index.html for client-side routing.
+    Pages and /_next assets come from the in-memory route table (see
+    app/frontend.py), precompressed and with ETags. Unknown page routes fall
+    back to index.html for client-side routing. HEAD requests get the same
+    status and headers as GET, without the body.
     """
-    # Try to serve the specific HTML file for this route (Next.js static export)
-    if full_path and not full_path.startswith("_next"):
-        html_file = FRONTEND_BUILD_DIR / f"{full_path}.html"
-        if html_file.exists():
-            return FileResponse(html_file)
-
-    # Check if the frontend build exists
-    index_file = FRONTEND_BUILD_DIR / "index.html"
+    response = frontend.respond(
+        full_path,
+        request.headers.get("if-none-match"),
+        request.headers.get("accept-encoding")
+    )
 
-    if index_file.exists():
-        return FileResponse(index_file)
-    else:
-        return {
+    if response is None:
+        response = JSONResponse({
             "error": "Frontend not built",
             "message": "Please run 'cd frontend && npm run build' to build the frontend"
-        }
+        })
+
+    if request.method == "HEAD":
+        # Keep Content-Length and Content-Type of the GET response
+        return Response(status_code=response.status_code, headers=dict(response.headers))
+    return response
 
 
 if __name__ == "__main__":
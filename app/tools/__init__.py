@@ -4,16 +4,23 @@ LangGraph Tools for CARE Assistant.
 This module exports all tools that the agent can use to query insurance information.
 Tools are functions decorated with @tool that can be called by LangGraph nodes.
 
+Tool protocol: tools are coroutines (async def under @tool) over the async
+data-access layer and are called with .ainvoke(). A tool that has to stay
+blocking (a sync @tool around a blocking client) still works: nodes call
+every tool through app.tools.cache.ainvoke_cached(), which awaits native
+tools on the event loop and runs blocking ones in the bounded executor
+(app/executor.py). Both are timed per tool in /api/metrics.
+
 Available Tools:
     - coverage_lookup: Query comprehensive coverage details for a user
-    - benefit_verify: Check if a specific service is covered
+    - benefit_verify: Check if one or more services are covered
     - claims_status: Retrieve claims history and status
 
 Usage:
     from app.tools import coverage_lookup, benefit_verify, claims_status
 
     # In a LangGraph node:
-    result = coverage_lookup.invoke({"user_id": "user_001", "query": ""})
+    result = await coverage_lookup.ainvoke({"user_id": "user_001", "query": ""})
 """
 
 from app.tools.coverage import coverage_lookup
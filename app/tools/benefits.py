@@ -4,56 +4,85 @@ Benefit Verification Tool for CARE Assistant.
 This tool checks if specific medical services or procedures are covered
 under a user's insurance plan. It looks up coverage details for services
 like specialist visits, prescriptions, emergency care, etc.
+
+Service names are resolved with the service index (service_index.py), so
+free-text mentions such as "MRI", "therapist", "ER" or "generic meds" map to
+the plan's coverage keys. Several services can be verified in one call.
+
+Like the other tools it is a coroutine, awaited with .ainvoke().
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from langchain_core.tools import tool
-from app.data.loader import get_data, get_user_with_plan
+from app.data.async_access import aget_user_with_plan
+from app.tools.service_index import resolve_service
+
+
+def _coverage_for(coverage: Dict[str, Any], service: str) -> Dict[str, Any]:
+    """Resolve one service against a plan's coverage dict."""
+    match = resolve_service(service)
+    details = None
+    if match is not None:
+        details = coverage.get(match.coverage_key)
+        if details is not None and match.sub_key:
+            details = details.get(match.sub_key)
+
+    return {
+        "service_type": service,
+        "coverage_key": match.label if match else None,
+        "is_covered": details is not None,
+        "coverage_details": details
+    }
 
 
 @tool
-def benefit_verify(user_id: str, service_type: str) -> Dict[str, Any]:
+async def benefit_verify(user_id: str, service_type: str = "", service_types: Optional[List[str]] = None) -> Dict[str, Any]:
     """
-    Verify if a specific medical service is covered under the user's insurance plan.
+    Verify if specific medical services are covered under the user's insurance plan.
 
     This tool checks coverage for various types of medical services including:
     - primary_care: Primary care physician visits
-    - specialist: Specialist consultations
+    - specialist: Specialist consultations (also imaging such as MRI, physical therapy)
     - emergency_room: ER visits
     - urgent_care: Urgent care visits
     - prescription_drugs: Medications (generic, brand_name, specialty)
     - preventive_care: Annual physicals, screenings, vaccines
     - mental_health: Mental health services
 
+    Service names may be coverage keys or everyday phrases ("therapist", "ER",
+    "generic meds").
+
     Args:
         user_id: The unique user identifier (e.g., "user_001")
-        service_type: The type of service to check (e.g., "specialist", "emergency_room")
+        service_type: A single service to check (e.g., "specialist", "MRI")
+        service_types: Several services to check in one call. If given (even empty),
+                       the multi-service response is returned; an empty list
+                       checks every service in the plan.
 
     Returns:
-        dict: A structured response containing:
+        dict: For a single service_type:
             - status: "success" or "error"
             - service_type: The service that was queried
             - is_covered: Boolean indicating if service is covered
             - coverage_details: Specific coverage information (copays, coverage %, notes)
             - message: Human-readable status message
+        For service_types:
+            - status: "success" or "error"
+            - services: One entry per service (service_type, coverage_key, is_covered, coverage_details)
+            - not_covered: Services that could not be matched to the plan's coverage
+            - plan_info, user_info, message
 
     Example:
-        >>> result = benefit_verify("user_001", "specialist")
+        >>> result = await benefit_verify.ainvoke({"user_id": "user_001", "service_type": "specialist"})
         >>> print(result['is_covered'])
         True
-        >>> print(result['coverage_details']['in_network']['copay'])
-        50
-
-    Note:
-        The service_type should match keys in the insurance plan's coverage dict.
-        If the service is not found, the tool returns a helpful error message.
+        >>> result = await benefit_verify.ainvoke({"user_id": "user_001", "service_types": ["MRI", "generic meds"]})
+        >>> print([s['coverage_key'] for s in result['services']])
+        ['specialist', 'prescription_drugs.generic']
     """
     try:
-        # Get the loaded mock data
-        data = get_data()
-
         # Get user profile with embedded plan details
-        user_with_plan = get_user_with_plan(user_id, data)
+        user_with_plan = await aget_user_with_plan(user_id)
 
         if not user_with_plan:
             return {
@@ -67,13 +96,39 @@ def benefit_verify(user_id: str, service_type: str) -> Dict[str, Any]:
         plan_details = user_with_plan.get('plan_details', {})
         coverage = plan_details.get('coverage', {})
 
-        # Normalize service_type (handle variations)
-        service_key = service_type.lower().replace(" ", "_")
+        plan_info = {
+            "plan_name": plan_details.get('plan_name'),
+            "plan_type": plan_details.get('plan_type')
+        }
+        user_info = {
+            "name": user_with_plan.get('name'),
+            "deductible_remaining": (
+                user_with_plan.get('deductible_annual', 0) -
+                user_with_plan.get('deductible_met', 0)
+            )
+        }
 
-        # Check if the service is covered
-        service_coverage = coverage.get(service_key)
+        # Multi-service verification
+        if service_types is not None:
+            requested = service_types or list(coverage.keys())
+            services = [_coverage_for(coverage, service) for service in requested]
+            not_covered = [s["service_type"] for s in services if not s["is_covered"]]
+            return {
+                "status": "success",
+                "services": services,
+                "not_covered": not_covered,
+                "plan_info": plan_info,
+                "message": (
+                    f"Verified {len(services) - len(not_covered)} of {len(services)} service(s) "
+                    f"under {plan_details.get('plan_name')} plan"
+                ),
+                "user_info": user_info
+            }
+
+        # Single-service verification
+        result = _coverage_for(coverage, service_type)
 
-        if service_coverage is None:
+        if not result["is_covered"]:
             # Service not found in coverage
             available_services = list(coverage.keys())
             return {
@@ -90,19 +145,10 @@ def benefit_verify(user_id: str, service_type: str) -> Dict[str, Any]:
             "status": "success",
             "service_type": service_type,
             "is_covered": True,
-            "coverage_details": service_coverage,
-            "plan_info": {
-                "plan_name": plan_details.get('plan_name'),
-                "plan_type": plan_details.get('plan_type')
-            },
+            "coverage_details": result["coverage_details"],
+            "plan_info": plan_info,
             "message": f"Coverage details retrieved for {service_type} under {plan_details.get('plan_name')} plan",
-            "user_info": {
-                "name": user_with_plan.get('name'),
-                "deductible_remaining": (
-                    user_with_plan.get('deductible_annual', 0) -
-                    user_with_plan.get('deductible_met', 0)
-                )
-            }
+            "user_info": user_info
         }
 
     except Exception as e:
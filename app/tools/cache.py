@@ -0,0 +1,249 @@
+"""
+Tool Result Cache for CARE Assistant.
+
+Follow-up questions in a conversation call the same tools with the same
+arguments again: three questions about coverage run coverage_lookup three
+times for the same user and recompute an identical payload. This module
+memoizes tool results so repeated calls are answered from memory.
+
+Cache key:
+    (tool name, user_id, normalized arguments, data version[, session id])
+
+- Only arguments that change the result are part of the key; defaults are
+  filled in and strings are trimmed (claims_status status filters are
+  case-insensitive), so equivalent calls share one entry.
+- The data version (app.data.loader.get_data_version) is part of every key,
+  and the whole cache is cleared when the loaded data's version changes, so
+  a data reload never serves results computed from the old data.
+- Only successful results are cached; errors are always retried.
+- Entries are evicted least recently used once TOOL_CACHE_SIZE is reached.
+
+Scope:
+    shared   one cache for every session (default; results only depend on
+             the member and the data, not on who asks)
+    session  entries are keyed by the session from
+             app.llm.scheduler.session_scope() as well
+
+Cached results are shared between callers and must be treated as read-only;
+a hit returns a shallow copy of the result dict.
+
+Configuration:
+    TOOL_CACHE_SIZE   max cached results (default 1024, 0 disables)
+    TOOL_CACHE_SCOPE  "shared" (default) or "session"
+
+Usage:
+    result, cache_hit = await ainvoke_cached(coverage_lookup, {"user_id": "user_001"})
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.data.loader import get_data_version
+from app.llm.scheduler import current_session
+from app.tools.runner import run_tool
+
+
+TOOL_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", "1024"))
+TOOL_CACHE_SCOPE = os.getenv("TOOL_CACHE_SCOPE", "shared").lower()
+
+# Arguments that affect each tool's result, with their defaults. Arguments
+# not listed here (e.g. coverage_lookup's unused "query") don't split entries.
+# Tools not listed are never cached.
+CACHED_TOOL_ARGS: Dict[str, Dict[str, Any]] = {
+    "coverage_lookup": {},
+    "benefit_verify": {"service_type": "", "service_types": None},
+    "claims_status": {"status_filter": "all", "date_from": "", "date_to": ""},
+}
+
+# Arguments compared case-insensitively
+CASE_INSENSITIVE_ARGS = {("claims_status", "status_filter")}
+
+
+def _normalize(tool_name: str, arg_name: str, value: Any) -> Hashable:
+    """Hashable, canonical form of one argument value."""
+    if isinstance(value, str):
+        value = value.strip()
+        return value.lower() if (tool_name, arg_name) in CASE_INSENSITIVE_ARGS else value
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(tool_name, arg_name, item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _normalize(tool_name, arg_name, item)) for key, item in value.items()))
+    return value
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class ToolResultCache:
+    """
+    Thread-safe LRU cache of tool results keyed by tool, arguments and data version.
+
+    Every operation takes a lock, so the cache can also be used from worker
+    threads; lookups and inserts are O(1).
+
+    Attributes:
+        max_entries: Max cached results (0 disables the cache)
+        scope: "shared" or "session"
+    """
+
+    def __init__(self, max_entries: int = TOOL_CACHE_SIZE, scope: str = TOOL_CACHE_SCOPE):
+        if scope not in ("shared", "session"):
+            raise ValueError(f"Unknown TOOL_CACHE_SCOPE: {scope!r} (expected 'shared' or 'session')")
+        self.max_entries = max_entries
+        self.scope = scope
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._data_version: Optional[str] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def key(self, tool_name: str, tool_args: Dict[str, Any], session_id: Optional[str] = None) -> Optional[Tuple]:
+        """
+        Cache key for a tool call, or None if the call can't be cached.
+
+        Also clears the cache if the loaded data's version has changed since
+        the last call.
+
+        Args:
+            tool_name: Tool name (e.g. "coverage_lookup")
+            tool_args: Arguments the tool will be invoked with
+            session_id: Session the call belongs to (used in "session" scope)
+
+        Returns:
+            tuple: Hashable key, or None (cache disabled, tool not cacheable,
+                   no user_id, or data not loaded)
+        """
+        defaults = CACHED_TOOL_ARGS.get(tool_name)
+        user_id = tool_args.get("user_id")
+        if self.max_entries <= 0 or defaults is None or not user_id:
+            return None
+        try:
+            version = get_data_version()
+        except RuntimeError:
+            return None
+        self._check_version(version)
+
+        args = tuple(
+            (name, _normalize(tool_name, name, tool_args.get(name, default)))
+            for name, default in defaults.items()
+        )
+        key = (tool_name, user_id, args, version)
+        if self.scope == "session":
+            key += (session_id,)
+        return key
+
+    def _check_version(self, version: str) -> None:
+        with self._lock:
+            if version == self._data_version:
+                return
+            if self._data_version is not None and self._entries:
+                self._entries.clear()
+                self._invalidations += 1
+                print(f"🧹 Tool cache cleared: data version changed to {version}")
+            self._data_version = version
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Cached result for a key (marking it most recently used), or None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, key: Tuple, result: Any) -> bool:
+        """
+        Store a tool result if it is a successful one.
+
+        Returns:
+            bool: True if the result was cached
+        """
+        if not isinstance(result, dict) or result.get("status") != "success":
+            return False
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, hits, misses, hit rate, evictions and invalidations
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.max_entries > 0,
+                "scope": self.scope,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "data_version": self._data_version
+            }
+
+
+# Process-wide cache shared by every tool call
+tool_cache = ToolResultCache()
+
+
+# ============================================================================
+# Cached Invocation
+# ============================================================================
+
+async def ainvoke_cached(tool_fn: Any, tool_args: Dict[str, Any]) -> Tuple[Any, bool]:
+    """
+    Invoke a tool, answering from the cache when the same call was made before.
+
+    Misses run through run_tool(), so blocking tools never block the event loop.
+
+    Args:
+        tool_fn: A @tool-decorated tool (async or blocking)
+        tool_args: Arguments for the tool
+
+    Returns:
+        tuple: (result, cache_hit)
+
+    Example:
+        >>> result, hit = await ainvoke_cached(coverage_lookup, {"user_id": "user_001", "query": ""})
+        >>> result, hit = await ainvoke_cached(coverage_lookup, {"user_id": "user_001", "query": "MRI"})
+        >>> hit
+        True
+    """
+    key = tool_cache.key(tool_fn.name, tool_args, current_session())
+    if key is not None:
+        cached = tool_cache.get(key)
+        if cached is not None:
+            return dict(cached), True
+
+    result = await run_tool(tool_fn, tool_args)
+    if key is not None:
+        tool_cache.put(key, result)
+    return result, False
+
+
+def get_tool_cache_stats() -> Dict[str, Any]:
+    """Get tool result cache statistics (see ToolResultCache.stats)."""
+    return tool_cache.stats()
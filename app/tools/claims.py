@@ -4,15 +4,17 @@ Claims Status Tool for CARE Assistant.
 This tool retrieves user claims history and current claim statuses
 from mock insurance data. It can show pending, approved, and denied claims
 along with payment details.
+
+Claims are read through the async data-access layer (async_access.py).
 """
 
 from typing import Dict, Any, List
 from langchain_core.tools import tool
-from app.data.loader import get_data, get_claims_for_user, get_user_by_id
+from app.data.async_access import aget_claims_for_user, aget_user_by_id
 
 
 @tool
-def claims_status(user_id: str, status_filter: str = "all") -> Dict[str, Any]:
+async def claims_status(user_id: str, status_filter: str = "all", date_from: str = "", date_to: str = "") -> Dict[str, Any]:
     """
     Retrieve claims history and status for a user.
 
@@ -30,6 +32,8 @@ def claims_status(user_id: str, status_filter: str = "all") -> Dict[str, Any]:
                       - "pending": Show only pending claims
                       - "approved": Show only approved claims
                       - "denied": Show only denied claims
+        date_from: Optional earliest service date, inclusive (YYYY-MM-DD)
+        date_to: Optional latest service date, inclusive (YYYY-MM-DD)
 
     Returns:
         dict: A structured response containing:
@@ -40,7 +44,7 @@ def claims_status(user_id: str, status_filter: str = "all") -> Dict[str, Any]:
             - message: Human-readable status message
 
     Example:
-        >>> result = claims_status("user_001", "pending")
+        >>> result = await claims_status.ainvoke({"user_id": "user_001", "status_filter": "pending"})
         >>> print(result['claims_count'])
         1
         >>> print(result['claims'][0]['claim_status'])
@@ -52,11 +56,8 @@ def claims_status(user_id: str, status_filter: str = "all") -> Dict[str, Any]:
         out-of-pocket spending and insurance coverage.
     """
     try:
-        # Get the loaded mock data
-        data = get_data()
-
         # Verify user exists
-        user = get_user_by_id(user_id, data)
+        user = await aget_user_by_id(user_id)
         if not user:
             return {
                 "status": "error",
@@ -66,7 +67,7 @@ def claims_status(user_id: str, status_filter: str = "all") -> Dict[str, Any]:
             }
 
         # Get all claims for the user
-        all_claims = get_claims_for_user(user_id, data)
+        all_claims = await aget_claims_for_user(user_id)
 
         # Apply status filter if specified
         status_filter = status_filter.lower()
@@ -78,6 +79,14 @@ def claims_status(user_id: str, status_filter: str = "all") -> Dict[str, Any]:
         else:
             filtered_claims = all_claims
 
+        # Apply service date range if specified (ISO dates compare as strings)
+        if date_from or date_to:
+            filtered_claims = [
+                claim for claim in filtered_claims
+                if (not date_from or claim.get('service_date', '') >= date_from)
+                and (not date_to or claim.get('service_date', '') <= date_to)
+            ]
+
         # Sort claims by service date (most recent first)
         filtered_claims.sort(
             key=lambda x: x.get('service_date', ''),
@@ -117,7 +126,8 @@ def claims_status(user_id: str, status_filter: str = "all") -> Dict[str, Any]:
                 "deductible_met": user.get('deductible_met'),
                 "out_of_pocket_spent": user.get('out_of_pocket_spent')
             },
-            "filter_applied": status_filter
+            "filter_applied": status_filter,
+            "date_range": {"from": date_from or None, "to": date_to or None}
         }
 
     except Exception as e:
@@ -7,15 +7,18 @@ It demonstrates how to integrate external data sources as LangGraph tools.
 The tool uses LangChain's @tool decorator to make it compatible with LangGraph's
 tool-calling nodes. Tools are essentially functions that the agent can invoke
 to retrieve information or perform actions.
+
+The tool is a coroutine over the async data-access layer (app/data/async_access.py),
+so it never blocks the event loop; call it with .ainvoke().
 """
 
 from typing import Dict, Any
 from langchain_core.tools import tool
-from app.data.loader import get_data, get_user_with_plan
+from app.data.async_access import aget_user_with_plan
 
 
 @tool
-def coverage_lookup(user_id: str, query: str = "") -> Dict[str, Any]:
+async def coverage_lookup(user_id: str, query: str = "") -> Dict[str, Any]:
     """
     Look up insurance coverage details for a user.
 
@@ -39,7 +42,7 @@ def coverage_lookup(user_id: str, query: str = "") -> Dict[str, Any]:
             - user_info: Basic user information
 
     Example:
-        >>> result = coverage_lookup("user_001", "What's covered?")
+        >>> result = await coverage_lookup.ainvoke({"user_id": "user_001", "query": "What's covered?"})
         >>> print(result['status'])
         success
         >>> print(result['data']['plan_name'])
@@ -50,11 +53,8 @@ def coverage_lookup(user_id: str, query: str = "") -> Dict[str, Any]:
         makes it compatible with LangChain's tool-calling framework.
     """
     try:
-        # Get the loaded mock data
-        data = get_data()
-
         # Get user profile with embedded plan details
-        user_with_plan = get_user_with_plan(user_id, data)
+        user_with_plan = await aget_user_with_plan(user_id)
 
         if not user_with_plan:
             return {
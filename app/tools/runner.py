@@ -0,0 +1,47 @@
+"""
+Tool Runner for CARE Assistant.
+
+Runs any LangChain tool from async code without blocking the event loop:
+- Async-native tools (coroutines, like the three CARE tools) are awaited on
+  the event loop.
+- Blocking tools (a sync @tool, e.g. around a blocking database client) run
+  in the bounded blocking executor (app/executor.py). When its queue is
+  full, the call fails fast with an error result instead of waiting.
+
+Both kinds are timed per tool in the executor statistics (calls, errors,
+run time and, for blocking tools, queue wait), reported under "executor"
+in /api/metrics.
+
+Usage:
+    result = await run_tool(coverage_lookup, {"user_id": "user_001"})
+"""
+
+from typing import Any, Dict
+
+from app.executor import ExecutorBusyError, executor
+
+
+def is_async_tool(tool_fn: Any) -> bool:
+    """Whether a tool has a native coroutine implementation."""
+    return getattr(tool_fn, "coroutine", None) is not None
+
+
+async def run_tool(tool_fn: Any, tool_args: Dict[str, Any]) -> Any:
+    """
+    Invoke a tool without blocking the event loop.
+
+    Args:
+        tool_fn: A @tool-decorated tool (async or blocking)
+        tool_args: Arguments for the tool
+
+    Returns:
+        The tool's result, or an error result ({"status": "error", ...}) if a
+        blocking tool was rejected by the executor
+    """
+    if is_async_tool(tool_fn):
+        with executor.record_call(tool_fn.name):
+            return await tool_fn.ainvoke(tool_args)
+    try:
+        return await executor.run(tool_fn.name, tool_fn.invoke, tool_args)
+    except ExecutorBusyError:
+        return {"status": "error", "message": f"{tool_fn.name} is busy right now, please try again"}
@@ -0,0 +1,235 @@
+"""
+Service-Type Resolution Index for CARE Assistant.
+
+Members describe services in their own words ("MRI", "my therapist", "the emergency room",
+"generic meds"), while insurance plans key coverage by fixed names such as
+"specialist" or "prescription_drugs" → "generic". This module maps free text to
+those coverage keys without an LLM call.
+
+The index is built once from the loaded plans:
+- Every coverage key and service sub-key found in any plan becomes a term
+  ("primary_care" → "primary care", "brand_name" → "brand name").
+- A hand-written lexicon of synonyms is added for paths that exist in the data.
+
+Lookups tokenize the text and match the longest known phrase at each position,
+so "physical therapy" wins over "physical" and "therapy".
+
+Usage:
+    from app.tools.service_index import find_services, resolve_service
+
+    find_services("Is an MRI or my therapist covered?")
+    # [ServiceMatch(term='mri', coverage_key='specialist', sub_key=None),
+    #  ServiceMatch(term='therapist', coverage_key='mental_health', sub_key=None)]
+
+    resolve_service("generic meds")
+    # ServiceMatch(term='generic meds', coverage_key='prescription_drugs', sub_key='generic')
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.data.loader import get_data
+
+
+class ServiceMatch(NamedTuple):
+    """A service mention resolved to a coverage path."""
+    term: str
+    coverage_key: str
+    sub_key: Optional[str]
+
+    @property
+    def label(self) -> str:
+        """Coverage path as a single string, e.g. "prescription_drugs.generic"."""
+        return f"{self.coverage_key}.{self.sub_key}" if self.sub_key else self.coverage_key
+
+
+# Sub-keys that describe network tiers rather than separate services
+NETWORK_KEYS = {"in_network", "out_of_network"}
+
+# Longest phrase (in tokens) the matcher will try
+MAX_TERM_TOKENS = 4
+
+# Synonyms for coverage paths ("key" or "key.sub_key").
+# No plan lists imaging or physical therapy separately; both are billed as
+# specialist care in the claims data, so they resolve to "specialist".
+# Single words that are common outside a service name ("urgent", "physical",
+# "doctor", "er") are only listed in multi-word forms: a match sets
+# benefit_verify's services, the prefetched tools and the routing cache guard.
+SERVICE_LEXICON: Dict[str, List[str]] = {
+    "primary_care": [
+        "primary care", "pcp", "doctor visit", "doctors visit", "family doctor",
+        "physician", "general practitioner", "gp", "office visit", "sick visit",
+    ],
+    "specialist": [
+        "specialist", "specialists", "specialist visit", "dermatologist", "cardiologist",
+        "orthopedist", "orthopedics", "neurologist", "allergist", "ent",
+        "mri", "mri scan", "ct scan", "x-ray", "xray", "imaging",
+        "physical therapy", "physical therapist",
+    ],
+    "emergency_room": [
+        "emergency room", "emergency", "er visit", "emergency care",
+    ],
+    "urgent_care": [
+        "urgent care", "walk-in clinic", "walk in clinic",
+    ],
+    "prescription_drugs": [
+        "prescription", "prescriptions", "prescription drugs", "medication", "medications",
+        "meds", "drugs", "pharmacy", "rx",
+    ],
+    "prescription_drugs.generic": [
+        "generic", "generics", "generic meds", "generic drugs", "generic medication",
+    ],
+    "prescription_drugs.brand_name": [
+        "brand name", "brand", "name brand", "brand name drugs", "brand name meds",
+    ],
+    "prescription_drugs.specialty": [
+        "specialty", "specialty drugs", "specialty meds", "specialty medication", "biologics",
+    ],
+    "preventive_care": [
+        "preventive", "preventive care", "prevention", "annual physical", "physical exam",
+        "checkup", "check-up", "screening", "screenings", "vaccine", "vaccines",
+        "flu shot", "immunization", "immunizations", "wellness visit", "mammogram",
+        "colonoscopy",
+    ],
+    "mental_health": [
+        "mental health", "therapist", "therapy", "counseling", "counselor",
+        "psychiatrist", "psychologist", "behavioral health",
+    ],
+}
+
+
+# ============================================================================
+# Index Construction
+# ============================================================================
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into word tokens ("E.R." → ["er"], "x-ray" → ["x", "ray"])."""
+    return re.findall(r"[a-z0-9&]+", text.lower().replace(".", ""))
+
+
+def build_service_index(plans: List[Dict[str, Any]]) -> Dict[Tuple[str, ...], Tuple[Optional[str], Optional[str]]]:
+    """
+    Build the term index for a list of plans.
+
+    Args:
+        plans: Insurance plans as loaded from insurance_plans.json
+
+    Returns:
+        dict: Maps a token tuple to (coverage_key, sub_key)
+    """
+    # Collect every coverage path that exists in at least one plan
+    paths = set()
+    for plan in plans:
+        for key, value in plan.get("coverage", {}).items():
+            paths.add((key, None))
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    if isinstance(sub_value, dict) and sub_key not in NETWORK_KEYS:
+                        paths.add((key, sub_key))
+
+    index: Dict[Tuple[str, ...], Tuple[Optional[str], Optional[str]]] = {}
+
+    # Terms derived from the data itself
+    for key, sub_key in paths:
+        name = sub_key or key
+        index.setdefault(tuple(tokenize(name.replace("_", " "))), (key, sub_key))
+
+    # Lexicon synonyms, restricted to paths present in the data
+    for path, terms in SERVICE_LEXICON.items():
+        key, _, sub_key = path.partition(".")
+        target = (key, sub_key or None)
+        if target not in paths:
+            continue
+        for term in terms:
+            index[tuple(tokenize(term))] = target
+
+    return index
+
+
+# Cached index and the plans list it was built from
+_INDEX: Optional[Dict[Tuple[str, ...], Tuple[Optional[str], Optional[str]]]] = None
+_INDEX_SOURCE: Optional[int] = None
+
+
+def get_service_index() -> Dict[Tuple[str, ...], Tuple[Optional[str], Optional[str]]]:
+    """
+    Get the service index for the currently loaded plans, building it on first use.
+
+    The index is rebuilt automatically if the plans list is replaced (data reload).
+    """
+    global _INDEX, _INDEX_SOURCE
+    plans = get_data().get("plans", [])
+    if _INDEX is None or _INDEX_SOURCE != id(plans):
+        _INDEX = build_service_index(plans)
+        _INDEX_SOURCE = id(plans)
+    return _INDEX
+
+
+# ============================================================================
+# Lookups
+# ============================================================================
+
+def _lookup(tokens: Tuple[str, ...], index) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """Exact lookup with a simple plural fallback on the last token."""
+    target = index.get(tokens)
+    if target is None and tokens and tokens[-1].endswith("s") and len(tokens[-1]) > 3:
+        target = index.get(tokens[:-1] + (tokens[-1][:-1],))
+    return target
+
+
+def find_services(text: str) -> List[ServiceMatch]:
+    """
+    Find every service mentioned in free text.
+
+    Scans left to right, matching the longest known phrase at each position.
+    Each coverage path is returned at most once, in order of first mention.
+
+    Args:
+        text: Free text, e.g. a member's question
+
+    Returns:
+        list: ServiceMatch entries (empty if no service is mentioned)
+    """
+    index = get_service_index()
+    tokens = tokenize(text)
+    matches: List[ServiceMatch] = []
+    seen = set()
+
+    i = 0
+    while i < len(tokens):
+        for length in range(min(MAX_TERM_TOKENS, len(tokens) - i), 0, -1):
+            window = tuple(tokens[i:i + length])
+            target = _lookup(window, index)
+            if target is not None:
+                if target not in seen:
+                    seen.add(target)
+                    matches.append(ServiceMatch(" ".join(window), target[0], target[1]))
+                i += length
+                break
+        else:
+            i += 1
+
+    return matches
+
+
+def resolve_service(service: str) -> Optional[ServiceMatch]:
+    """
+    Resolve a single service name to a coverage path.
+
+    Accepts coverage keys ("emergency_room"), dotted paths
+    ("prescription_drugs.generic") and free-text synonyms ("ER").
+
+    Args:
+        service: Service name or phrase
+
+    Returns:
+        ServiceMatch: The resolved path, or None if unknown
+    """
+    key, _, sub_key = service.strip().lower().partition(".")
+    index = get_service_index()
+    target = (key.replace(" ", "_"), sub_key or None)
+    if target in index.values():
+        return ServiceMatch(service, target[0], target[1])
+
+    matches = find_services(service)
+    return matches[0] if matches else None
@@ -82,15 +82,15 @@ export default function Home() {
       const aiMessage: Message = {
         id: `ai-${Date.now()}`,
         role: "assistant",
-        content: response.response,
+        content: response.response ?? "",
         timestamp: new Date().toISOString(),
       }
 
       setMessages([aiMessage])
 
-      // Update trace and state
-      setTrace(response.trace)
-      setState(response.state)
+      // Update trace and state (state is omitted when unchanged)
+      if (response.trace) setTrace(response.trace)
+      if (response.state) setState(response.state)
     } catch (error) {
       console.error("Failed to get initial greeting:", error)
       // Show error message
@@ -145,15 +145,15 @@ export default function Home() {
       const aiMessage: Message = {
         id: `ai-${Date.now()}`,
         role: "assistant",
-        content: response.response,
+        content: response.response ?? "",
         timestamp: new Date().toISOString(),
       }
 
       setMessages((prev) => [...prev, aiMessage])
 
-      // Update trace and state
-      setTrace(response.trace)
-      setState(response.state)
+      // Update trace and state (state is omitted when unchanged)
+      if (response.trace) setTrace(response.trace)
+      if (response.state) setState(response.state)
     } catch (error) {
       console.error("Failed to send message:", error)
 
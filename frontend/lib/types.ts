@@ -86,6 +86,14 @@ export interface ChatRequest {
   session_id: string | null;
   /** User's message */
   message: string;
+  /** Optional: time budget for this turn in milliseconds */
+  deadline_ms?: number;
+  /** Optional: only return these response fields (default: all) */
+  fields?: Array<'response' | 'trace' | 'state' | 'progress_messages'>;
+  /** Optional: state_version from the previous response; unchanged state is omitted */
+  state_version?: string;
+  /** Optional: trace level for this turn (default: server's TRACE_LEVEL, sampled) */
+  trace_level?: 'off' | 'summary' | 'full';
 }
 
 /**
@@ -94,14 +102,16 @@ export interface ChatRequest {
 export interface ChatResponse {
   /** Session ID (returned on first message, used for subsequent requests) */
   session_id: string;
-  /** AI's response message */
-  response: string;
-  /** Execution trace for this turn */
-  trace: TraceEntry[];
-  /** Current conversation state */
-  state: ConversationState;
+  /** AI's response message (omitted if not selected with ChatRequest.fields) */
+  response?: string;
+  /** Execution trace for this turn (omitted if not selected with ChatRequest.fields) */
+  trace?: TraceEntry[];
+  /** Current conversation state (omitted if not selected, or unchanged since ChatRequest.state_version) */
+  state?: ConversationState;
   /** Optional: Progress messages to display while processing */
   progress_messages?: string[];
+  /** Version tag of state; send back as ChatRequest.state_version */
+  state_version?: string;
 }
 
 /**
@@ -0,0 +1,158 @@
+"""
+Graph Topology Benchmark for CARE Assistant.
+
+Compares the two graph modes on the same questions:
+- two_call: LLM tool routing (orchestrate_tools) + LLM answer (generate_response)
+- one_shot: LLM-free tool prefetch (prefetch_tools) + one LLM answer
+
+For each question it reports the latency of both topologies and how closely the
+answers agree (word overlap, and how many dollar amounts / percentages from the
+two_call answer also appear in the one_shot answer).
+
+Usage:
+    python tests/benchmark_graph_modes.py            # live Ollama (make sure it's running)
+    python tests/benchmark_graph_modes.py --stub     # stub LLM: measures graph overhead only
+    python tests/benchmark_graph_modes.py --user user_002 --repeats 3
+"""
+
+import argparse
+import asyncio
+import itertools
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add the project root to the path so we can import app modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.data.loader import initialize_data, get_data, get_user_by_id
+from app.graph.graph import compile_agent, GRAPH_MODES
+from app.llm.registry import override_llm
+
+
+QUESTIONS = [
+    "What plan do I have and how much of my deductible is left?",
+    "Do I have any pending claims?",
+    "Is an MRI covered, and what do generic meds cost me?",
+    "How much have I spent out of pocket this year?",
+    "What plan do I have, what does it cover, and do I have outstanding claims?",
+]
+
+
+def words(text: str) -> set:
+    """Lowercased word set used for answer overlap."""
+    return set(re.findall(r"[a-z0-9$%.,]+", text.lower()))
+
+
+def figures(text: str) -> set:
+    """Dollar amounts and percentages mentioned in an answer."""
+    return set(re.findall(r"\$[\d,]+(?:\.\d+)?|\d+(?:\.\d+)?%", text))
+
+
+class StubRouter:
+    """Stands in for the routing model: always selects coverage_lookup + claims_status."""
+
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(lambda _: {
+            "parsed": schema(tools=["coverage_lookup", "claims_status"]),
+            "raw": AIMessage(content=""),
+            "parsing_error": None,
+        })
+
+
+def install_stub_llm() -> None:
+    """Replace the Ollama clients with canned fake models."""
+    override_llm("routing", StubRouter())
+    override_llm("response", GenericFakeChatModel(messages=itertools.cycle([
+        AIMessage(content="Your PPO Gold plan has $700 of deductible remaining."),
+    ])))
+
+
+async def run_question(agent, user: Dict, question: str) -> Dict:
+    """Run one question on a freshly identified session and time it."""
+    state = {
+        "messages": [HumanMessage(content=question)],
+        "user_id": user["user_id"],
+        "user_profile": user,
+        "tool_results": {},
+        "conversation_context": {},
+        "execution_trace": [],
+        "first_greeting": False,
+    }
+    started = time.perf_counter()
+    result = await agent.ainvoke(state)
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "answer": result["messages"][-1].content}
+
+
+async def run_benchmark(user_id: str, repeats: int) -> None:
+    """Run every question through both topologies and print a comparison."""
+    user = get_user_by_id(user_id, get_data())
+    if not user:
+        print(f"❌ Unknown user: {user_id}")
+        return
+
+    agents = {mode: compile_agent(mode) for mode in GRAPH_MODES}
+    latencies: Dict[str, List[float]] = {mode: [] for mode in GRAPH_MODES}
+    overlaps: List[float] = []
+    figure_matches: List[float] = []
+
+    for question in QUESTIONS:
+        print(f"\n❓ {question}")
+        answers = {}
+        for mode, agent in agents.items():
+            runs = [await run_question(agent, user, question) for _ in range(repeats)]
+            median = statistics.median(run["elapsed"] for run in runs)
+            latencies[mode].append(median)
+            answers[mode] = runs[-1]["answer"]
+            print(f"   {mode:<9} {median * 1000:>9.1f} ms   {answers[mode][:90]!r}")
+
+        base, other = words(answers["two_call"]), words(answers["one_shot"])
+        overlap = len(base & other) / len(base | other) if base | other else 1.0
+        overlaps.append(overlap)
+
+        base_figures = figures(answers["two_call"])
+        if base_figures:
+            figure_matches.append(len(base_figures & figures(answers["one_shot"])) / len(base_figures))
+        print(f"   parity    word overlap {overlap:.0%}, figures {sorted(base_figures)}")
+
+    print("\n" + "=" * 80)
+    print("SUMMARY (median per question)")
+    print("=" * 80)
+    for mode in GRAPH_MODES:
+        total = sum(latencies[mode])
+        print(f"   {mode:<9} mean {total / len(QUESTIONS) * 1000:>9.1f} ms   total {total:>7.2f} s")
+    speedup = sum(latencies["two_call"]) / max(sum(latencies["one_shot"]), 1e-9)
+    print(f"   one_shot speedup: {speedup:.2f}x")
+    print(f"   answer word overlap (mean): {statistics.mean(overlaps):.0%}")
+    if figure_matches:
+        print(f"   two_call figures also in one_shot (mean): {statistics.mean(figure_matches):.0%}")
+    print("=" * 80)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compare two_call and one_shot graph topologies")
+    parser.add_argument("--stub", action="store_true", help="use a stub LLM instead of Ollama")
+    parser.add_argument("--user", default="user_001", help="user_id to ask as (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=1, help="runs per question and mode (median is reported)")
+    args = parser.parse_args()
+
+    initialize_data()
+    if args.stub:
+        install_stub_llm()
+        print("🧪 Using stub LLM (latency shows graph overhead only; parity is not meaningful)")
+
+    asyncio.run(run_benchmark(args.user, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+Microbenchmark Suite for CARE Assistant.
+
+This script times the hot paths of the backend in isolation, without Ollama:
+- add_trace_entry on long execution traces, and at each trace level
+- Data loader queries (get_user_with_plan, get_claims_for_user) on synthetic
+  datasets of increasing size: plain scan, lookup indexes, and the SQLite backend
+- Startup: streaming JSON parse vs. loading the binary data snapshot
+- Per-tool .ainvoke overhead (coverage_lookup, benefit_verify, claims_status),
+  a tool result cache hit, and a SQLite-backed tool call through the executor
+- Prompt building for generate_response, and the full node with a stub LLM
+- ChatResponse serialization, field selection and gzip compression
+
+Results can be saved as a baseline and compared on later runs. The script exits
+with status 1 if any benchmark is slower than its baseline by more than the
+regression threshold, so it can gate changes in CI. The baseline is committed
+as tests/benchmark_baselines.json; with --check, a missing baseline (or a
+benchmark without a baseline entry) fails the run as well, so the gate can't
+pass by accident.
+Timings depend on the machine: re-record the baseline (--save-baseline) on
+the machine that runs the gate before relying on its comparisons.
+
+Usage:
+    python tests/benchmarks.py                    # run and compare with baseline
+    python tests/benchmarks.py --save-baseline    # run and store results as the new baseline
+    python tests/benchmarks.py --check            # CI gate: also fail if a baseline is missing
+    python tests/benchmarks.py --threshold 15     # fail on >15% regressions (default: 25)
+    python tests/benchmarks.py --filter loader    # only run benchmarks whose name contains "loader"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add the project root to the path so we can import app modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.data import loader
+from app.data.records import make_record, to_builtin
+from app.data.snapshot import build_manifest, load_snapshot, save_snapshot
+from app.data.sqlite_backend import SQLiteDataBackend, build_database
+from app.data.streaming import iter_json_array
+from app.graph import nodes
+from app.graph.tracing import TRACE_LEVELS, trace_scope
+from app.api.chat import ChatResponse, ConversationStateResponse, shape_response, to_trace_entries
+from app.api.compression import compress
+from app.llm.registry import PURPOSES, override_llm
+from app.tools import coverage_lookup, benefit_verify, claims_status
+from app.tools.cache import ainvoke_cached
+
+
+BASELINE_FILE = Path(__file__).parent / "benchmark_baselines.json"
+DEFAULT_THRESHOLD = float(os.getenv("BENCH_REGRESSION_THRESHOLD", "25"))
+
+# Dataset sizes (number of users) for loader benchmarks
+DATASET_SIZES = [100, 1_000, 10_000]
+CLAIMS_PER_USER = 5
+
+
+# ============================================================================
+# Synthetic Data
+# ============================================================================
+
+def make_dataset(n_users: int, claims_per_user: int = CLAIMS_PER_USER) -> Dict[str, Any]:
+    """
+    Build a synthetic dataset shaped like the mock JSON files.
+
+    Plans are copied from the real data files so coverage lookups behave
+    realistically; users and claims are generated.
+    """
+    plans = loader.load_json_file("insurance_plans.json")["plans"]
+    statuses = ["Approved", "Pending", "Denied"]
+
+    users = []
+    claims = []
+    for i in range(n_users):
+        user_id = f"user_{i:07d}"
+        users.append({
+            "user_id": user_id,
+            "name": f"Member{i} Test",
+            "age": 20 + i % 60,
+            "plan_id": plans[i % len(plans)]["plan_id"],
+            "member_since": "2021-06-01",
+            "deductible_annual": 1500,
+            "deductible_met": i % 1500,
+            "out_of_pocket_max": 6000,
+            "out_of_pocket_spent": i % 6000,
+            "dependents": i % 4,
+        })
+        for j in range(claims_per_user):
+            claims.append({
+                "claim_id": f"CLM-{i:07d}-{j}",
+                "user_id": user_id,
+                "service_date": f"2024-{1 + j % 12:02d}-15",
+                "service_type": "Specialist Visit",
+                "provider_name": "Dr. Test",
+                "provider_network": "in_network",
+                "claim_status": statuses[j % len(statuses)],
+                "billed_amount": 250.0,
+                "insurance_paid": 200.0,
+                "patient_responsibility": 50.0,
+                "applied_to_deductible": 0,
+            })
+
+    return {"users": users, "plans": plans, "claims": claims}
+
+
+def as_records(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a make_dataset() result to the record types the loader stores."""
+    return {kind: [make_record(kind, record) for record in data[kind]] for kind in ("plans", "users", "claims")}
+
+
+def make_trace(length: int) -> List[dict]:
+    """Build an execution trace with `length` entries."""
+    trace: List[dict] = []
+    for i in range(length):
+        trace.append({
+            "node": "orchestrate_tools",
+            "ts": 1704067200.0,
+            "action": f"Step {i}",
+        })
+    return trace
+
+
+# ============================================================================
+# Timing
+# ============================================================================
+
+def measure(func: Callable[[], Any], min_time: float = 0.2, repeats: int = 5) -> float:
+    """
+    Time a callable and return the best per-call time in microseconds.
+
+    The number of calls per repeat is calibrated so one repeat takes at least
+    min_time seconds. The minimum over repeats is reported because it is the
+    least affected by background noise.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    return best * 1_000_000
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+def collect_benchmarks() -> Dict[str, Callable[[], Any]]:
+    """Build the named benchmark callables."""
+    benchmarks: Dict[str, Callable[[], Any]] = {}
+
+    # ---- add_trace_entry on long traces ------------------------------------
+    for length in [10, 1_000, 10_000]:
+        trace = make_trace(length)
+        benchmarks[f"trace.add_entry[{length}]"] = (
+            lambda trace=trace: nodes.add_trace_entry(trace, "generate_response", "bench", {"k": 1})
+        )
+
+    # Details built lazily, at each trace level
+    short_trace = make_trace(10)
+
+    def add_entry_at(level: str) -> Callable[[], Any]:
+        def run():
+            with trace_scope(level):
+                return nodes.add_trace_entry(short_trace, "prefetch_tools", "bench", lambda: {"statuses": {"k": "success"}})
+        return run
+
+    for level in TRACE_LEVELS:
+        benchmarks[f"trace.add_entry[{level}]"] = add_entry_at(level)
+
+    # ---- loader queries on growing datasets --------------------------------
+    scratch_dir = Path(tempfile.mkdtemp(prefix="care-bench-"))
+    for size in DATASET_SIZES:
+        data = make_dataset(size)
+        last_user = data["users"][-1]["user_id"]
+        benchmarks[f"loader.get_user_with_plan[{size}]"] = (
+            lambda data=data, uid=last_user: loader.get_user_with_plan(uid, data)
+        )
+        benchmarks[f"loader.get_claims_for_user[{size}]"] = (
+            lambda data=data, uid=last_user: loader.get_claims_for_user(uid, data)
+        )
+
+        # Same queries on records and lookup indexes, as built by the streaming loader
+        indexed = as_records(data)
+        loader.build_indexes(indexed)
+        benchmarks[f"loader.get_user_with_plan[{size},indexed]"] = (
+            lambda data=indexed, uid=last_user: loader.get_user_with_plan(uid, data)
+        )
+        benchmarks[f"loader.get_claims_for_user[{size},indexed]"] = (
+            lambda data=indexed, uid=last_user: loader.get_claims_for_user(uid, data)
+        )
+
+        # Same queries against the SQLite backend
+        db_path = scratch_dir / f"care-{size}.db"
+        build_database(db_path, {kind: data[kind] for kind in ("plans", "users", "claims")}, {"version": "bench"})
+        backend = SQLiteDataBackend(db_path)
+        benchmarks[f"loader.get_user_with_plan[{size},sqlite]"] = (
+            lambda data=backend, uid=last_user: loader.get_user_with_plan(uid, data)
+        )
+        benchmarks[f"loader.get_claims_for_user[{size},sqlite]"] = (
+            lambda data=backend, uid=last_user: loader.get_claims_for_user(uid, data)
+        )
+
+    # ---- startup: streaming parse vs. binary snapshot (largest dataset) ----
+    startup_data = make_dataset(DATASET_SIZES[-1])
+    claims_file = scratch_dir / "claims_data.json"
+    claims_file.write_text(json.dumps({"claims": startup_data["claims"]}), encoding="utf-8")
+    startup_data = as_records(startup_data)
+    loader.build_indexes(startup_data)
+    snapshot_file = scratch_dir / "snapshot.bin"
+    save_snapshot(snapshot_file, startup_data, build_manifest([claims_file]))
+    benchmarks[f"startup.stream_claims_json[{DATASET_SIZES[-1]}]"] = (
+        lambda: sum(1 for _ in iter_json_array(claims_file, "claims"))
+    )
+    benchmarks[f"startup.load_snapshot[{DATASET_SIZES[-1]}]"] = (
+        lambda: load_snapshot(snapshot_file, [claims_file])
+    )
+
+    # ---- tool .ainvoke overhead (on the mid-size dataset) ------------------
+    tool_data = as_records(make_dataset(DATASET_SIZES[1]))
+    loader.build_indexes(tool_data)
+    tool_user = tool_data["users"][-1]["user_id"]
+    tool_backend = SQLiteDataBackend(scratch_dir / f"care-{DATASET_SIZES[1]}.db")
+    loop = asyncio.new_event_loop()
+
+    def with_tool_data(make_call: Callable[[], Any], data: Any = tool_data) -> Callable[[], Any]:
+        def run():
+            loader._LOADED_DATA = data
+            return loop.run_until_complete(make_call())
+        return run
+
+    benchmarks["tool.coverage_lookup"] = with_tool_data(
+        lambda: coverage_lookup.ainvoke({"user_id": tool_user, "query": "What does my plan cover?"})
+    )
+    benchmarks["tool.benefit_verify"] = with_tool_data(
+        lambda: benefit_verify.ainvoke({"user_id": tool_user, "service_type": "specialist"})
+    )
+    benchmarks["tool.claims_status"] = with_tool_data(
+        lambda: claims_status.ainvoke({"user_id": tool_user})
+    )
+    benchmarks["tool.coverage_lookup[cached]"] = with_tool_data(
+        lambda: ainvoke_cached(coverage_lookup, {"user_id": tool_user, "query": "What does my plan cover?"})
+    )
+    # SQLite queries go through the bounded blocking executor
+    benchmarks["tool.claims_status[sqlite,executor]"] = with_tool_data(
+        lambda: claims_status.ainvoke({"user_id": tool_user}), tool_backend
+    )
+
+    # ---- generate_response prompt building and node with stub LLM ----------
+    loader._LOADED_DATA = tool_data
+    state = {
+        "messages": [
+            HumanMessage(content="Hi"),
+            AIMessage(content="Hello! I'm your ❤️ CARE Assistant. What's your name?"),
+            HumanMessage(content="Member1"),
+            AIMessage(content="Welcome Member1!"),
+            HumanMessage(content="What's my deductible and do I have pending claims?"),
+        ],
+        "user_id": tool_user,
+        "user_profile": tool_data["users"][-1],
+        "tool_results": {
+            "coverage_lookup": loop.run_until_complete(coverage_lookup.ainvoke({"user_id": tool_user})),
+            "claims_status": loop.run_until_complete(claims_status.ainvoke({"user_id": tool_user})),
+        },
+        "execution_trace": make_trace(50),
+        "conversation_context": {},
+    }
+    benchmarks["prompt.build_response_prompt"] = lambda: nodes.build_response_prompt(state)
+
+    def run_generate_response():
+        override_llm("response", GenericFakeChatModel(messages=iter([AIMessage(content="Your deductible is $1,500.")])))
+        return loop.run_until_complete(nodes.generate_response(state))
+
+    benchmarks["node.generate_response[stub_llm]"] = run_generate_response
+
+    # ---- ChatResponse serialization ----------------------------------------
+    response = ChatResponse(
+        session_id="bench-session",
+        response="Your deductible is $1,500.",
+        trace=to_trace_entries(make_trace(100)),
+        state=ConversationStateResponse(
+            user_id=tool_user,
+            user_profile=to_builtin(state["user_profile"]),
+            tool_results=to_builtin(state["tool_results"]),
+        ),
+        progress_messages=["Let me check your coverage details..."],
+        state_version="bench-version",
+    )
+    benchmarks["api.chat_response_serialize"] = lambda: response.model_dump_json()
+    benchmarks["api.chat_response_shape[unchanged_state]"] = lambda: json.dumps(
+        shape_response(response, ["response", "state"], "bench-version")
+    )
+    body = response.model_dump_json().encode("utf-8")
+    benchmarks["api.chat_response_gzip"] = lambda: compress(body, "gzip")
+
+    return benchmarks
+
+
+# ============================================================================
+# Baselines and Reporting
+# ============================================================================
+
+def load_baseline() -> Dict[str, float]:
+    """Load stored baseline results (empty if none saved yet)."""
+    if not BASELINE_FILE.exists():
+        return {}
+    with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f).get("results_us", {})
+
+
+def save_baseline(results: Dict[str, float]) -> None:
+    """Store results as the new baseline."""
+    with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": sys.version.split()[0],
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results_us": results,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main() -> int:
+    """Run the benchmark suite. Returns the process exit code."""
+    parser = argparse.ArgumentParser(description="CARE Assistant microbenchmarks")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown in percent before a benchmark fails (default: %(default)s)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--check", action="store_true",
+                        help="fail if there is no baseline, or no baseline entry for a benchmark")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CARE ASSISTANT - Microbenchmarks (stub LLM, synthetic data)")
+    print("=" * 80)
+
+    # Replace the Ollama clients so nothing leaves the process
+    for purpose in PURPOSES:
+        override_llm(purpose, GenericFakeChatModel(messages=iter([])))
+
+    benchmarks = collect_benchmarks()
+    baseline = load_baseline()
+    results: Dict[str, float] = {}
+    regressions = []
+    unbaselined = []
+
+    print(f"\n{'benchmark':<45}{'time':>14}{'baseline':>14}{'change':>10}")
+    print("-" * 83)
+
+    for name, func in benchmarks.items():
+        if args.filter and args.filter not in name:
+            continue
+
+        us = measure(func)
+        results[name] = round(us, 3)
+
+        base = baseline.get(name)
+        if base:
+            change = (us - base) / base * 100
+            marker = ""
+            if change > args.threshold:
+                regressions.append((name, change))
+                marker = "  ❌"
+            print(f"{name:<45}{us:>12.2f}µs{base:>12.2f}µs{change:>+9.1f}%{marker}")
+        else:
+            unbaselined.append(name)
+            print(f"{name:<45}{us:>12.2f}µs{'-':>14}{'-':>10}")
+
+    print("-" * 83)
+
+    if args.save_baseline:
+        # Keep baselines of benchmarks that were filtered out of this run
+        save_baseline({**baseline, **results})
+        print(f"\n💾 Baseline saved to {BASELINE_FILE}")
+        return 0
+
+    if not baseline:
+        if args.check:
+            print(f"\n❌ No baseline found at {BASELINE_FILE}. Run with --save-baseline to create one.")
+            return 1
+        print("\nℹ️  No baseline found. Run with --save-baseline to create one.")
+        return 0
+
+    if args.check and unbaselined:
+        print(f"\n❌ {len(unbaselined)} benchmark(s) have no baseline entry (run with --save-baseline):")
+        for name in unbaselined:
+            print(f"   - {name}")
+        return 1
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0f}%:")
+        for name, change in regressions:
+            print(f"   - {name}: {change:+.1f}%")
+        return 1
+
+    print(f"\n✅ No regressions above {args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
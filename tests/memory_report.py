@@ -0,0 +1,169 @@
+"""
+Memory Footprint Report for Loaded Data.
+
+Measures how much memory the loaded claims, users and plans take as parsed
+dicts versus the compact record types in app/data/records.py, and what one
+get_user_with_plan() call allocates (dict copy versus UserWithPlan view).
+
+Records are generated as JSON text and parsed one at a time, like the
+streaming loader does, so every value string is a fresh object exactly as
+in a real load. Footprint is the deep size of the result: sys.getsizeof()
+of every reachable object, counting shared objects (interned strings,
+plans) once.
+
+Usage:
+    python tests/memory_report.py                    # 1,000,000 claims
+    python tests/memory_report.py --claims 100000    # smaller run
+"""
+
+import argparse
+import gc
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add the project root to the path so we can import app modules
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.data.records import Claim, Plan, User, UserWithPlan
+
+
+CLAIMS_PER_USER = 10
+
+STATUSES = ["Approved", "Pending", "Denied"]
+SERVICES = [
+    ("Primary Care Visit", "Dr. Amanda Stevens"),
+    ("Specialist Visit", "Dr. Robert Kim - Orthopedics"),
+    ("Emergency Room", "City General Hospital"),
+    ("Prescription", "CVS Pharmacy"),
+    ("Physical Therapy", "Active Recovery PT"),
+]
+
+
+def claim_line(i: int) -> str:
+    service_type, provider = SERVICES[i % len(SERVICES)]
+    return json.dumps({
+        "claim_id": f"CLM-{i:08d}",
+        "user_id": f"user_{i // CLAIMS_PER_USER:07d}",
+        "service_date": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        "service_type": service_type,
+        "provider_name": provider,
+        "provider_network": "in_network" if i % 4 else "out_of_network",
+        "claim_status": STATUSES[i % len(STATUSES)],
+        "billed_amount": 150.0 + i % 500,
+        "insurance_paid": 125.0 + i % 400,
+        "patient_responsibility": 25.0 + i % 100,
+        "applied_to_deductible": i % 3 * 50,
+        "notes": "Routine visit" if i % 5 == 0 else "",
+    })
+
+
+def user_line(i: int) -> str:
+    return json.dumps({
+        "user_id": f"user_{i:07d}",
+        "name": f"Member{i} Test",
+        "age": 20 + i % 60,
+        "plan_id": ["ppo_gold", "hmo_silver", "epo_bronze"][i % 3],
+        "member_since": f"20{18 + i % 6}-0{1 + i % 9}-01",
+        "deductible_annual": 1500,
+        "deductible_met": i % 1500,
+        "out_of_pocket_max": 6000,
+        "out_of_pocket_spent": i % 6000,
+        "dependents": i % 4,
+        "notes": "Synthetic member",
+    })
+
+
+def deep_size(root: Any) -> int:
+    """Total size of every object reachable from root through containers and slots."""
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif not isinstance(obj, (str, int, float, bool, type(None))):
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """Footprint of the object build() returns, excluding the outer list."""
+    result = build()
+    size = deep_size(result) - sys.getsizeof(result)
+    del result
+    gc.collect()
+    return size
+
+
+def load(count: int, line: Callable[[int], str], convert: Callable[[Dict[str, Any]], Any]) -> List[Any]:
+    return [convert(json.loads(line(i))) for i in range(count)]
+
+
+def report_row(label: str, count: int, as_dict: int, as_record: int) -> None:
+    saved = (1 - as_record / as_dict) * 100 if as_dict else 0.0
+    print(
+        f"{label:<28} {as_dict / count:>10.0f} B {as_record / count:>10.0f} B "
+        f"{as_dict / 2**20:>10.1f} MB {as_record / 2**20:>10.1f} MB {saved:>7.1f}%"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Memory footprint of dict records vs. compact records")
+    parser.add_argument("--claims", type=int, default=1_000_000, help="number of claims (default: 1,000,000)")
+    args = parser.parse_args()
+
+    n_claims = args.claims
+    n_users = max(1, n_claims // CLAIMS_PER_USER)
+    plans = json.loads((project_root / "data" / "insurance_plans.json").read_text(encoding="utf-8"))["plans"]
+
+    print(f"Memory report: {n_claims:,} claims, {n_users:,} users, {len(plans)} plans\n")
+    print(f"{'dataset':<28} {'dict/rec':>12} {'record/rec':>12} {'dict total':>13} {'record total':>13} {'saved':>8}")
+    print("-" * 92)
+
+    report_row(
+        f"claims ({n_claims:,})", n_claims,
+        measure(lambda: load(n_claims, claim_line, dict)),
+        measure(lambda: load(n_claims, claim_line, Claim.from_dict)),
+    )
+    report_row(
+        f"users ({n_users:,})", n_users,
+        measure(lambda: load(n_users, user_line, dict)),
+        measure(lambda: load(n_users, user_line, User.from_dict)),
+    )
+
+    # Per-call allocation of get_user_with_plan: dict copy vs. view
+    calls = 100_000
+    user = json.loads(user_line(0))
+    plan = plans[0]
+    user_record, plan_record = User.from_dict(user), Plan.from_dict(plan)
+
+    def copy_user() -> Dict[str, Any]:
+        user_with_plan = user.copy()
+        user_with_plan["plan_details"] = plan
+        return user_with_plan
+
+    report_row(
+        f"get_user_with_plan ({calls:,})", calls,
+        measure(lambda: [copy_user() for _ in range(calls)]),
+        measure(lambda: [UserWithPlan(user_record, plan_record) for _ in range(calls)]),
+    )
+    print("\n(per-record figures include the value strings a record holds; shared interned values are counted once)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
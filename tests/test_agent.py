@@ -36,6 +36,7 @@ sys.path.insert(0, str(project_root))
 
 from langchain_core.messages import HumanMessage
 from app.graph.graph import compile_agent
+from app.graph.tracing import format_trace_timestamp
 from app.data.loader import initialize_data
 
 
@@ -74,18 +75,19 @@ def print_execution_trace(trace, last_turn_only=False, previous_count=0):
 
     for i, entry in enumerate(entries_to_show, start_idx + 1):
         print(f"\n[{i}] Node: {entry.get('node')}")
-        print(f"    Time: {entry.get('timestamp')}")
+        print(f"    Time: {format_trace_timestamp(entry)}")
         print(f"    Action: {entry.get('action')}")
 
-        # Show additional details if present
-        if 'llm_response' in entry:
-            print(f"    LLM Response: {entry.get('llm_response')}")
-        if 'user_message' in entry:
-            print(f"    User Message: {entry.get('user_message')[:50]}...")
-        if 'service_type' in entry:
-            print(f"    Service Type: {entry.get('service_type')}")
-        if 'status_filter' in entry:
-            print(f"    Status Filter: {entry.get('status_filter')}")
+        # Show additional details if present (full traces only)
+        details = entry.get('details') or {}
+        if 'selection' in details:
+            print(f"    Tool Selection: {details.get('selection')}")
+        if 'tool_args' in details:
+            print(f"    Tool Args: {details.get('tool_args')}")
+        if 'original_input' in details:
+            print(f"    User Message: {details.get('original_input')[:50]}...")
+        if 'error' in details:
+            print(f"    Error: {details.get('error')}")
 
     print("=" * 80)
 
@@ -0,0 +1,63 @@
+"""
+Regression tests for the LLM admission scheduler.
+
+Run with: python -m pytest tests/test_scheduler.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root to the path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.llm.scheduler import AdmissionScheduler
+
+
+def test_cancelled_waiter_is_not_admitted_on_release():
+    """A caller cancelled while queued must not take the slot freed by release()."""
+    async def scenario():
+        scheduler = AdmissionScheduler(max_concurrency=1, aging_seconds=0)
+        await scheduler.acquire("interactive", "a")
+
+        queued = asyncio.create_task(scheduler.acquire("interactive", "b"))
+        await asyncio.sleep(0)
+        queued.cancel()
+
+        # Release before the cancelled task has run again
+        scheduler.release()
+        assert scheduler.in_flight == 0
+
+        await asyncio.gather(queued, return_exceptions=True)
+        assert scheduler.waiting() == 0
+
+        # The slot is still usable
+        await asyncio.wait_for(scheduler.acquire("interactive", "c"), timeout=1)
+        assert scheduler.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_aged_background_call_beats_fresh_interactive_call():
+    """Ties between equal effective classes go to the call that waited longest."""
+    async def scenario():
+        scheduler = AdmissionScheduler(max_concurrency=1, aging_seconds=0.01)
+        await scheduler.acquire("interactive", "a")
+        order = []
+
+        async def call(priority_class, session_id):
+            await scheduler.acquire(priority_class, session_id)
+            order.append(priority_class)
+
+        background = asyncio.create_task(call("background", "b"))
+        await asyncio.sleep(0.05)
+        interactive = asyncio.create_task(call("interactive", "c"))
+        await asyncio.sleep(0)
+
+        scheduler.release()
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(background, interactive)
+        assert order == ["background", "interactive"]
+
+    asyncio.run(scenario())